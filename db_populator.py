@@ -4,13 +4,13 @@ from datetime import datetime, timedelta
 from src.models.obra_model import ObraDeArte, StatusObra
 from src.models.artista_model import Artista, StatusArtista
 from src.models.transacao_model import Transacao
-from src.database.manager import DatabaseManager
+from src.database.manager import obter_manager
 
 def populate_database():
     """Popula o banco de dados com dados de teste para relatórios"""
     print("Populando banco de dados com dados de teste...")
     
-    db = DatabaseManager()
+    db = obter_manager()
     
     artistas = [
         Artista(
@@ -1,12 +1,13 @@
 import tkinter as tk
-from src.database.manager import DatabaseManager
+from src.database.manager import obter_manager
 from src.views.tela_inicial_view import TelaInicial
 
 def main():
-    db_manager = DatabaseManager()
+    db_manager = obter_manager()
     root = tk.Tk()
     app = TelaInicial(root, db_manager)
     root.mainloop()
+    db_manager.fechar()
 
 if __name__ == "__main__":
     main()
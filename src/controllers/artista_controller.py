@@ -1,10 +1,10 @@
 from datetime import datetime
-from src.database.manager import DatabaseManager
+from src.database.manager import obter_manager
 from src.models.artista_model import Artista, StatusArtista
 
 class ArtistaController:
     def __init__(self):
-        self.db = DatabaseManager()
+        self.db = obter_manager()
 
     # util
     def _valida_data(self, s: str, campo: str):
@@ -54,8 +54,9 @@ class ArtistaController:
     def listar(self):
         return self.db.listar_artistas()
 
-    def buscar(self, filtros: dict):
-        return self.db.buscar_artistas(filtros)
+    def buscar(self, filtros: dict, limite=None, ordenar_por="nome", decrescente=False, apos=None, antes=None):
+        return self.db.buscar_artistas(filtros, limite=limite, ordenar_por=ordenar_por,
+                                       decrescente=decrescente, apos=apos, antes=antes)
 
     def get_status(self):
         return [s.value for s in StatusArtista]
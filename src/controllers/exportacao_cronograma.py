@@ -0,0 +1,124 @@
+"""
+Exportação do cronograma de exposições para iCalendar (.ics) e CSV.
+As funções consomem o iterador (exposição, obras) de DatabaseManager.iter_exposicoes_com_obras
+e escrevem linha a linha no arquivo aberto, sem montar o conteúdo em memória.
+"""
+import csv
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator, Optional, TextIO
+
+from src.models.exposicao_model import StatusExposicao
+
+# o UID é estável por exposição: reimportar o arquivo atualiza os eventos em vez de duplicá-los
+DOMINIO_UID = "galeria-arte"
+STATUS_ICS = {
+    StatusExposicao.PLANEJADA: "TENTATIVE",
+    StatusExposicao.EM_CURSO: "CONFIRMED",
+    StatusExposicao.FINALIZADA: "CONFIRMED",
+}
+CAMPOS_CSV = [
+    "id_exposicao", "exposicao", "tema", "localizacao", "status", "data_inicio", "data_fim", "descricao",
+    "id_obra", "obra", "artistas", "ano", "tipo", "tecnica", "dimensoes", "observacao",
+]
+
+
+def _data(valor) -> Optional[date]:
+    # as exposições chegam do manager com datas em DD/MM/YYYY
+    if not valor:
+        return None
+    try:
+        dia, mes, ano = str(valor).split("/")
+        return date(int(ano), int(mes), int(dia))
+    except ValueError:
+        return None
+
+
+def _escapar(texto) -> str:
+    """Escapa um valor TEXT do iCalendar (RFC 5545, 3.3.11)."""
+    texto = "" if texto is None else str(texto)
+    return (texto.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _dobrar(linha: str) -> str:
+    """Quebra a linha em trechos de até 75 octetos (sem partir caracteres UTF-8), terminados em CRLF."""
+    if len(linha) <= 18 or len(linha.encode("utf-8")) <= 75:  # 18 caracteres cabem mesmo com 4 octetos cada
+        return linha + "\r\n"
+    partes, atual, tamanho = [], "", 0
+    for ch in linha:
+        n = len(ch.encode("utf-8"))
+        if tamanho + n > 75:
+            partes.append(atual)
+            atual, tamanho = " ", 1  # continuação começa com um espaço
+        atual += ch
+        tamanho += n
+    partes.append(atual)
+    return "\r\n".join(partes) + "\r\n"
+
+
+def _descricao_obra(obra: dict) -> str:
+    detalhes = [str(v) for v in (obra.get("artistas"), obra.get("ano")) if v]
+    return f"{obra.get('titulo')} ({', '.join(detalhes)})" if detalhes else str(obra.get("titulo"))
+
+
+def linhas_ics(itens: Iterable, agora: Optional[datetime] = None) -> Iterator[str]:
+    """
+    Linhas (já dobradas, com CRLF) de um VCALENDAR com um VEVENT de dia inteiro por exposição.
+    Exposições sem nenhuma data ficam de fora; uma data ausente vale pela outra.
+    """
+    carimbo = (agora or datetime.now(timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    yield from map(_dobrar, ("BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Galeria de Arte//Cronograma//PT",
+                             "CALSCALE:GREGORIAN", "METHOD:PUBLISH"))
+    for expo, obras in itens:
+        inicio, fim = _data(expo.data_inicio), _data(expo.data_fim)
+        inicio, fim = inicio or fim, fim or inicio
+        if inicio is None:
+            continue
+        descricao = [v for v in (expo.tema, expo.descricao) if v]
+        if obras:
+            descricao.append("Obras:")
+            descricao.extend(f"- {_descricao_obra(o)}" for o in obras)
+        linhas = [
+            "BEGIN:VEVENT",
+            f"UID:exposicao-{expo.id_exposicao}@{DOMINIO_UID}",
+            f"DTSTAMP:{carimbo}",
+            f"DTSTART;VALUE=DATE:{inicio:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{fim + timedelta(days=1):%Y%m%d}",  # DTEND de dia inteiro é exclusivo
+            f"SUMMARY:{_escapar(expo.nome)}",
+        ]
+        if expo.localizacao:
+            linhas.append(f"LOCATION:{_escapar(expo.localizacao)}")
+        if descricao:
+            linhas.append(f"DESCRIPTION:{_escapar(chr(10).join(descricao))}")
+        linhas += [f"STATUS:{STATUS_ICS.get(expo.status, 'CONFIRMED')}", "END:VEVENT"]
+        yield from map(_dobrar, linhas)
+    yield _dobrar("END:VCALENDAR")
+
+
+def escrever_ics(arquivo: TextIO, itens: Iterable, agora: Optional[datetime] = None) -> int:
+    """Grava o calendário em `arquivo` (aberto com newline=""); retorna o número de exposições exportadas."""
+    total = 0
+    for linha in linhas_ics(itens, agora):
+        if linha.startswith("BEGIN:VEVENT"):
+            total += 1
+        arquivo.write(linha)
+    return total
+
+
+def escrever_csv(arquivo: TextIO, itens: Iterable) -> int:
+    """
+    Grava uma linha por obra participante (exposições sem obras ocupam uma linha com as colunas
+    da obra vazias) em `arquivo` (aberto com newline=""); retorna o número de exposições.
+    """
+    escritor = csv.writer(arquivo)
+    escritor.writerow(CAMPOS_CSV)
+    total = 0
+    for expo, obras in itens:
+        total += 1
+        status = expo.status.value if isinstance(expo.status, StatusExposicao) else expo.status
+        base = [expo.id_exposicao, expo.nome, expo.tema, expo.localizacao, status,
+                expo.data_inicio, expo.data_fim, expo.descricao]
+        for obra in obras or [{}]:
+            escritor.writerow(base + [obra.get(k) for k in ("id_obra", "titulo", "artistas", "ano", "tipo",
+                                                            "tecnica", "dimensoes", "observacao")])
+    return total
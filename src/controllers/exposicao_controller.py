@@ -1,12 +1,14 @@
 from datetime import datetime, date
+from contextlib import closing
 from typing import Any, List, Tuple, Optional
-from src.database.manager import DatabaseManager
+from src.database.manager import obter_manager
 from src.models.exposicao_model import Exposicao, StatusExposicao
+from src.controllers.exportacao_cronograma import escrever_csv, escrever_ics
 
 class ExposicaoController:
     def __init__(self):
-        # instancia o manager de banco de dados (encapsula acesso ao DB)
-        self.db = DatabaseManager()
+        # usa o manager de banco de dados compartilhado (encapsula acesso ao DB)
+        self.db = obter_manager()
 
     def _valida_data(self, data_inicio: str, data_fim: str, data_cadastro: str):
         if not (data_inicio and data_fim and data_cadastro):
@@ -72,6 +74,29 @@ class ExposicaoController:
         except Exception:
             return []
 
+    def listar_no_intervalo(self, inicio, fim) -> List[Any]:
+        # exposições que cruzam [inicio, fim], filtradas no banco
+        try:
+            return self.db.listar_exposicoes_no_intervalo(inicio, fim)
+        except Exception:
+            return []
+
+    def exportar_cronograma(self, caminho: str, formato: str = None, inicio=None, fim=None) -> Tuple[bool, str]:
+        # grava as exposições (com as obras participantes) em .ics ou .csv; o banco é lido em lotes
+        # e cada exposição vai direto para o arquivo, então o período pode ser arbitrariamente longo
+        formato = (formato or caminho.rsplit(".", 1)[-1]).lower()
+        escritores = {"ics": escrever_ics, "csv": escrever_csv}
+        if formato not in escritores:
+            return False, f"Formato de exportação inválido: {formato}"
+        try:
+            # closing: a conexão de leitura do iterador é fechada mesmo se a gravação falhar no meio
+            with open(caminho, "w", encoding="utf-8", newline="") as arquivo, \
+                    closing(self.db.iter_exposicoes_com_obras(inicio, fim)) as itens:
+                total = escritores[formato](arquivo, itens)
+            return True, f"{total} exposição(ões) exportada(s) para {caminho}."
+        except Exception as e:
+            return False, f"Erro ao exportar cronograma: {e}"
+
     def carregar(self, id_exposicao: int) -> Optional[Any]:
         # carrega uma exposição específica por id
         try:
@@ -112,13 +137,10 @@ class ExposicaoController:
             if res is None:
                 try:
                     sql = "INSERT OR IGNORE INTO participacao_exposicao (id_exposicao, id_obra, data_inclusao, observacao) VALUES (?, ?, ?, ?)"
-                    conn = None
-                    if hasattr(self.db, "conectar"):
-                        conn = self.db.conectar()
-                        cur = conn.cursor()
-                        cur.execute(sql, (id_exposicao, id_obra, date.today().strftime("%d/%m/%Y"), observacao))
-                        conn.commit()
-                        conn.close()
+                    if hasattr(self.db, "cursor"):
+                        # conexão pertence ao pool compartilhado: não deve ser fechada aqui
+                        with self.db.cursor() as cur:
+                            cur.execute(sql, (id_exposicao, id_obra, date.today().isoformat(), observacao))
                         return True, "Participação inserida (fallback)."
                 except Exception:
                     pass
@@ -171,6 +193,17 @@ class ExposicaoController:
         except Exception as e:
             return False, f"Erro ao remover participação: {e}"
 
+    def aplicar_alteracoes(self, id_exposicao: int, add_ids, remove_ids) -> Tuple[bool, str, List[int]]:
+        # inclusões, remoções e status das obras em uma única transação; devolve as obras recusadas
+        try:
+            recusadas = self.db.aplicar_participacoes(id_exposicao, add_ids, remove_ids)
+        except Exception as e:
+            return False, f"Erro ao aplicar alterações: {e}", []
+        if recusadas:
+            ids = ", ".join(str(i) for i in recusadas)
+            return True, f"Alterações aplicadas. Obras indisponíveis no período não foram adicionadas: {ids}.", recusadas
+        return True, "Alterações aplicadas.", []
+
     def listar_obras(self, id_exposicao: int) -> List[Any]:
         # lista obras vinculadas a uma exposição
         try:
@@ -178,6 +211,11 @@ class ExposicaoController:
         except Exception:
             return []
 
+    def obra_livre_no_periodo(self, id_obra: int, inicio: Optional[date], fim: Optional[date],
+                              exclude_expo_id: Optional[int] = None) -> bool:
+        # mesma condição SQL de listar_obras_disponiveis, para uma obra
+        return self.db.obra_livre_no_periodo(id_obra, inicio, fim, exclude_expo_id)
+
     def verificar_participacao(self, id_exposicao: int, id_obra: int) -> bool:
         # verifica se já existe participação entre exposição e obra
         try:
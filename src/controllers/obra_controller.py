@@ -1,10 +1,10 @@
 from datetime import date
 from src.models.obra_model import ObraDeArte, StatusObra
-from src.database.manager import DatabaseManager
+from src.database.manager import obter_manager
 
 class ObraController:
     def __init__(self):
-        self.db_manager = DatabaseManager()
+        self.db_manager = obter_manager()
         
     def cadastrar_obra(self, titulo, ano, artista, tipo, tecnica, dimensoes, localizacao, preco, status, imagem=None, data_cadastro=None):
         try:
@@ -76,6 +76,31 @@ class ObraController:
     def buscar_obra_por_id(self, obra_id):
         """busca uma obra pelo ID"""
         return self.db_manager.buscar_obra_por_id(obra_id)
+
+    def buscar_obras(self, filtros, limite=None, offset=0, ordenar_por="id_obra", decrescente=False, apos=None, antes=None):
+        """busca obras filtradas e ordenadas diretamente no banco (sem carregar imagens)"""
+        return self.db_manager.buscar_obras(filtros, limite=limite, offset=offset, ordenar_por=ordenar_por,
+                                            decrescente=decrescente, apos=apos, antes=antes)
+
+    def listar_obras_disponiveis(self, inicio, fim, exclude_expo_id=None, status=(StatusObra.DISPONIVEL.value, StatusObra.EM_EXPOSICAO.value)):
+        """obras livres no período (sem exposição que cruze [inicio, fim]), resolvidas no banco"""
+        return self.db_manager.listar_obras_disponiveis(inicio, fim, exclude_expo_id=exclude_expo_id, status=status)
+
+    def listar_obras_com_disponibilidade(self, inicio, fim, exclude_expo_id=None):
+        """todas as obras com o indicador `livre` no período, em uma consulta"""
+        return self.db_manager.listar_obras_com_disponibilidade(inicio, fim, exclude_expo_id=exclude_expo_id)
+
+    def contar_obras(self, filtros):
+        """total de obras que atendem aos filtros"""
+        return self.db_manager.contar_obras(filtros)
+
+    def carregar_imagem(self, obra_id):
+        """retorna os bytes da imagem da obra (ou None)"""
+        return self.db_manager.carregar_imagem(obra_id)
+
+    def listar_ids_obras_por_artistas(self, nomes):
+        """retorna os ids das obras de qualquer um dos artistas informados (por nome)"""
+        return self.db_manager.listar_ids_obras_por_artistas(nomes)
     
     def atualizar_obra(self, obra_id, titulo, ano, artista, tipo, tecnica, dimensoes, localizacao, preco, status, imagem=None, data_cadastro=None):
         try:
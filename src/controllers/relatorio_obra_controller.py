@@ -5,6 +5,7 @@ from src.controllers.obra_controller import ObraController
 from src.controllers.artista_controller import ArtistaController
 from src.controllers.transacao_controller import TransacaoController
 from src.models.obra_model import ObraDeArte, StatusObra
+from src.models.transacao_model import TiposTransacao
 import re
 
 
@@ -23,6 +24,16 @@ class RelatorioController:
 
     def listar_transacoes(self):
         return self.transacao_ctrl.listar_transacoes()
+
+    def buscar_transacoes(self, limite=None, ordenar_por="id", decrescente=True, apos=None, antes=None):
+        return self.transacao_ctrl.buscar_transacoes(limite=limite, ordenar_por=ordenar_por,
+                                                     decrescente=decrescente, apos=apos, antes=antes)
+
+    def receita_agrupada(self, agrupar_por, data_inicio="", data_fim="", tipos=None, limite=None):
+        return self.transacao_ctrl.receita_agrupada(agrupar_por, data_inicio, data_fim, tipos=tipos, limite=limite)
+
+    def get_tipos_transacao(self):
+        return [t.value for t in TiposTransacao] + ["Devolução"]
     
     def validar_titulo(self, titulo):
         if not titulo or titulo.strip() == "":
@@ -90,6 +101,10 @@ class RelatorioController:
 
     def buscar_obras_validado(self, filtros_brutos):
         """Versão aprimorada que valida filtros antes da busca"""
+        return self.buscar_obras(self.validar_filtros(filtros_brutos))
+
+    def validar_filtros(self, filtros_brutos):
+        """Valida e converte os filtros digitados na tela (levanta ValueError)"""
         filtros_validados = {}
         
         try:
@@ -124,14 +139,18 @@ class RelatorioController:
             if "transacoes" in filtros_brutos and filtros_brutos["transacoes"]:
                 filtros_validados["transacoes"] = filtros_brutos["transacoes"]
             
-            return self.buscar_obras(filtros_validados)
+            return filtros_validados
     
             
         except ValueError as e:
             raise ValueError(f"Erro na validação dos filtros: {e}")
 
+    def contar_obras(self, filtros: Dict[str, Any]) -> int:
+        return self.obra_ctrl.contar_obras(filtros)
             
-    def buscar_obras(self, filtros: Dict[str, Any]) -> List[ObraDeArte]:
+    def buscar_obras(self, filtros: Dict[str, Any], limite: Optional[int] = None, offset: int = 0,
+                     ordenar_por: str = "id_obra", decrescente: bool = False,
+                     apos: Optional[int] = None, antes: Optional[int] = None) -> List[ObraDeArte]:
         """
         filtros possível:
          - ano: int
@@ -143,90 +162,17 @@ class RelatorioController:
          - valor: float
          - data_cadastro: date
          - artistas: list[str] (nomes)
+         - transacoes: list[str] (tipos de transação)
+        Os filtros e a ordenação são aplicados em SQL; `limite` com `apos`/`antes`
+        (ids de obras já exibidas) pagina o resultado por chave.
         """
-        obras = self.obra_ctrl.listar_obras()
-        resultado: List[ObraDeArte] = []
+        obras = self.obra_ctrl.buscar_obras(filtros, limite=limite, offset=offset, ordenar_por=ordenar_por,
+                                            decrescente=decrescente, apos=apos, antes=antes)
 
+        # transações de todas as obras encontradas em uma única consulta (join em transacao_obra)
+        transacoes_por_obra = self.transacao_ctrl.listar_transacoes_por_obra([o.id_obra for o in obras])
         for obra in obras:
-            ok = True
-            titulo = filtros.get("titulo")
-            if titulo and titulo.strip().lower() not in (obra.titulo or "").lower():
-                ok = False
-
-            ano = filtros.get("ano")
-            if ok and ano is not None:
-                try:
-                    if int(obra.ano) != int(ano):
-                        ok = False
-                except Exception:
-                    ok = False
-            tecnica = filtros.get("tecnica")
-            if ok and tecnica and (not obra.tecnica or tecnica.strip().lower() not in obra.tecnica.lower()):
-                ok = False
-
-            tipo = filtros.get("tipo")
-            if ok and tipo and obra.tipo != tipo:
-                ok = False
-
-            status = filtros.get("status")
-            if ok and status and getattr(obra.status, "value", None) != status:
-                ok = False
-
-            localizacao = filtros.get("localizacao")
-            if ok and localizacao and (not obra.localizacao or localizacao.strip().lower() not in obra.localizacao.lower()):
-                ok = False
-
-            valor = filtros.get("valor")
-            if ok and valor is not None:
-                try:
-                    if float(obra.preco or 0) != float(valor):
-                        ok = False
-                except Exception:
-                    ok = False
-
-            data_cad = filtros.get("data_cadastro")
-            if ok and data_cad:
-                dc = obra.data_cadastro
-                dc_date = None
-                if isinstance(dc, date):
-                    dc_date = dc
-                elif isinstance(dc, str):
-                    for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
-                        try:
-                            dc_date = datetime.strptime(dc, fmt).date()
-                            break
-                        except Exception:
-                            continue
-                if dc_date != data_cad:
-                    ok = False
-
-            artistas_sel = filtros.get("artistas")
-            if ok and artistas_sel:
-                if isinstance(obra.artista, (list, tuple)):
-                    if not any(sel.strip().lower() in art.lower() for sel in artistas_sel for art in obra.artista):
-                        ok = False
-                else:
-                    nome_artista = (obra.artista or "").lower()
-                    if not any(sel.strip().lower() in nome_artista for sel in artistas_sel):
-                        ok = False
-            
-            transacoes_sel = filtros.get("transacoes")
-            if ok and transacoes_sel:
-                transacoes_obra = []
-                for transacao in self.transacao_ctrl.listar_transacoes():
-                    if obra.titulo in transacao.obras:
-                        transacoes_obra.append(transacao.tipo)
-                
-                if not any(tipo in transacoes_sel for tipo in transacoes_obra):
-                    ok = False
-
-            if ok:
-                transacoes_da_obra = []
-                for transacao in self.transacao_ctrl.listar_transacoes():
-                    if obra.titulo in transacao.obras:
-                        transacoes_da_obra.append(transacao.cliente)
-                
-                obra.transacao = ", ".join(transacoes_da_obra) if transacoes_da_obra else ""
-                resultado.append(obra)
+            transacoes_da_obra = transacoes_por_obra.get(obra.id_obra, [])
+            obra.transacao = ", ".join(t.cliente for t in transacoes_da_obra)
 
-        return resultado
\ No newline at end of file
+        return obras
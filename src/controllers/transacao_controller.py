@@ -1,14 +1,14 @@
 from datetime import datetime
 from typing import List, Any, Optional
-from src.database.manager import DatabaseManager
+from src.database.manager import obter_manager
 from src.models.transacao_model import Transacao, TiposTransacao
 from src.models.obra_model import ObraDeArte  # usado apenas para typing/clareza
 
 
 class TransacaoController:
     def __init__(self):
-        # segue o padrão do exposicao_controller: cada controller instancia seu DatabaseManager
-        self.db_manager = DatabaseManager()
+        # todos os controllers compartilham o mesmo DatabaseManager do processo
+        self.db_manager = obter_manager()
 
     # ---------------- Helpers ----------------
     def _is_numeric_like(self, v: Any) -> bool:
@@ -20,28 +20,12 @@ class TransacaoController:
         except Exception:
             return False
 
-    def _get_obra_status_and_title(self, obra_identifier: Any) -> tuple[Optional[str], Optional[str]]:
+    def _status_obras(self, obras: List[Any]) -> dict:
         """
-        Aceita `obra_identifier` que pode ser:
-         - id (numérico ou string numérica) -> busca por id e retorna (status_string, titulo)
-         - título (string) -> usa métodos por título (status) e retorna (status_string, titulo)
-        Retorna (None, None) se não encontrar.
+        Status de todas as obras informadas (ids ou títulos) em uma única ida ao banco:
+        str(ref) -> (id_obra, titulo, status). Referências não encontradas ficam fora do mapa.
         """
-        try:
-            if self._is_numeric_like(obra_identifier):
-                oid = int(str(obra_identifier).strip())
-                obra = self.db_manager.buscar_obra_por_id(oid)
-                if not obra:
-                    return None, None
-                status = obra.status.value if hasattr(obra.status, "value") else str(obra.status or "")
-                return status, obra.titulo
-            else:
-                # tratamento por título (fallback compatível)
-                titulo = str(obra_identifier)
-                status = self.db_manager.get_status_obra_por_titulo(titulo)
-                return status, titulo
-        except Exception:
-            return None, None
+        return self.db_manager.obter_status_obras([str(o).strip() for o in obras or []])
 
     # ---------------- Cadastro ----------------
     def cadastrar_transacao(self, cliente: str, valor: Any, tipo: str, data_transacao: str, observacoes: str = "", obras: List[Any] = None):
@@ -68,11 +52,13 @@ class TransacaoController:
             except Exception:
                 return False, "Valor inválido."
 
-            # Valida se as obras estão disponíveis (aceita ids ou títulos)
+            # Valida se as obras estão disponíveis (aceita ids ou títulos), todas em uma consulta
+            status_obras = self._status_obras(obras)
             for obra_id_or_title in obras:
-                status_obra, titulo = self._get_obra_status_and_title(obra_id_or_title)
-                if status_obra is None:
+                encontrada = status_obras.get(str(obra_id_or_title).strip())
+                if encontrada is None:
                     return False, f"Obra '{obra_id_or_title}' não encontrada."
+                _, titulo, status_obra = encontrada
                 # regras de negócio: para Venda/Aluguel/Empréstimo, obra deve estar "Disponível"
                 if tipo in ["Venda", "Aluguel", "Empréstimo"] and status_obra != "Disponível":
                     return False, f"Obra '{titulo or obra_id_or_title}' não está disponível para {tipo}."
@@ -96,42 +82,14 @@ class TransacaoController:
                 data_cadastro=datetime.now().strftime("%d/%m/%Y")
             )
 
-            # insere no DB
-            self.db_manager.inserir_transacao(transacao)
-
-            # Atualiza status das obras (usa título quando possível para manter método existente no manager)
+            # insere a transação e atualiza o status das obras (por id_obra) em uma única transação
             status_map = {
                 "Venda": "Vendida",
                 "Aluguel": "Alugada",
                 "Empréstimo": "Empréstimo",
                 "Devolução": "Disponível"
             }
-            novo_status = status_map.get(tipo)
-            if novo_status:
-                for obra_id_or_title in obras:
-                    # obtém título para usar atualizar_status_obra_por_titulo
-                    _, titulo = self._get_obra_status_and_title(obra_id_or_title)
-                    if titulo:
-                        try:
-                            self.db_manager.atualizar_status_obra_por_titulo(titulo, novo_status)
-                        except Exception:
-                            # tentativa alternativa: se tivermos id, buscar obra e atualizar via atualizar_obra
-                            if self._is_numeric_like(obra_id_or_title):
-                                try:
-                                    oid = int(str(obra_id_or_title).strip())
-                                    obra_obj = self.db_manager.buscar_obra_por_id(oid)
-                                    if obra_obj:
-                                        obra_obj.status = type(obra_obj.status)(novo_status) if hasattr(obra_obj.status, "__class__") else novo_status
-                                        # chamar atualizar_obra usando o objeto modificado (tentativa conservadora)
-                                        try:
-                                            self.db_manager.atualizar_obra(obra_obj)
-                                        except Exception:
-                                            pass
-                                except Exception:
-                                    pass
-                    else:
-                        # se título não obtido, ignorar para evitar erro
-                        continue
+            self.db_manager.inserir_transacao(transacao, novo_status_obras=status_map.get(tipo))
 
             return True, "Transação cadastrada com sucesso!"
         except Exception as e:
@@ -141,10 +99,44 @@ class TransacaoController:
     def listar_transacoes(self):
         return self.db_manager.listar_transacoes()
 
+    def iter_transacoes(self, filtros: Optional[dict] = None, apos=None, tamanho_pagina: int = 200):
+        """percorre as transações (mais recentes primeiro) página a página, sem carregar o histórico inteiro"""
+        return self.db_manager.iter_transacoes(filtros, apos=apos, tamanho_pagina=tamanho_pagina)
+
+    def receita_agrupada(self, agrupar_por: str, data_inicio: str = "", data_fim: str = "",
+                         tipos: Optional[List[str]] = None, limite: Optional[int] = None):
+        """
+        soma dos valores agrupada no banco por 'tipo', 'mes', 'cliente', 'obra' ou 'artista':
+        lista de (rótulo, total, quantidade de transações). Datas em DD/MM/AAAA (opcionais).
+        """
+        inicio, fim = (data_inicio or "").strip(), (data_fim or "").strip()
+        try:
+            datas = [datetime.strptime(d, "%d/%m/%Y").date() if d else None for d in (inicio, fim)]
+        except ValueError:
+            raise ValueError("Data inválida. Use o formato DD/MM/AAAA")
+        if datas[0] and datas[1] and datas[0] > datas[1]:
+            raise ValueError("A data inicial deve ser anterior à data final")
+        return self.db_manager.receita_agrupada(agrupar_por, datas[0], datas[1], tipos=tipos, limite=limite)
+
+    def listar_transacoes_por_obra(self, ids_obra: Optional[List[int]] = None):
+        """retorna dict id_obra -> transações da obra (mais recentes primeiro)"""
+        return self.db_manager.listar_transacoes_por_obra(ids_obra)
+
     # ---------------- Busca ----------------
+    def buscar_transacoes(self, filtros: Optional[dict] = None, limite: Optional[int] = None,
+                          ordenar_por: str = "id", decrescente: bool = True,
+                          apos: Optional[int] = None, antes: Optional[int] = None):
+        """busca transações ordenadas e paginadas no banco (apos/antes: ids já exibidos)"""
+        return self.db_manager.buscar_transacoes(filtros, limite=limite, ordenar_por=ordenar_por,
+                                                 decrescente=decrescente, apos=apos, antes=antes)
+
     def buscar_transacao_por_id(self, transacao_id):
         return self.db_manager.buscar_transacao_por_id(transacao_id)
 
+    def buscar_devolucoes_de(self, transacao_id):
+        """devoluções registradas para a transação original (consulta indexada por id_transacao_origem)"""
+        return self.db_manager.buscar_devolucoes_de(int(transacao_id))
+
     # ---------------- Atualização ----------------
     def atualizar_transacao(self, transacao_id, cliente, valor, tipo, data_transacao, observacoes: str = "", obras: List[Any] = None):
         try:
@@ -186,25 +178,21 @@ class TransacaoController:
             except Exception:
                 existing_obras_set = set()
 
-            # Valida disponibilidade antes de atualizar (aceita ids ou títulos).
+            # Valida disponibilidade antes de atualizar (aceita ids ou títulos), todas em uma consulta.
             # Importante: obras que já faziam parte da transação original são permitidas mesmo que não estejam "Disponível".
+            status_obras = self._status_obras([o for o in obras if str(o).strip() not in existing_obras_set])
             for obra_id_or_title in obras:
                 s_key = str(obra_id_or_title).strip()
                 # se já fazia parte da transação original, pular validação de disponibilidade
                 if s_key in existing_obras_set:
                     continue
 
-                status_obra, titulo = self._get_obra_status_and_title(obra_id_or_title)
-                if status_obra is None:
+                encontrada = status_obras.get(s_key)
+                if encontrada is None:
                     return False, f"Obra '{obra_id_or_title}' não encontrada."
+                _, titulo, st = encontrada
 
-                # normaliza status para comparação (lida com enum/string)
-                try:
-                    st = status_obra.value if hasattr(status_obra, "value") else str(status_obra)
-                except Exception:
-                    st = str(status_obra or "")
-
-                st_norm = st.strip().lower()
+                st_norm = str(st or "").strip().lower()
                 if tipo in ["Venda", "Aluguel", "Empréstimo"] and "dispon" not in st_norm:
                     return False, f"Obra '{titulo or obra_id_or_title}' não está disponível para {tipo}."
 
@@ -216,25 +204,9 @@ class TransacaoController:
             transacao.observacoes = observacoes.strip() if observacoes else ""
             transacao.obras = obras
 
-            self.db_manager.atualizar_transacao(transacao)
-
-            # Atualiza status das obras se aplicável (venda/aluguel/empréstimo)
+            # persiste a transação e o status das obras (venda/aluguel/empréstimo) em uma única transação
             status_map = {"Venda": "Vendida", "Aluguel": "Alugada", "Empréstimo": "Empréstimo"}
-            novo_status = status_map.get(tipo)
-            if novo_status:
-                for obra_id_or_title in obras:
-                    try:
-                        _, titulo = self._get_obra_status_and_title(obra_id_or_title)
-                        if titulo:
-                            try:
-                                # tenta atualizar pelo título (método existente)
-                                self.db_manager.atualizar_status_obra_por_titulo(titulo, novo_status)
-                            except Exception:
-                                # fallback silencioso
-                                pass
-                    except Exception:
-                        # não interrompe o processo se uma obra falhar na atualização de status
-                        continue
+            self.db_manager.atualizar_transacao(transacao, novo_status_obras=status_map.get(tipo))
 
             return True, "Transação atualizada com sucesso!"
         except Exception as e:
@@ -254,12 +226,14 @@ class TransacaoController:
             obras_para_devolver = obras or transacao_original.obras
 
             # Verifica se alguma obra já foi devolvida para esta transação original
-            for t in self.listar_transacoes():
-                if t.tipo == "Devolução" and f"ID {transacao_id}" in (t.observacoes or ""):
-                    for obra_id_or_title in obras_para_devolver:
-                        # compara com conteúdo armazenado (pode ser id ou título)
-                        if obra_id_or_title in (t.obras or []):
-                            return False, f"Obra devolvida em {t.data_transacao} na transação ID: {t.id}"
+            # (compara por id_obra: a tela pode enviar títulos e o banco guarda ids)
+            anteriores = self.buscar_devolucoes_de(transacao_original.id)
+            if anteriores:
+                status = self._status_obras(list(obras_para_devolver) + [o for t in anteriores for o in t.obras])
+                ids_pedidos = {status[str(o).strip()][0] for o in obras_para_devolver if str(o).strip() in status}
+                for t in anteriores:
+                    if ids_pedidos & {status[str(o).strip()][0] for o in t.obras if str(o).strip() in status}:
+                        return False, f"Obra devolvida em {t.data_transacao} na transação ID: {t.id}"
 
             # Cria nova transação de devolução
             devolucao = Transacao(
@@ -268,35 +242,12 @@ class TransacaoController:
                 tipo="Devolução",
                 data_transacao=data_devolucao,
                 observacoes=observacoes or f"Devolução da transação ID {transacao_id}",
-                obras=obras_para_devolver
+                obras=obras_para_devolver,
+                id_transacao_origem=transacao_original.id
             )
 
-            # Insere devolução diretamente no banco
-            devolucao_id = self.db_manager.inserir_transacao(devolucao)
-
-            # Atualiza status das obras para 'Disponível' (por título quando possível)
-            for obra_id_or_title in obras_para_devolver:
-                _, titulo = self._get_obra_status_and_title(obra_id_or_title)
-                if titulo:
-                    try:
-                        self.db_manager.atualizar_status_obra_por_titulo(titulo, "Disponível")
-                    except Exception:
-                        # se falhar e tivermos um id numérico, tentar via atualizar_obra
-                        if self._is_numeric_like(obra_id_or_title):
-                            try:
-                                oid = int(str(obra_id_or_title).strip())
-                                obra_obj = self.db_manager.buscar_obra_por_id(oid)
-                                if obra_obj:
-                                    obra_obj.status = type(obra_obj.status)( "Disponível") if hasattr(obra_obj.status, "__class__") else "Disponível"
-                                    try:
-                                        self.db_manager.atualizar_obra(obra_obj)
-                                    except Exception:
-                                        pass
-                            except Exception:
-                                pass
-                else:
-                    # sem título, ignorar
-                    continue
+            # Insere a devolução e devolve as obras para 'Disponível' (por id_obra) na mesma transação
+            devolucao_id = self.db_manager.inserir_transacao(devolucao, novo_status_obras="Disponível")
 
             return True, f"Devolução registrada com sucesso! ID: {devolucao_id}"
 
@@ -312,7 +263,8 @@ class TransacaoController:
         if not transacao_original:
             return None
 
-        for t in self.listar_transacoes():
-            if t.tipo == "Devolução" and f"ID {transacao_id}" in (t.observacoes or ""):
-                return f"{t.data_transacao} na transação ID: {t.id}"
+        devolucoes = self.buscar_devolucoes_de(transacao_original.id)
+        if devolucoes:
+            t = devolucoes[0]
+            return f"{t.data_transacao} na transação ID: {t.id}"
         return None
\ No newline at end of file
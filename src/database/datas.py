@@ -0,0 +1,51 @@
+"""
+Codec de datas da camada de armazenamento.
+O banco guarda todas as datas como texto ISO 'YYYY-MM-DD' (ordenável e indexável);
+os objetos de domínio e as telas continuam trabalhando com 'DD/MM/YYYY'.
+"""
+from datetime import date, datetime
+from typing import Optional
+
+FORMATO_BR = "%d/%m/%Y"
+
+
+def para_iso(valor) -> Optional[str]:
+    """
+    Converte date/datetime, 'DD/MM/YYYY' ou ISO (com ou sem hora) para 'YYYY-MM-DD'.
+    Valores vazios viram None; textos em outro formato levantam ValueError.
+    """
+    if valor is None:
+        return None
+    if isinstance(valor, datetime):
+        return valor.date().isoformat()
+    if isinstance(valor, date):
+        return valor.isoformat()
+    s = str(valor).strip()
+    if not s:
+        return None
+    if "/" in s:
+        return datetime.strptime(s, FORMATO_BR).date().isoformat()
+    return date.fromisoformat(s[:10]).isoformat()
+
+
+def iso_para_date(valor) -> Optional[date]:
+    """Lê uma data gravada em ISO; retorna None se vazia ou fora do formato."""
+    if not valor:
+        return None
+    try:
+        return date.fromisoformat(str(valor)[:10])
+    except ValueError:
+        return None
+
+
+def iso_para_br(valor) -> Optional[str]:
+    """Lê uma data gravada em ISO e a devolve como 'DD/MM/YYYY' (texto fora do formato é mantido)."""
+    if not valor:
+        return None
+    d = iso_para_date(valor)
+    return d.strftime(FORMATO_BR) if d else str(valor)
+
+
+def sql_data_br(coluna: str) -> str:
+    """Expressão SQL que exibe a data ISO de `coluna` como 'DD/MM/YYYY' (para filtros por trecho)."""
+    return f"(substr({coluna}, 9, 2) || '/' || substr({coluna}, 6, 2) || '/' || substr({coluna}, 1, 4))"
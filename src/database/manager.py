@@ -1,258 +1,131 @@
 import sqlite3
 import os
 import json
+import re
+import atexit
+import hashlib
+import heapq
+import threading
 from datetime import datetime, date
 from contextlib import contextmanager
-from typing import Optional, Any
+from typing import Iterator, Optional, Any
+from src.database.pool import ConnectionPool
+from src.database.datas import para_iso, iso_para_date, iso_para_br, sql_data_br
 from src.models.obra_model import ObraDeArte, StatusObra
 from src.models.artista_model import Artista, StatusArtista
 from src.models.transacao_model import Transacao
 from src.models.exposicao_model import Exposicao, StatusExposicao
 
+DB_FILE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "galeria_arte.db")
+
+# referência de imagem gravada em obras.imagem_hash (SHA-256 do conteúdo, em hexadecimal)
+_RE_HASH_IMAGEM = re.compile(r"[0-9a-f]{64}")
+
+# referência à transação original nas observações legadas de devoluções ("... transação ID 12")
+_RE_ID_ORIGEM = re.compile(r"\bID\s*:?\s*(\d+)\b")
+
+# colunas de data (todas gravadas em ISO 'YYYY-MM-DD', ver src/database/datas.py)
+COLUNAS_DATA = {
+    "obras": ("data_cadastro",),
+    "artistas": ("nascimento", "data_cadastro"),
+    "transacoes": ("data_transacao", "data_cadastro"),
+    "exposicoes": ("data_inicio", "data_fim", "data_cadastro"),
+    "participacao_exposicao": ("data_inclusao",),
+}
+
+
+def _padrao_like(valor) -> str:
+    """Padrão '%valor%' para LIKE ... ESCAPE '\\': `%` e `_` digitados pelo usuário valem literalmente."""
+    texto = str(valor).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{texto}%"
+
+
+# ordenações aceitas pelas listagens paginadas: campo -> expressão SQL ({t} = alias da tabela).
+# NULL vira um valor neutro para que a comparação por chave (keyset) nunca resulte em NULL.
+ORDENACAO_OBRAS = {
+    "id_obra": "{t}.id_obra",
+    "titulo": "minusculas(IFNULL({t}.titulo, ''))",
+    "tipo": "IFNULL({t}.tipo, '')",
+    "ano": "IFNULL({t}.ano, 0)",
+    "tecnica": "minusculas(IFNULL({t}.tecnica, ''))",
+    "dimensoes": "IFNULL({t}.dimensoes, '')",
+    "localizacao": "minusculas(IFNULL({t}.localizacao, ''))",
+    "preco": "IFNULL({t}.preco, 0)",
+    "status": "IFNULL({t}.status, '')",
+    "data_cadastro": "IFNULL({t}.data_cadastro, '')",
+}
+ORDENACAO_TRANSACOES = {
+    "id": "{t}.id",
+    "cliente": "minusculas(IFNULL({t}.cliente, ''))",
+    "valor": "IFNULL({t}.valor, 0)",
+    "tipo": "IFNULL({t}.tipo, '')",
+    "data_transacao": "IFNULL({t}.data_transacao, '')",
+    "data_cadastro": "IFNULL({t}.data_cadastro, '')",
+    "observacoes": "minusculas(IFNULL({t}.observacoes, ''))",
+}
+ORDENACAO_ARTISTAS = {
+    "id_artista": "{t}.id_artista",
+    "nome": "minusculas(IFNULL({t}.nome, ''))",
+    "nascimento": "IFNULL({t}.nascimento, '')",
+    "nacionalidade": "IFNULL({t}.nacionalidade, '')",
+    "especialidade": "IFNULL({t}.especialidade, '')",
+    "status": "IFNULL({t}.status, '')",
+    "data_cadastro": "IFNULL({t}.data_cadastro, '')",
+}
+
+# agrupamentos do resumo de receita: nome -> (rótulo, chave do GROUP BY, joins, fração do valor, ordem).
+# Uma transação com várias obras divide o valor igualmente entre elas (e cada obra entre seus
+# artistas); transações sem obra vinculada e obras sem artista caem nos grupos "(sem obra)" e
+# "(sem artista)", de modo que a soma por obra ou por artista fecha com a soma por tipo. A
+# quantidade, por outro lado, conta a transação uma vez em cada grupo em que ela aparece.
+_JOIN_OBRAS_RECEITA = ("LEFT JOIN transacao_obra tob ON tob.id_transacao = t.id "
+                       "LEFT JOIN obras o ON o.id_obra = tob.id_obra")
+_FRACAO_OBRA_RECEITA = "1.0 / MAX(1, (SELECT count(*) FROM transacao_obra x WHERE x.id_transacao = t.id))"
+AGRUPAMENTOS_RECEITA = {
+    "tipo": ("t.tipo", "t.tipo", "", "1", "total DESC"),
+    "mes": ("substr(t.data_transacao, 1, 7)", "substr(t.data_transacao, 1, 7)", "", "1", "rotulo"),
+    "cliente": ("t.cliente", "t.cliente", "", "1", "total DESC"),
+    "obra": ("IFNULL(o.titulo, '(sem obra)')", "o.id_obra", _JOIN_OBRAS_RECEITA, _FRACAO_OBRA_RECEITA, "total DESC"),
+    # artistas homônimos cadastrados ficam separados pelo id; sem obra e sem artista são grupos próprios
+    "artista": ("CASE WHEN o.id_obra IS NULL THEN '(sem obra)' ELSE IFNULL(oa.nome, '(sem artista)') END",
+                "o.id_obra IS NULL, oa.id_obra IS NULL, COALESCE(oa.id_artista, oa.nome)",
+                f"{_JOIN_OBRAS_RECEITA} LEFT JOIN obra_artista oa ON oa.id_obra = o.id_obra",
+                f"{_FRACAO_OBRA_RECEITA} / MAX(1, (SELECT count(*) FROM obra_artista y WHERE y.id_obra = o.id_obra))",
+                "total DESC"),
+}
+
 
 class DatabaseManager:
-    def __init__(self, db_file: Optional[str] = None):
-        if db_file is None:
-            db_dir = os.path.dirname(os.path.abspath(__file__))
-            self.db_file = os.path.join(db_dir, "galeria_arte.db")
-        else:
-            self.db_file = db_file
+    def __init__(self, db_file: Optional[str] = None, max_conexoes: int = 8):
+        self.db_file = db_file if db_file is not None else DB_FILE_PADRAO
 
-        os.makedirs(os.path.dirname(self.db_file), exist_ok=True)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_file)), exist_ok=True)
+        self._pool = ConnectionPool(self.db_file, max_conexoes=max_conexoes)
         self._criar_tabelas()
-
-        try:
-            hoje = date.today()
-
-            def _parse_data_mista(s):
-                if not s or str(s).strip() == "":
-                    return None
-                try:
-                    return datetime.fromisoformat(str(s)).date()
-                except Exception:
-                    pass
-                try:
-                    return datetime.strptime(str(s), "%d/%m/%Y").date()
-                except Exception:
-                    return None
-
-            expos = self.listar_exposicoes() or []
-            for expo in expos:
-                try:
-                    di_raw = getattr(expo, "data_inicio", None) or (expo.get("data_inicio") if isinstance(expo, dict) else None)
-                    df_raw = getattr(expo, "data_fim", None) or (expo.get("data_fim") if isinstance(expo, dict) else None)
-
-                    di = _parse_data_mista(di_raw)
-                    df = _parse_data_mista(df_raw)
-
-                    status_auto = ""
-                    if di and df:
-                        if hoje < di:
-                            status_auto = "Planejada"
-                        elif di <= hoje <= df:
-                            status_auto = "Em Curso"
-                        else:
-                            status_auto = "Finalizada"
-                    elif di and not df:
-                        status_auto = "Planejada" if hoje < di else "Em Curso"
-                    elif not di and df:
-                        status_auto = "Em Curso" if hoje <= df else "Finalizada"
-                    else:
-                        status_auto = ""
-
-                    try:
-                        stored_status = expo.status.value if hasattr(expo, "status") and hasattr(expo.status, "value") else (expo.get("status") if isinstance(expo, dict) else (getattr(expo, "status", "") or ""))
-                    except Exception:
-                        stored_status = (expo.get("status") if isinstance(expo, dict) else (getattr(expo, "status", "") or ""))
-
-                    # se houve mudança, atualiza a exposição persistida
-                    if status_auto and status_auto != (stored_status or ""):
-                        try:
-                            try:
-                                expo.status = next((s for s in StatusExposicao if s.value == status_auto), expo.status)
-                            except Exception:
-                                pass
-                            self.atualizar_exposicao(expo)
-                            stored_status = status_auto
-                        except Exception:
-                            pass
-
-                    parts = self.listar_participacoes_por_exposicao(getattr(expo, "id_exposicao", (expo.get("id_exposicao") if isinstance(expo, dict) else None))) or []
-
-                    def _extrair_campo_participacao(p, nome_campo):
-                        try:
-                            v = getattr(p, nome_campo)
-                            if v is not None:
-                                return v
-                        except Exception:
-                            pass
-                        try:
-                            if isinstance(p, dict):
-                                return p.get(nome_campo)
-                        except Exception:
-                            pass
-                        try:
-                            return p[nome_campo]
-                        except Exception:
-                            pass
-                        try:
-                            if hasattr(p, "get"):
-                                return p.get(nome_campo)
-                        except Exception:
-                            pass
-                        try:
-                            if nome_campo == "id_obra":
-                                return p[1]
-                        except Exception:
-                            pass
-                        try:
-                            if nome_campo == "titulo":
-                                return p[3]
-                        except Exception:
-                            pass
-                        try:
-                            for x in p:
-                                if isinstance(x, int):
-                                    return x
-                        except Exception:
-                            pass
-                        return None
-
-                    for part in parts:
-                        try:
-                            id_obra = _extrair_campo_participacao(part, "id_obra")
-                            titulo = _extrair_campo_participacao(part, "titulo")
-                            try:
-                                id_obra = int(id_obra) if id_obra is not None else None
-                            except Exception:
-                                id_obra = None
-
-                            if (stored_status == "Em Curso") or (status_auto == "Em Curso"):
-                                if titulo:
-                                    try:
-                                        self.atualizar_status_obra_por_titulo(titulo, "Em Exposição")
-                                    except Exception:
-                                        pass
-                                else:
-                                    if id_obra is not None:
-                                        try:
-                                            row = self.buscar_obra_por_id(id_obra)
-                                            titulo_row = getattr(row, "titulo", None) if row else None
-                                            if titulo_row:
-                                                self.atualizar_status_obra_por_titulo(titulo_row, "Em Exposição")
-                                        except Exception:
-                                            pass
-
-                            if (stored_status in ("Finalizada", "Planejada")) or (status_auto in ("Finalizada", "Planejada")):
-                                if id_obra is None:
-                                    try:
-                                        id_obra = int(part["id_obra"])
-                                    except Exception:
-                                        pass
-                                if id_obra is None:
-                                    if titulo:
-                                        try:
-                                            cur_ok = False
-                                            with self.conectar() as con:
-                                                c = con.cursor()
-                                                c.execute("""
-                                                    SELECT 1 FROM participacao_exposicao pe
-                                                    JOIN exposicoes ex ON pe.id_exposicao = ex.id_exposicao
-                                                    WHERE pe.id_obra = ? AND ex.status IN ('Planejada','Em Curso') AND ex.id_exposicao != ?
-                                                    LIMIT 1
-                                                """, (id_obra, getattr(expo, "id_exposicao", (expo.get("id_exposicao") if isinstance(expo, dict) else None))))
-                                                r = c.fetchone()
-                                                cur_ok = (r is not None)
-
-                                            if not cur_ok:
-                                                try:
-                                                    # obtém status atual pela título (prioriza consulta direta)
-                                                    status_atual = None
-                                                    with self.conectar() as con2:
-                                                        cur2 = con2.cursor()
-                                                        cur2.execute("SELECT status FROM obras WHERE titulo = ? LIMIT 1", (titulo,))
-                                                        rs = cur2.fetchone()
-                                                        if rs:
-                                                            try:
-                                                                status_atual = rs["status"]
-                                                            except Exception:
-                                                                status_atual = rs[0] if len(rs) > 0 else None
-                                                    # não sobrescrever se obra estiver Alugada/Vendida/Empréstimo
-                                                    if status_atual not in ("Alugada", "Vendida", "Empréstimo"):
-                                                        try:
-                                                            self.atualizar_status_obra_por_titulo(titulo, "Disponível")
-                                                        except Exception:
-                                                            pass
-                                                except Exception:
-                                                    pass
-                                        except Exception:
-                                            pass
-                                else:
-                                    try:
-                                        with self.conectar() as con:
-                                            c = con.cursor()
-                                            c.execute("""
-                                                SELECT 1 FROM participacao_exposicao pe
-                                                JOIN exposicoes ex ON pe.id_exposicao = ex.id_exposicao
-                                                WHERE pe.id_obra = ? AND ex.status IN ('Planejada','Em Curso') AND ex.id_exposicao != ?
-                                                LIMIT 1
-                                            """, (id_obra, getattr(expo, "id_exposicao", (expo.get("id_exposicao") if isinstance(expo, dict) else None))))
-                                            existe_ativa = c.fetchone() is not None
-
-                                        if not existe_ativa:
-                                            try:
-                                                # obtém status atual priorizando id_obra
-                                                status_atual = None
-                                                with self.conectar() as con2:
-                                                    cur2 = con2.cursor()
-                                                    cur2.execute("SELECT status, titulo FROM obras WHERE id_obra = ? LIMIT 1", (int(id_obra),))
-                                                    rs = cur2.fetchone()
-                                                    if rs:
-                                                        try:
-                                                            status_atual = rs["status"]
-                                                            titulo_db = rs.get("titulo") if isinstance(rs, sqlite3.Row) else (rs[1] if len(rs) > 1 else None)
-                                                        except Exception:
-                                                            status_atual = rs[0] if len(rs) > 0 else None
-                                                            titulo_db = rs[1] if len(rs) > 1 else None
-                                                    else:
-                                                        titulo_db = None
-
-                                                # só atualiza para Disponível se o status atual permitir
-                                                if status_atual not in ("Alugada", "Vendida", "Empréstimo"):
-                                                    # preferir atualizar por título conhecido
-                                                    target_titulo = titulo or titulo_db
-                                                    if target_titulo:
-                                                        try:
-                                                            self.atualizar_status_obra_por_titulo(target_titulo, "Disponível")
-                                                        except Exception:
-                                                            pass
-                                            except Exception:
-                                                pass
-                                    except Exception:
-                                        pass
-                        except Exception:
-                            continue
-                except Exception:
-                    pass
-        except Exception:
-            pass
+        self._aplicar_migracoes()
+        self._reconciliar_status_exposicoes()
 
     def conectar(self):
-        """Cria conexão com row_factory para acesso por nome de coluna."""
-        con = sqlite3.connect(self.db_file)
-        con.row_factory = sqlite3.Row
-        return con
+        """Retorna a conexão da thread atual (do pool), com row_factory por nome de coluna."""
+        return self._pool.obter()
 
     @contextmanager
     def cursor(self):
-        """Context manager que fornece um cursor e commita no final."""
+        """Context manager que fornece um cursor, commita no final e desfaz em caso de erro."""
         con = self.conectar()
         cur = con.cursor()
         try:
             yield cur
             con.commit()
+        except Exception:
+            con.rollback()
+            raise
         finally:
-            con.close()
+            cur.close()
+
+    def fechar(self):
+        """Fecha todas as conexões do pool (encerramento da aplicação)."""
+        self._pool.fechar_todas()
 
     # ---------------------- CRIAÇÃO DAS TABELAS ----------------------
     def _criar_tabelas(self):
@@ -270,9 +143,11 @@ class DatabaseManager:
                     preco REAL,
                     status TEXT NOT NULL,
                     imagem BLOB,
-                    data_cadastro TEXT
+                    data_cadastro TEXT,
+                    imagem_hash TEXT
                 )
             ''')
+            self._garantir_coluna(cursor, "obras", "imagem_hash", "TEXT")
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS artistas (
                     id_artista     INTEGER PRIMARY KEY,
@@ -294,7 +169,8 @@ class DatabaseManager:
                     data_transacao TEXT NOT NULL,
                     data_cadastro TEXT NOT NULL,
                     observacoes TEXT,
-                    obras TEXT
+                    obras TEXT,
+                    id_transacao_origem INTEGER REFERENCES transacoes(id)
                 )
             """)
             cursor.execute("""
@@ -322,6 +198,383 @@ class DatabaseManager:
                     FOREIGN KEY(id_obra) REFERENCES obras(id_obra)
                 )
             """)
+            # (id_obra, id_exposicao): participações de uma obra, consultadas na reconciliação de status e
+            # no NOT EXISTS de listar_obras_disponiveis
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_participacao_obra_expo ON participacao_exposicao(id_obra, id_exposicao)")
+            # obras de cada exposição na ordem de inclusão, sem ordenação extra (iter_exposicoes_com_obras)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_participacao_expo ON participacao_exposicao(id_exposicao, id)")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS obra_artista (
+                    id_obra INTEGER NOT NULL,
+                    posicao INTEGER NOT NULL,
+                    id_artista INTEGER,
+                    nome TEXT NOT NULL,
+                    PRIMARY KEY(id_obra, posicao),
+                    FOREIGN KEY(id_obra) REFERENCES obras(id_obra),
+                    FOREIGN KEY(id_artista) REFERENCES artistas(id_artista)
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_obra_artista_artista ON obra_artista(id_artista)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_obra_artista_nome ON obra_artista(nome)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_obras_titulo_ano ON obras(titulo, ano)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_obras_ano ON obras(ano)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_obras_status ON obras(status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_obras_tipo ON obras(tipo)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_obras_data_cadastro ON obras(data_cadastro)")
+            # (data, tipo, valor): cobre os filtros por período e as somas do resumo de receita
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_data_tipo ON transacoes(data_transacao, tipo, valor)")
+            self._garantir_coluna(cursor, "transacoes", "id_transacao_origem", "INTEGER")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacoes_origem ON transacoes(id_transacao_origem)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_exposicoes_inicio ON exposicoes(data_inicio)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_exposicoes_fim ON exposicoes(data_fim)")
+            # exposições sem data de início, já na ordem do fim (segunda parte de iter_exposicoes_com_obras)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_exposicoes_sem_inicio ON exposicoes(data_fim) WHERE data_inicio IS NULL
+            """)
+            # período efetivo (uma data ausente vale pela outra), na mesma forma usada por listar_exposicoes_no_intervalo
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_exposicoes_periodo
+                ON exposicoes(IFNULL(data_fim, data_inicio), IFNULL(data_inicio, data_fim))
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS transacao_obra (
+                    id_transacao INTEGER NOT NULL,
+                    id_obra INTEGER NOT NULL,
+                    PRIMARY KEY(id_transacao, id_obra),
+                    FOREIGN KEY(id_transacao) REFERENCES transacoes(id),
+                    FOREIGN KEY(id_obra) REFERENCES obras(id_obra)
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_transacao_obra_obra ON transacao_obra(id_obra)")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS imagens (
+                    hash TEXT PRIMARY KEY,
+                    dados BLOB NOT NULL,
+                    tamanho INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_obras_imagem_hash ON obras(imagem_hash)")
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS metadados (
+                    chave TEXT PRIMARY KEY,
+                    valor TEXT
+                )
+            """)
+            self._criar_resumos(cursor)
+
+    def _criar_resumos(self, cursor) -> None:
+        """
+        Tabelas de resumo do painel inicial, mantidas por triggers a cada INSERT/UPDATE/DELETE:
+        resumo_mensal (total e quantidade de transações por ano, mês e tipo) e as contagens por
+        status de obras e exposições. Ler um contador é ler uma linha, não varrer a tabela principal.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS resumo_mensal (
+                ano INTEGER NOT NULL,
+                mes INTEGER NOT NULL,
+                tipo TEXT NOT NULL,
+                total REAL NOT NULL DEFAULT 0,
+                qtd INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY(ano, mes, tipo)
+            )
+        """)
+        somar = """
+            INSERT INTO resumo_mensal (ano, mes, tipo, total, qtd)
+            VALUES (CAST(substr(NEW.data_transacao, 1, 4) AS INTEGER), CAST(substr(NEW.data_transacao, 6, 2) AS INTEGER),
+                    NEW.tipo, NEW.valor, 1)
+            ON CONFLICT(ano, mes, tipo) DO UPDATE SET total = total + excluded.total, qtd = qtd + 1;
+        """
+        subtrair = """
+            UPDATE resumo_mensal SET total = total - OLD.valor, qtd = qtd - 1
+            WHERE ano = CAST(substr(OLD.data_transacao, 1, 4) AS INTEGER)
+              AND mes = CAST(substr(OLD.data_transacao, 6, 2) AS INTEGER) AND tipo = OLD.tipo;
+            DELETE FROM resumo_mensal WHERE qtd <= 0;
+        """
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_resumo_transacoes_ins AFTER INSERT ON transacoes BEGIN {somar} END")
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_resumo_transacoes_del AFTER DELETE ON transacoes BEGIN {subtrair} END")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_resumo_transacoes_upd AFTER UPDATE OF data_transacao, tipo, valor ON transacoes
+            BEGIN {subtrair} {somar} END
+        """)
+
+        for tabela, resumo in (("obras", "resumo_status_obras"), ("exposicoes", "resumo_status_exposicoes")):
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {resumo} (
+                    status TEXT PRIMARY KEY,
+                    qtd INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            somar = f"""
+                INSERT INTO {resumo} (status, qtd) VALUES (NEW.status, 1)
+                ON CONFLICT(status) DO UPDATE SET qtd = qtd + 1;
+            """
+            # um status que fica sem nenhuma linha sai do resumo
+            subtrair = f"""
+                UPDATE {resumo} SET qtd = qtd - 1 WHERE status = OLD.status;
+                DELETE FROM {resumo} WHERE status = OLD.status AND qtd <= 0;
+            """
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{resumo}_ins AFTER INSERT ON {tabela} BEGIN {somar} END")
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS trg_{resumo}_del AFTER DELETE ON {tabela} BEGIN {subtrair} END")
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{resumo}_upd AFTER UPDATE OF status ON {tabela}
+                WHEN OLD.status IS NOT NEW.status
+                BEGIN {subtrair} {somar} END
+            """)
+
+    def _garantir_coluna(self, cursor, tabela: str, coluna: str, tipo: str) -> None:
+        """Adiciona `coluna` a `tabela` em bancos criados antes dela existir."""
+        cursor.execute(f"PRAGMA table_info({tabela})")
+        if coluna not in {r["name"] for r in cursor.fetchall()}:
+            cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}")
+
+    def _paginacao_keyset(self, tabela: str, coluna_id: str, ordenacao: dict, ordenar_por: str, alias: str,
+                          decrescente: bool = False, apos=None, antes=None) -> tuple[Optional[str], list, str, bool]:
+        """
+        Paginação por chave (keyset): ordena por (expressão, id) e continua depois do registro
+        `apos` (ou volta a partir de `antes`). O valor de ordenação do registro de referência é
+        resolvido no próprio SQL pelo id, então cada página custa uma busca, não um OFFSET crescente.
+        Retorna (condição ou None, parâmetros, ORDER BY, inverter) — `inverter` indica que a
+        página veio de trás para frente e deve ser revertida antes de ser devolvida.
+        """
+        expressao = ordenacao.get(ordenar_por)
+        if expressao is None:
+            raise ValueError(f"Ordenação inválida: {ordenar_por}")
+        para_tras = antes is not None
+        ref = antes if para_tras else apos
+        desc = bool(decrescente) != para_tras
+        direcao = "DESC" if desc else "ASC"
+        expr = expressao.format(t=alias)
+        order_by = f"{expr} {direcao}, {alias}.{coluna_id} {direcao}"
+        if ref is None:
+            return None, [], order_by, para_tras
+        condicao = (
+            f"({expr}, {alias}.{coluna_id}) {'<' if desc else '>'} "
+            f"((SELECT {expressao.format(t='ref')} FROM {tabela} ref WHERE ref.{coluna_id} = ?), ?)"
+        )
+        return condicao, [ref, ref], order_by, para_tras
+
+    # ---------------------- MIGRAÇÕES ----------------------
+    def _ler_metadado(self, chave: str) -> Optional[str]:
+        with self.conectar() as con:
+            row = con.execute("SELECT valor FROM metadados WHERE chave = ?", (chave,)).fetchone()
+        return row["valor"] if row else None
+
+    def _aplicar_migracoes(self) -> None:
+        """Executa, uma única vez por banco, as migrações de dados ainda não aplicadas."""
+        migracoes = [
+            ("migracao_obra_artista", self._migrar_obra_artista),
+            ("migracao_transacao_obra", self._migrar_transacao_obra),
+            ("migracao_datas_iso", self._migrar_datas_iso),
+            ("migracao_imagens", self._migrar_imagens),
+            ("migracao_devolucoes_origem", self._migrar_devolucoes_origem),
+            ("migracao_resumos", self._recalcular_resumos),
+        ]
+        for chave, migrar in migracoes:
+            if self._ler_metadado(chave):
+                continue
+            with self.cursor() as cur:
+                migrar(cur)
+                cur.execute(
+                    "INSERT OR REPLACE INTO metadados (chave, valor) VALUES (?, ?)",
+                    (chave, datetime.now().isoformat(timespec="seconds"))
+                )
+
+    def _migrar_obra_artista(self, cur) -> None:
+        """Copia a lista JSON de `obras.nome_artista` para a tabela obra_artista."""
+        cur.execute("SELECT id_obra, nome_artista FROM obras WHERE nome_artista IS NOT NULL AND nome_artista != ''")
+        legado = cur.fetchall()
+        for row in legado:
+            bruto = str(row["nome_artista"]).strip()
+            try:
+                parsed = json.loads(bruto)
+                nomes = [str(a) for a in parsed] if isinstance(parsed, list) else [str(parsed)]
+            except Exception:
+                nomes = [a.strip() for a in bruto.split(",") if a.strip()]
+            self._gravar_artistas_obra(cur, row["id_obra"], nomes)
+        cur.execute("UPDATE obras SET nome_artista = '' WHERE nome_artista != ''")
+
+    def _migrar_transacao_obra(self, cur) -> None:
+        """
+        Converte o CSV de `transacoes.obras` (ids ou títulos) em vínculos transacao_obra.
+        Referências que não correspondem a nenhuma obra permanecem na coluna legada.
+        """
+        cur.execute("SELECT id, obras FROM transacoes WHERE obras IS NOT NULL AND obras != ''")
+        legado = cur.fetchall()
+        for row in legado:
+            restante = self._gravar_obras_transacao(cur, row["id"], str(row["obras"]).split(","))
+            cur.execute("UPDATE transacoes SET obras = ? WHERE id = ?", (restante, row["id"]))
+
+    def _migrar_datas_iso(self, cur) -> None:
+        """Reescreve em ISO as datas gravadas como DD/MM/YYYY (ou ISO com hora); as ilegíveis ficam como estão."""
+        for tabela, colunas in COLUNAS_DATA.items():
+            for coluna in colunas:
+                cur.execute(f"""
+                    SELECT rowid AS linha, {coluna} AS valor FROM {tabela}
+                    WHERE {coluna} IS NOT NULL
+                      AND {coluna} NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+                """)
+                convertidas = []
+                for row in cur.fetchall():
+                    try:
+                        convertidas.append((para_iso(row["valor"]), row["linha"]))
+                    except ValueError:
+                        continue
+                cur.executemany(f"UPDATE {tabela} SET {coluna} = ? WHERE rowid = ?", convertidas)
+
+    def _migrar_imagens(self, cur) -> None:
+        """
+        Move o conteúdo de `obras.imagem` (bytes ou caminho de arquivo) para a tabela imagens.
+        Caminhos que não existem mais ficam na coluna legada.
+        """
+        cur.execute("SELECT id_obra FROM obras WHERE imagem IS NOT NULL AND imagem_hash IS NULL")
+        for (id_obra,) in cur.fetchall():
+            cur.execute("SELECT imagem FROM obras WHERE id_obra = ?", (id_obra,))
+            ref = self._gravar_imagem(cur, cur.fetchone()["imagem"])
+            if ref:
+                cur.execute("UPDATE obras SET imagem_hash = ?, imagem = NULL WHERE id_obra = ?", (ref, id_obra))
+
+    def _migrar_devolucoes_origem(self, cur) -> None:
+        """
+        Preenche `id_transacao_origem` das devoluções antigas a partir do "ID <n>" das observações.
+        Observações sem referência (ou com id de transação inexistente) ficam sem vínculo.
+        """
+        cur.execute("""
+            SELECT id, observacoes FROM transacoes
+            WHERE tipo = 'Devolução' AND id_transacao_origem IS NULL AND observacoes IS NOT NULL
+        """)
+        vinculos = []
+        for row in cur.fetchall():
+            m = _RE_ID_ORIGEM.search(row["observacoes"])
+            if m and int(m.group(1)) != row["id"]:
+                vinculos.append((int(m.group(1)), row["id"]))
+        cur.executemany("""
+            UPDATE transacoes SET id_transacao_origem = ?1
+            WHERE id = ?2 AND EXISTS (SELECT 1 FROM transacoes o WHERE o.id = ?1)
+        """, vinculos)
+
+    def _recalcular_resumos(self, cur) -> None:
+        """Reconstrói as tabelas de resumo a partir das tabelas principais (depois só os triggers as alteram)."""
+        cur.execute("DELETE FROM resumo_mensal")
+        cur.execute("""
+            INSERT INTO resumo_mensal (ano, mes, tipo, total, qtd)
+            SELECT CAST(substr(data_transacao, 1, 4) AS INTEGER), CAST(substr(data_transacao, 6, 2) AS INTEGER),
+                   tipo, SUM(valor), count(*)
+            FROM transacoes GROUP BY 1, 2, 3
+        """)
+        for tabela, resumo in (("obras", "resumo_status_obras"), ("exposicoes", "resumo_status_exposicoes")):
+            cur.execute(f"DELETE FROM {resumo}")
+            cur.execute(f"INSERT INTO {resumo} (status, qtd) SELECT status, count(*) FROM {tabela} GROUP BY status")
+
+    # ---------------------- RECONCILIAÇÃO DE STATUS ----------------------
+
+    def reconciliar_status_do_dia(self) -> None:
+        """
+        Reconcilia os status por data se o dia virou desde a última reconciliação (com o app
+        aberto de um dia para o outro); no mesmo dia é só a leitura de um metadado. Escreve no
+        banco, então deve rodar numa thread de trabalho, não na do Tk.
+        """
+        self._reconciliar_status_exposicoes()
+
+    def _reconciliar_status_exposicoes(self, forcar: bool = False, ids: Optional[list[int]] = None) -> None:
+        """
+        Ajusta o status das exposições pelas datas e propaga para as obras participantes.
+        Só considera exposições cujo início/fim foi cruzado desde a última reconciliação
+        (todas, na primeira execução ou com `forcar=True`); tudo roda em uma transação.
+        Com `ids`, só essas exposições (e suas obras), sem mudar a data da última reconciliação.
+        """
+        hoje = date.today().isoformat()
+        params = {"hoje": hoje, "ultima": None}
+        if ids is not None:
+            if not ids:
+                return
+            params.update({f"id{n}": int(i) for n, i in enumerate(ids)})
+            escopo = f"WHERE id_exposicao IN ({','.join(f':id{n}' for n in range(len(ids)))})"
+        else:
+            ultima = params["ultima"] = None if forcar else self._ler_metadado("ultima_reconciliacao")
+            if ultima == hoje:
+                return
+            if ultima and ultima < hoje:
+                escopo = ("WHERE (data_inicio > :ultima AND data_inicio <= :hoje)"
+                          " OR (data_fim >= :ultima AND data_fim < :hoje)")
+            else:
+                escopo = ""
+
+        with self.cursor() as cur:
+            cur.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS _expo_reconciliar (
+                    id_exposicao INTEGER PRIMARY KEY,
+                    novo_status TEXT
+                )
+            """)
+            cur.execute("DELETE FROM _expo_reconciliar")
+            cur.execute(f"""
+                INSERT INTO _expo_reconciliar (id_exposicao, novo_status)
+                SELECT id_exposicao,
+                       CASE
+                           WHEN data_inicio IS NOT NULL AND data_fim IS NOT NULL THEN
+                               CASE WHEN :hoje < data_inicio THEN 'Planejada'
+                                    WHEN :hoje <= data_fim THEN 'Em Curso'
+                                    ELSE 'Finalizada' END
+                           WHEN data_inicio IS NOT NULL THEN
+                               CASE WHEN :hoje < data_inicio THEN 'Planejada' ELSE 'Em Curso' END
+                           WHEN data_fim IS NOT NULL THEN
+                               CASE WHEN :hoje <= data_fim THEN 'Em Curso' ELSE 'Finalizada' END
+                       END
+                FROM exposicoes
+                {escopo}
+            """, params)
+
+            # 1) status das exposições
+            cur.execute("""
+                UPDATE exposicoes
+                SET status = (SELECT r.novo_status FROM _expo_reconciliar r
+                              WHERE r.id_exposicao = exposicoes.id_exposicao)
+                WHERE id_exposicao IN (SELECT id_exposicao FROM _expo_reconciliar WHERE novo_status IS NOT NULL)
+                  AND status IS NOT (SELECT r.novo_status FROM _expo_reconciliar r
+                                     WHERE r.id_exposicao = exposicoes.id_exposicao)
+            """)
+
+            # 2) obras de exposições em curso passam a "Em Exposição"
+            cur.execute("""
+                UPDATE obras SET status = 'Em Exposição'
+                WHERE status NOT IN ('Em Exposição', 'Alugada', 'Vendida', 'Empréstimo')
+                  AND id_obra IN (
+                      SELECT pe.id_obra
+                      FROM participacao_exposicao pe
+                      JOIN _expo_reconciliar r ON r.id_exposicao = pe.id_exposicao
+                      JOIN exposicoes ex ON ex.id_exposicao = pe.id_exposicao
+                      WHERE ex.status = 'Em Curso'
+                  )
+            """)
+
+            # 3) obras de exposições planejadas/finalizadas voltam a "Disponível"
+            #    quando não participam de nenhuma outra exposição ativa
+            cur.execute("""
+                UPDATE obras SET status = 'Disponível'
+                WHERE status NOT IN ('Disponível', 'Alugada', 'Vendida', 'Empréstimo')
+                  AND EXISTS (
+                      SELECT 1
+                      FROM participacao_exposicao pe
+                      JOIN _expo_reconciliar r ON r.id_exposicao = pe.id_exposicao
+                      JOIN exposicoes ex ON ex.id_exposicao = pe.id_exposicao
+                      WHERE pe.id_obra = obras.id_obra
+                        AND ex.status IN ('Finalizada', 'Planejada')
+                        AND NOT EXISTS (
+                            SELECT 1
+                            FROM participacao_exposicao pe2
+                            JOIN exposicoes ex2 ON ex2.id_exposicao = pe2.id_exposicao
+                            WHERE pe2.id_obra = pe.id_obra
+                              AND ex2.id_exposicao != pe.id_exposicao
+                              AND ex2.status IN ('Planejada', 'Em Curso')
+                        )
+                  )
+            """)
+
+            if ids is None:
+                cur.execute(
+                    "INSERT OR REPLACE INTO metadados (chave, valor) VALUES ('ultima_reconciliacao', ?)",
+                    (hoje,)
+                )
 
     # ---------------------- MÉTODOS OBRAS ----------------------
     def get_next_obra_id(self) -> int:
@@ -331,83 +584,359 @@ class DatabaseManager:
             resultado = cur.fetchone()[0]
         return 1 if resultado is None else resultado + 1
 
-    def inserir_obra(self, obra: ObraDeArte) -> None:
+    def inserir_obra(self, obra: ObraDeArte) -> int:
         sql = '''
-            INSERT INTO obras (id_obra, titulo, ano, nome_artista, tipo, tecnica, dimensoes, localizacao, preco, status, imagem, data_cadastro)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            INSERT INTO obras (id_obra, titulo, ano, nome_artista, tipo, tecnica, dimensoes, localizacao, preco, status, imagem_hash, data_cadastro)
+            VALUES (?, ?, ?, '', ?, ?, ?, ?, ?, ?, ?, ?)
         '''
-        data_cad_obj = obra.data_cadastro or date.today()
-        data_cad = data_cad_obj.isoformat() if hasattr(data_cad_obj, "isoformat") else data_cad_obj
+        data_cad = para_iso(obra.data_cadastro or date.today())
 
-        nome_artista_json = json.dumps(obra.artista, ensure_ascii=False) if isinstance(obra.artista, (list, tuple)) else json.dumps([obra.artista], ensure_ascii=False)
-        valores = (
-            obra.id_obra,
-            obra.titulo,
-            obra.ano,
-            nome_artista_json,
-            obra.tipo,
-            obra.tecnica,
-            obra.dimensoes,
-            obra.localizacao,
-            obra.preco,
-            obra.status.value,
-            obra.imagem,
-            data_cad
-        )
         with self.cursor() as cursor:
-            cursor.execute(sql, valores)
+            ref_imagem = self._gravar_imagem(cursor, obra.imagem)
+            cursor.execute(sql, (
+                obra.id_obra,
+                obra.titulo,
+                obra.ano,
+                obra.tipo,
+                obra.tecnica,
+                obra.dimensoes,
+                obra.localizacao,
+                obra.preco,
+                obra.status.value,
+                ref_imagem,
+                data_cad
+            ))
+            id_obra = obra.id_obra if obra.id_obra is not None else cursor.lastrowid
+            self._gravar_artistas_obra(cursor, id_obra, obra.artista)
+        return id_obra
 
     def listar_todas_obras(self) -> list[ObraDeArte]:
         with self.conectar() as con:
             cursor = con.cursor()
             cursor.execute('''
-                SELECT id_obra, titulo, ano, nome_artista, tipo, tecnica, dimensoes, localizacao, preco, status, imagem, data_cadastro
+                SELECT id_obra, titulo, ano, tipo, tecnica, dimensoes, localizacao, preco, status, imagem_hash AS imagem, data_cadastro
                 FROM obras ORDER BY id_obra
             ''')
             rows = cursor.fetchall()
-        return [self._criar_objeto_obra(r) for r in rows]
+            artistas = self._artistas_por_obra(con)
+        return [self._criar_objeto_obra(r, artistas.get(r["id_obra"], [])) for r in rows]
 
     def buscar_obra_por_id(self, obra_id: int) -> Optional[ObraDeArte]:
         with self.conectar() as con:
             cursor = con.cursor()
             cursor.execute('''
-                SELECT id_obra, titulo, ano, nome_artista, tipo, tecnica, dimensoes, localizacao, preco, status, imagem, data_cadastro
+                SELECT id_obra, titulo, ano, tipo, tecnica, dimensoes, localizacao, preco, status, imagem_hash AS imagem, data_cadastro
                 FROM obras WHERE id_obra = ?
             ''', (obra_id,))
             row = cursor.fetchone()
-        if row:
-            return self._criar_objeto_obra(row)
-        return None
+            if not row:
+                return None
+            artistas = self._artistas_por_obra(con, [row["id_obra"]])
+        return self._criar_objeto_obra(row, artistas.get(row["id_obra"], []))
 
     def atualizar_obra(self, obra: ObraDeArte) -> None:
         sql = '''
             UPDATE obras SET
-                titulo = ?, ano = ?, nome_artista = ?, tipo = ?, tecnica = ?,
-                dimensoes = ?, localizacao = ?, preco = ?, status = ?, imagem = ?
+                titulo = ?, ano = ?, tipo = ?, tecnica = ?,
+                dimensoes = ?, localizacao = ?, preco = ?, status = ?, imagem_hash = ?
             WHERE id_obra = ?
         '''
-        nome_artista_json = json.dumps(obra.artista, ensure_ascii=False) if isinstance(obra.artista, (list, tuple)) else json.dumps([obra.artista], ensure_ascii=False)
-        valores = (
-            obra.titulo, obra.ano, nome_artista_json, obra.tipo, obra.tecnica,
-            obra.dimensoes, obra.localizacao, obra.preco, obra.status.value,
-            obra.imagem, obra.id_obra
-        )
         with self.cursor() as cursor:
-            cursor.execute(sql, valores)
+            cursor.execute("SELECT imagem_hash FROM obras WHERE id_obra = ?", (obra.id_obra,))
+            row = cursor.fetchone()
+            ref_anterior = row["imagem_hash"] if row else None
+            ref_imagem = self._gravar_imagem(cursor, obra.imagem)
+            cursor.execute(sql, (
+                obra.titulo, obra.ano, obra.tipo, obra.tecnica,
+                obra.dimensoes, obra.localizacao, obra.preco, obra.status.value,
+                ref_imagem, obra.id_obra
+            ))
+            if ref_anterior and ref_anterior != ref_imagem:
+                self._descartar_imagem_orfa(cursor, ref_anterior)
+            self._gravar_artistas_obra(cursor, obra.id_obra, obra.artista)
 
     def verificar_obra_existe(self, titulo: str, artista, ano: int) -> bool:
-        artistas_norm = artista if isinstance(artista, (list, tuple)) else ([artista] if artista else [])
-        artista_json = json.dumps(artistas_norm, ensure_ascii=False)
+        artistas_norm = [str(a) for a in artista] if isinstance(artista, (list, tuple)) else ([str(artista)] if artista else [])
+        with self.conectar() as con:
+            cursor = con.cursor()
+            cursor.execute("SELECT id_obra FROM obras WHERE titulo = ? AND ano = ?", (titulo, ano))
+            candidatas = [r["id_obra"] for r in cursor.fetchall()]
+            if not candidatas:
+                return False
+            artistas = self._artistas_por_obra(con, candidatas)
+        return any(artistas.get(oid, []) == artistas_norm for oid in candidatas)
+
+    @staticmethod
+    def _condicao_nomes_artista(nomes: list[str]) -> tuple[str, list]:
+        """Condição (alias `oa` de obra_artista): nome contém algum dos `nomes`, sem distinguir maiúsculas."""
+        condicao = " OR ".join(["minusculas(oa.nome) LIKE ? ESCAPE '\\'"] * len(nomes))
+        return f"({condicao})", [_padrao_like(n.lower()) for n in nomes]
+
+    def listar_ids_obras_por_artistas(self, nomes: list[str]) -> set[int]:
+        """Ids das obras com participação de qualquer um dos artistas (substring do nome)."""
+        nomes = [str(n).strip() for n in (nomes or []) if str(n).strip()]
+        if not nomes:
+            return set()
+        condicao, params = self._condicao_nomes_artista(nomes)
+        with self.conectar() as con:
+            cursor = con.cursor()
+            cursor.execute(f"SELECT DISTINCT oa.id_obra FROM obra_artista oa WHERE {condicao}", params)
+            return {r[0] for r in cursor.fetchall()}
+
+    def listar_obras_por_artista(self, id_artista: int) -> list[ObraDeArte]:
         with self.conectar() as con:
             cursor = con.cursor()
             cursor.execute('''
-                SELECT count(*) FROM obras
-                WHERE titulo = ? AND nome_artista = ? AND ano = ?
-            ''', (titulo, artista_json, ano))
-            resultado = cursor.fetchone()[0]
-        return resultado > 0
+                SELECT o.id_obra, o.titulo, o.ano, o.tipo, o.tecnica, o.dimensoes, o.localizacao, o.preco, o.status, o.imagem_hash AS imagem, o.data_cadastro
+                FROM obra_artista oa
+                JOIN obras o ON o.id_obra = oa.id_obra
+                WHERE oa.id_artista = ?
+                ORDER BY o.id_obra
+            ''', (id_artista,))
+            rows = cursor.fetchall()
+            artistas = self._artistas_por_obra(con, [r["id_obra"] for r in rows])
+        return [self._criar_objeto_obra(r, artistas.get(r["id_obra"], [])) for r in rows]
+
+    def _filtros_obras(self, filtros: Optional[dict]) -> tuple[list[str], list]:
+        """
+        Cláusulas WHERE (alias `o`) dos filtros do relatório.
+        Filtros aceitos: titulo, tecnica, localizacao (substring); ano, tipo, status,
+        valor, data_cadastro (igualdade); artistas (substring de algum dos nomes) e transacoes (tipos).
+        """
+        filtros = filtros or {}
+        where, params = [], []
+
+        def like(campo, valor):
+            where.append(f"minusculas(o.{campo}) LIKE ? ESCAPE '\\'")
+            params.append(_padrao_like(str(valor).strip().lower()))
+
+        if filtros.get("titulo"):
+            like("titulo", filtros["titulo"])
+        if filtros.get("tecnica"):
+            like("tecnica", filtros["tecnica"])
+        if filtros.get("localizacao"):
+            like("localizacao", filtros["localizacao"])
+        if filtros.get("ano") is not None:
+            where.append("o.ano = ?")
+            params.append(int(filtros["ano"]))
+        if filtros.get("tipo"):
+            where.append("o.tipo = ?")
+            params.append(filtros["tipo"])
+        if filtros.get("status"):
+            where.append("o.status = ?")
+            params.append(filtros["status"])
+        if filtros.get("valor") is not None:
+            where.append("o.preco = ?")
+            params.append(float(filtros["valor"]))
+        if filtros.get("data_cadastro"):
+            dc = filtros["data_cadastro"]
+            where.append("o.data_cadastro = ?")
+            params.append(para_iso(dc))
+
+        artistas = [str(n).strip() for n in (filtros.get("artistas") or []) if str(n).strip()]
+        if artistas:
+            condicao, params_artistas = self._condicao_nomes_artista(artistas)
+            where.append(f"o.id_obra IN (SELECT oa.id_obra FROM obra_artista oa WHERE {condicao})")
+            params.extend(params_artistas)
+
+        tipos_transacao = list(filtros.get("transacoes") or [])
+        if tipos_transacao:
+            where.append(f'''EXISTS (
+                SELECT 1 FROM transacao_obra tob
+                JOIN transacoes t ON t.id = tob.id_transacao
+                WHERE tob.id_obra = o.id_obra AND t.tipo IN ({",".join("?" * len(tipos_transacao))})
+            )''')
+            params.extend(tipos_transacao)
+
+        return where, params
+
+    def buscar_obras(self, filtros: dict = None, limite: Optional[int] = None, offset: int = 0,
+                     ordenar_por: str = "id_obra", decrescente: bool = False,
+                     apos: Optional[int] = None, antes: Optional[int] = None) -> list[ObraDeArte]:
+        """
+        Busca obras aplicando os filtros do relatório (ver `_filtros_obras`) em um único SELECT
+        parametrizado. A ordenação é feita no banco (campos de ORDENACAO_OBRAS); para paginar,
+        informe `limite` e o id da última obra exibida em `apos` (ou da primeira, em `antes`).
+        """
+        where, params = self._filtros_obras(filtros)
+        cond, params_keyset, order_by, inverter = self._paginacao_keyset(
+            "obras", "id_obra", ORDENACAO_OBRAS, ordenar_por, "o", decrescente, apos, antes)
+        if cond:
+            where.append(cond)
+            params.extend(params_keyset)
+
+        sql = "SELECT o.id_obra, o.titulo, o.ano, o.tipo, o.tecnica, o.dimensoes, o.localizacao, o.preco, o.status, o.imagem_hash AS imagem, o.data_cadastro FROM obras o"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY " + order_by
+        if limite is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([int(limite), int(offset)])
+
+        with self.conectar() as con:
+            cursor = con.cursor()
+            cursor.execute(sql, tuple(params))
+            rows = cursor.fetchall()
+            artistas_map = self._artistas_por_obra(con, [r["id_obra"] for r in rows])
+        if inverter:
+            rows.reverse()
+        return [self._criar_objeto_obra(r, artistas_map.get(r["id_obra"], [])) for r in rows]
+
+    def contar_obras(self, filtros: dict = None) -> int:
+        """Total de obras que atendem aos filtros (mesmas regras de `buscar_obras`)."""
+        where, params = self._filtros_obras(filtros)
+        sql = "SELECT count(*) FROM obras o"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        with self.conectar() as con:
+            return con.execute(sql, tuple(params)).fetchone()[0]
+
+    def _condicao_obra_disponivel(self, inicio, fim, exclude_expo_id: Optional[int], status) -> tuple[str, list]:
+        """Condição WHERE (alias `o`) de obra livre em [inicio, fim]; ver listar_obras_disponiveis."""
+        inicio_iso, fim_iso = para_iso(inicio), para_iso(fim)
+        where, params = [], []
+        status = list(status or [])
+        if status:
+            where.append(f"o.status IN ({','.join('?' * len(status))})")
+            params.extend(status)
+
+        periodo = "1"
+        if inicio_iso and fim_iso:
+            periodo = "(e.data_inicio IS NULL OR e.data_fim IS NULL OR (e.data_inicio <= ? AND e.data_fim >= ?))"
+        where.append(f"""NOT EXISTS (
+            SELECT 1 FROM participacao_exposicao pe
+            JOIN exposicoes e ON e.id_exposicao = pe.id_exposicao
+            WHERE pe.id_obra = o.id_obra AND pe.id_exposicao IS NOT ? AND {periodo}
+        )""")
+        params.append(int(exclude_expo_id) if exclude_expo_id is not None else None)
+        if inicio_iso and fim_iso:
+            params.extend([fim_iso, inicio_iso])
+        return " AND ".join(where), params
+
+    def listar_obras_disponiveis(self, inicio, fim, exclude_expo_id: Optional[int] = None,
+                                 status=(StatusObra.DISPONIVEL.value, StatusObra.EM_EXPOSICAO.value)) -> list[ObraDeArte]:
+        """
+        Obras livres em [inicio, fim] em um único SELECT: status entre `status` e nenhuma
+        participação (fora de `exclude_expo_id`) em exposição cujo período cruze o intervalo.
+        Exposição sem datas — ou consulta sem período — conta como ocupação.
+        """
+        where, params = self._condicao_obra_disponivel(inicio, fim, exclude_expo_id, status)
+        sql = f"""
+            SELECT o.id_obra, o.titulo, o.ano, o.tipo, o.tecnica, o.dimensoes, o.localizacao, o.preco, o.status, o.imagem_hash AS imagem, o.data_cadastro
+            FROM obras o WHERE {where} ORDER BY o.id_obra
+        """
+        with self.conectar() as con:
+            rows = con.execute(sql, tuple(params)).fetchall()
+            artistas_map = self._artistas_por_obra(con, [r["id_obra"] for r in rows])
+        return [self._criar_objeto_obra(r, artistas_map.get(r["id_obra"], [])) for r in rows]
+
+    def listar_obras_com_disponibilidade(self, inicio, fim, exclude_expo_id: Optional[int] = None) -> list[sqlite3.Row]:
+        """
+        Todas as obras (id_obra, titulo, status, artistas) com `livre` = 1 se nenhuma exposição
+        (fora `exclude_expo_id`) que cruze [inicio, fim] as ocupa, em um único SELECT. O status
+        não entra no cálculo de `livre`: cada tela decide como combiná-lo.
+        """
+        where, params = self._condicao_obra_disponivel(inicio, fim, exclude_expo_id, None)
+        with self.conectar() as con:
+            return con.execute(f"""
+                SELECT o.id_obra, o.titulo, o.status,
+                       (SELECT group_concat(nome, ', ') FROM
+                            (SELECT oa.nome FROM obra_artista oa WHERE oa.id_obra = o.id_obra ORDER BY oa.posicao)
+                       ) AS artistas,
+                       CASE WHEN {where} THEN 1 ELSE 0 END AS livre
+                FROM obras o ORDER BY o.id_obra
+            """, tuple(params)).fetchall()
+
+    def obra_livre_no_periodo(self, id_obra: int, inicio, fim, exclude_expo_id: Optional[int] = None) -> bool:
+        """True se a obra não participa de exposição (fora `exclude_expo_id`) que cruze [inicio, fim]; mesma regra de listar_obras_disponiveis, sem olhar o status."""
+        where, params = self._condicao_obra_disponivel(inicio, fim, exclude_expo_id, None)
+        with self.conectar() as con:
+            row = con.execute(f"SELECT 1 FROM (SELECT ? AS id_obra) o WHERE {where}", (int(id_obra), *params)).fetchone()
+        return row is not None
+
+    def carregar_imagem(self, id_obra: int) -> Optional[bytes]:
+        """Bytes da imagem da obra (as listagens carregam apenas a referência em `obra.imagem`)."""
+        with self.conectar() as con:
+            row = con.execute('''
+                SELECT i.dados FROM obras o
+                JOIN imagens i ON i.hash = o.imagem_hash
+                WHERE o.id_obra = ?
+            ''', (id_obra,)).fetchone()
+        return bytes(row["dados"]) if row else None
+
+    def _gravar_imagem(self, cursor, imagem) -> Optional[str]:
+        """
+        Grava a imagem no repositório endereçado por conteúdo e retorna sua referência (SHA-256).
+        Aceita bytes, caminho de arquivo ou uma referência já gravada; conteúdos iguais são armazenados uma vez.
+        """
+        if not imagem:
+            return None
+        if isinstance(imagem, (bytes, bytearray, memoryview)):
+            dados = bytes(imagem)
+        else:
+            texto = str(imagem).strip()
+            if _RE_HASH_IMAGEM.fullmatch(texto):
+                return texto
+            if not os.path.isfile(texto):
+                return None
+            with open(texto, "rb") as arq:
+                dados = arq.read()
+        ref = hashlib.sha256(dados).hexdigest()
+        cursor.execute(
+            "INSERT OR IGNORE INTO imagens (hash, dados, tamanho) VALUES (?, ?, ?)",
+            (ref, sqlite3.Binary(dados), len(dados))
+        )
+        return ref
+
+    def _descartar_imagem_orfa(self, cursor, ref: str) -> None:
+        cursor.execute(
+            "DELETE FROM imagens WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM obras WHERE imagem_hash = ?)",
+            (ref, ref)
+        )
+
+    def _artistas_por_obra(self, con, ids_obra: Optional[list[int]] = None) -> dict[int, list[str]]:
+        """Mapa id_obra -> nomes dos artistas (na ordem de cadastro), via obra_artista."""
+        sql = '''
+            SELECT oa.id_obra, COALESCE(a.nome, oa.nome) AS nome
+            FROM obra_artista oa
+            LEFT JOIN artistas a ON a.id_artista = oa.id_artista
+        '''
+        params: tuple = ()
+        if ids_obra is not None:
+            if not ids_obra:
+                return {}
+            sql += f" WHERE oa.id_obra IN ({','.join('?' * len(ids_obra))})"
+            params = tuple(ids_obra)
+        sql += " ORDER BY oa.id_obra, oa.posicao"
+        resultado: dict[int, list[str]] = {}
+        for r in con.execute(sql, params):
+            resultado.setdefault(r["id_obra"], []).append(r["nome"])
+        return resultado
+
+    def _gravar_artistas_obra(self, cursor, id_obra: int, artistas) -> None:
+        """Substitui os vínculos obra_artista da obra, resolvendo nomes para id_artista."""
+        if isinstance(artistas, str):
+            nomes = [a.strip() for a in artistas.split(",") if a.strip()]
+        else:
+            nomes = [str(a).strip() for a in (artistas or []) if str(a).strip()]
+        cursor.execute("DELETE FROM obra_artista WHERE id_obra = ?", (id_obra,))
+        if not nomes:
+            return
+        ids = self._resolver_ids_artistas(cursor, nomes)
+        cursor.executemany(
+            "INSERT INTO obra_artista (id_obra, posicao, id_artista, nome) VALUES (?, ?, ?, ?)",
+            [(id_obra, pos, ids.get(nome), nome) for pos, nome in enumerate(nomes)]
+        )
 
-    def _criar_objeto_obra(self, row) -> ObraDeArte:
+    def _resolver_ids_artistas(self, cursor, nomes: list[str]) -> dict[str, int]:
+        unicos = list(dict.fromkeys(nomes))
+        cursor.execute(
+            f"SELECT nome, MIN(id_artista) AS id_artista FROM artistas WHERE nome IN ({','.join('?' * len(unicos))}) GROUP BY nome",
+            tuple(unicos)
+        )
+        return {r["nome"]: r["id_artista"] for r in cursor.fetchall()}
+
+    def _criar_objeto_obra(self, row, artistas: Optional[list[str]] = None) -> ObraDeArte:
         def _get(k, i):
             if isinstance(row, sqlite3.Row):
                 return row[k]
@@ -416,48 +945,24 @@ class DatabaseManager:
         id_obra = _get("id_obra", 0)
         titulo = _get("titulo", 1)
         ano = _get("ano", 2)
-        nome_artista = _get("nome_artista", 3)
-        tipo = _get("tipo", 4)
-        tecnica = _get("tecnica", 5)
-        dimensoes = _get("dimensoes", 6)
-        localizacao = _get("localizacao", 7)
-        preco = _get("preco", 8)
-        status_str = _get("status", 9)
-        imagem = _get("imagem", 10)
-        data_cadastro_str = _get("data_cadastro", 11)
+        tipo = _get("tipo", 3)
+        tecnica = _get("tecnica", 4)
+        dimensoes = _get("dimensoes", 5)
+        localizacao = _get("localizacao", 6)
+        preco = _get("preco", 7)
+        status_str = _get("status", 8)
+        imagem = _get("imagem", 9)
+        data_cadastro_str = _get("data_cadastro", 10)
 
         status_enum = next((s for s in StatusObra if s.value == status_str), StatusObra.DISPONIVEL)
 
-        data_cadastro = None
-        if data_cadastro_str:
-            try:
-                data_cadastro = datetime.fromisoformat(data_cadastro_str).date()
-            except Exception:
-                try:
-                    data_cadastro = date.fromisoformat(data_cadastro_str)
-                except Exception:
-                    data_cadastro = None
-
-        artistas_list = []
-        if nome_artista:
-            if isinstance(nome_artista, str):
-                nome_artista_str = nome_artista.strip()
-                try:
-                    parsed = json.loads(nome_artista_str)
-                    if isinstance(parsed, list):
-                        artistas_list = [str(a) for a in parsed]
-                    else:
-                        artistas_list = [str(parsed)]
-                except Exception:
-                    artistas_list = [a.strip() for a in nome_artista_str.split(",") if a.strip()]
-            else:
-                artistas_list = [str(nome_artista)]
+        data_cadastro = iso_para_date(data_cadastro_str)
 
         return ObraDeArte(
             id_obra=id_obra,
             titulo=titulo,
             ano=ano,
-            artista=artistas_list,
+            artista=list(artistas or []),
             tipo=tipo,
             tecnica=tecnica,
             dimensoes=dimensoes,
@@ -469,15 +974,18 @@ class DatabaseManager:
         )
 
     # ---------------------- MÉTODOS TRANSAÇÕES ----------------------
-    def inserir_transacao(self, transacao: Transacao) -> int:
+    def inserir_transacao(self, transacao: Transacao, novo_status_obras: Optional[str] = None) -> int:
+        """
+        Insere a transação e seus vínculos com obras; com `novo_status_obras`, atualiza na
+        mesma transação o status de todas as obras vinculadas (por id_obra).
+        """
         sql = '''
             INSERT INTO transacoes
-            (cliente, valor, tipo, data_transacao, data_cadastro, observacoes, obras)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            (cliente, valor, tipo, data_transacao, data_cadastro, observacoes, obras, id_transacao_origem)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         '''
-        data_transacao = transacao.data_transacao.isoformat() if hasattr(transacao.data_transacao, "isoformat") else transacao.data_transacao
-        data_cadastro = transacao.data_cadastro.isoformat() if hasattr(transacao.data_cadastro, "isoformat") else transacao.data_cadastro
-        obras_csv = ",".join(map(str, transacao.obras)) if transacao.obras is not None else None
+        data_transacao = para_iso(transacao.data_transacao)
+        data_cadastro = para_iso(transacao.data_cadastro)
 
         with self.cursor() as cursor:
             cursor.execute(sql, (
@@ -487,38 +995,87 @@ class DatabaseManager:
                 data_transacao,
                 data_cadastro,
                 transacao.observacoes,
-                obras_csv
+                "",
+                transacao.id_transacao_origem
             ))
-            return cursor.lastrowid
+            novo_id = cursor.lastrowid
+            restante = self._gravar_obras_transacao(cursor, novo_id, transacao.obras)
+            if restante:
+                cursor.execute("UPDATE transacoes SET obras = ? WHERE id = ?", (restante, novo_id))
+            if novo_status_obras:
+                self._atualizar_status_obras_transacao(cursor, novo_id, novo_status_obras)
+            return novo_id
 
     def listar_transacoes(self) -> list[Transacao]:
         with self.conectar() as con:
             cursor = con.cursor()
             cursor.execute("SELECT * FROM transacoes ORDER BY id DESC")
             rows = cursor.fetchall()
-        return [self._row_to_transacao(r) for r in rows]
+            obras_map = self._obras_por_transacao(con)
+        return [self._row_to_transacao(r, obras_map.get(r["id"], [])) for r in rows]
 
     def buscar_transacao_por_id(self, transacao_id: int) -> Optional[Transacao]:
         with self.conectar() as con:
             cursor = con.cursor()
             cursor.execute("SELECT * FROM transacoes WHERE id = ?", (transacao_id,))
             row = cursor.fetchone()
-        if not row:
-            return None
-        return self._row_to_transacao(row)
+            if not row:
+                return None
+            obras_map = self._obras_por_transacao(con, [transacao_id])
+        return self._row_to_transacao(row, obras_map.get(row["id"], []))
+
+    def buscar_devolucoes_de(self, transacao_id: int) -> list[Transacao]:
+        """Devoluções vinculadas à transação original (pelo índice em id_transacao_origem), em ordem de id."""
+        with self.conectar() as con:
+            rows = con.execute(
+                "SELECT * FROM transacoes WHERE id_transacao_origem = ? ORDER BY id", (transacao_id,)
+            ).fetchall()
+            obras_map = self._obras_por_transacao(con, [r["id"] for r in rows])
+        return [self._row_to_transacao(r, obras_map.get(r["id"], [])) for r in rows]
+
+    def listar_transacoes_por_obra(self, ids_obra: Optional[list[int]] = None) -> dict[int, list[Transacao]]:
+        """
+        Mapa id_obra -> transações que envolvem a obra (mais recentes primeiro),
+        resolvido com um único join em transacao_obra.
+        """
+        sql = """
+            SELECT t.*, tob.id_obra AS obra_vinculada
+            FROM transacao_obra tob
+            JOIN transacoes t ON t.id = tob.id_transacao
+        """
+        params: tuple = ()
+        if ids_obra is not None:
+            if not ids_obra:
+                return {}
+            sql += f" WHERE tob.id_obra IN ({','.join('?' * len(ids_obra))})"
+            params = tuple(ids_obra)
+        sql += " ORDER BY t.id DESC"
 
-    def atualizar_transacao(self, transacao: Transacao) -> None:
+        with self.conectar() as con:
+            rows = con.execute(sql, params).fetchall()
+            obras_map = self._obras_por_transacao(con, list({r["id"] for r in rows}))
+
+        transacoes: dict[int, Transacao] = {}
+        resultado: dict[int, list[Transacao]] = {}
+        for r in rows:
+            trans = transacoes.get(r["id"])
+            if trans is None:
+                trans = transacoes[r["id"]] = self._row_to_transacao(r, obras_map.get(r["id"], []))
+            resultado.setdefault(r["obra_vinculada"], []).append(trans)
+        return resultado
+
+    def atualizar_transacao(self, transacao: Transacao, novo_status_obras: Optional[str] = None) -> None:
         sql = """
             UPDATE transacoes
             SET cliente=?, valor=?, tipo=?, data_transacao=?, data_cadastro=?, observacoes=?, obras=?
             WHERE id=?
         """
-        data_transacao = transacao.data_transacao.isoformat() if hasattr(transacao.data_transacao, "isoformat") else transacao.data_transacao
-        data_cadastro = transacao.data_cadastro.isoformat() if hasattr(transacao.data_cadastro, "isoformat") else transacao.data_cadastro
-        obras_csv = ",".join(map(str, transacao.obras)) if transacao.obras is not None else None
+        data_transacao = para_iso(transacao.data_transacao)
+        data_cadastro = para_iso(transacao.data_cadastro)
         trans_id = getattr(transacao, "id", None) or getattr(transacao, "id_", None)
 
         with self.cursor() as cursor:
+            obras_csv = self._gravar_obras_transacao(cursor, trans_id, transacao.obras)
             cursor.execute(sql, (
                 transacao.cliente,
                 transacao.valor,
@@ -529,6 +1086,8 @@ class DatabaseManager:
                 obras_csv,
                 trans_id
             ))
+            if novo_status_obras:
+                self._atualizar_status_obras_transacao(cursor, trans_id, novo_status_obras)
 
     def get_next_transacao_id(self) -> int:
         with self.conectar() as con:
@@ -538,7 +1097,7 @@ class DatabaseManager:
         return 1 if resultado is None else resultado + 1
 
     def verificar_transacao_existe(self, cliente: str, data_transacao: date, valor: float) -> bool:
-        data_iso = data_transacao.isoformat() if hasattr(data_transacao, "isoformat") else data_transacao
+        data_iso = para_iso(data_transacao)
         with self.conectar() as con:
             cur = con.cursor()
             cur.execute("""
@@ -548,39 +1107,235 @@ class DatabaseManager:
             resultado = cur.fetchone()[0]
         return resultado > 0
 
-    def buscar_transacoes(self, filtros: dict) -> list[Transacao]:
+    def buscar_transacoes(self, filtros: dict = None, limite: Optional[int] = None, offset: int = 0,
+                          ordenar_por: str = "id", decrescente: bool = True,
+                          apos: Optional[int] = None, antes: Optional[int] = None) -> list[Transacao]:
+        """
+        Transações filtradas por cliente, tipo e período, ordenadas no banco (campos de
+        ORDENACAO_TRANSACOES; padrão: mais recentes primeiro) e paginadas por chave com
+        `limite` e `apos`/`antes` (ids de transações já exibidas).
+        """
+        where, params = self._filtros_transacoes(filtros)
+        cond, params_keyset, order_by, inverter = self._paginacao_keyset(
+            "transacoes", "id", ORDENACAO_TRANSACOES, ordenar_por, "t", decrescente, apos, antes)
+        if cond:
+            where.append(cond)
+            params.extend(params_keyset)
+
+        sql = "SELECT t.* FROM transacoes t"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY " + order_by
+        if limite is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([int(limite), int(offset)])
+
+        with self.conectar() as con:
+            cursor = con.cursor()
+            cursor.execute(sql, tuple(params))
+            rows = cursor.fetchall()
+            obras_map = self._obras_por_transacao(con, [r["id"] for r in rows])
+        if inverter:
+            rows.reverse()
+
+        return [self._row_to_transacao(r, obras_map.get(r["id"], [])) for r in rows]
+
+    def iter_transacoes(self, filtros: dict = None, apos: Optional[int] = None,
+                        tamanho_pagina: int = 200) -> Iterator[Transacao]:
+        """
+        Percorre as transações filtradas das mais recentes para as mais antigas (id decrescente,
+        começando depois de `apos`), buscando `tamanho_pagina` linhas por vez pela chave primária.
+        Cada linha só é convertida em Transacao quando consumida; nenhuma conexão fica presa entre páginas.
+        """
+        while True:
+            where, params = self._filtros_transacoes(filtros)
+            if apos is not None:
+                where.append("t.id < ?")
+                params.append(int(apos))
+            sql = "SELECT t.* FROM transacoes t"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY t.id DESC LIMIT ?"
+            params.append(int(tamanho_pagina))
+
+            with self.conectar() as con:
+                rows = con.execute(sql, tuple(params)).fetchall()
+                obras_map = self._obras_por_transacao(con, [r["id"] for r in rows])
+            for r in rows:
+                yield self._row_to_transacao(r, obras_map.get(r["id"], []))
+            if len(rows) < tamanho_pagina:
+                return
+            apos = rows[-1]["id"]
+
+    def receita_agrupada(self, agrupar_por: str, inicio=None, fim=None, tipos: Optional[list[str]] = None,
+                         limite: Optional[int] = None) -> list[tuple[str, float, int]]:
+        """
+        Soma de `valor` das transações em [inicio, fim] (datas opcionais) e dos `tipos` informados
+        (todos, se vazio), agrupada por um dos AGRUPAMENTOS_RECEITA. Retorna (rótulo, total,
+        quantidade de transações); o mês vem como 'YYYY-MM', em ordem cronológica.
+        """
+        if agrupar_por not in AGRUPAMENTOS_RECEITA:
+            raise ValueError(f"Agrupamento inválido: {agrupar_por}")
+        rotulo, chave, joins, fracao, ordem = AGRUPAMENTOS_RECEITA[agrupar_por]
+
+        where, params = [], []
+        if inicio:
+            where.append("t.data_transacao >= ?")
+            params.append(para_iso(inicio))
+        if fim:
+            where.append("t.data_transacao <= ?")
+            params.append(para_iso(fim))
+        tipos = list(tipos or [])
+        if tipos:
+            where.append(f"t.tipo IN ({','.join('?' * len(tipos))})")
+            params.extend(tipos)
+
+        sql = f"""
+            SELECT {rotulo} AS rotulo, SUM(t.valor * {fracao}) AS total, count(DISTINCT t.id) AS qtd
+            FROM transacoes t {joins}
+        """
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" GROUP BY {chave} ORDER BY {ordem}"
+        if limite is not None:
+            sql += " LIMIT ?"
+            params.append(int(limite))
+
+        with self.conectar() as con:
+            return [(r["rotulo"], r["total"] or 0.0, r["qtd"]) for r in con.execute(sql, tuple(params))]
+
+    def resumo_painel(self, hoje: Optional[date] = None) -> dict:
+        """
+        Contadores do painel inicial lidos das tabelas de resumo: obras disponíveis, vendas do
+        mês corrente (quantidade e total) e exposições em curso.
+        """
+        hoje = hoje or date.today()
+        with self.conectar() as con:
+            obras = con.execute("SELECT qtd FROM resumo_status_obras WHERE status = ?",
+                                (StatusObra.DISPONIVEL.value,)).fetchone()
+            vendas = con.execute("SELECT total, qtd FROM resumo_mensal WHERE ano = ? AND mes = ? AND tipo = 'Venda'",
+                                 (hoje.year, hoje.month)).fetchone()
+            expos = con.execute("SELECT qtd FROM resumo_status_exposicoes WHERE status = ?",
+                                (StatusExposicao.EM_CURSO.value,)).fetchone()
+        return {
+            "obras_disponiveis": obras["qtd"] if obras else 0,
+            "vendas_mes_qtd": vendas["qtd"] if vendas else 0,
+            "vendas_mes_total": vendas["total"] if vendas else 0.0,
+            "exposicoes_em_curso": expos["qtd"] if expos else 0,
+        }
+
+    def _filtros_transacoes(self, filtros: Optional[dict]) -> tuple[list[str], list]:
+        """Cláusulas WHERE (alias `t`): cliente (substring), tipo e período de data_transacao."""
+        filtros = filtros or {}
         where, params = [], []
 
         if filtros.get("cliente"):
-            where.append("cliente LIKE ?")
-            params.append(f"%{filtros['cliente']}%")
+            where.append("t.cliente LIKE ? ESCAPE '\\'")
+            params.append(_padrao_like(filtros["cliente"]))
         if filtros.get("tipo"):
-            where.append("tipo = ?")
+            where.append("t.tipo = ?")
             params.append(filtros["tipo"])
         if filtros.get("data_transacao_from"):
-            dt = filtros["data_transacao_from"]
-            dt_iso = dt.isoformat() if hasattr(dt, "isoformat") else dt
-            where.append("data_transacao >= ?")
-            params.append(dt_iso)
+            where.append("t.data_transacao >= ?")
+            params.append(para_iso(filtros["data_transacao_from"]))
         if filtros.get("data_transacao_to"):
-            dt = filtros["data_transacao_to"]
-            dt_iso = dt.isoformat() if hasattr(dt, "isoformat") else dt
-            where.append("data_transacao <= ?")
-            params.append(dt_iso)
+            where.append("t.data_transacao <= ?")
+            params.append(para_iso(filtros["data_transacao_to"]))
+        return where, params
+
+    def _obras_por_transacao(self, con, ids_transacao: Optional[list[int]] = None) -> dict[int, list[tuple[int, str]]]:
+        """Mapa id_transacao -> (id, título) das obras vinculadas (na ordem de cadastro), via transacao_obra."""
+        sql = ("SELECT tob.id_transacao, tob.id_obra, o.titulo FROM transacao_obra tob "
+               "LEFT JOIN obras o ON o.id_obra = tob.id_obra")
+        params: tuple = ()
+        if ids_transacao is not None:
+            if not ids_transacao:
+                return {}
+            sql += f" WHERE tob.id_transacao IN ({','.join('?' * len(ids_transacao))})"
+            params = tuple(ids_transacao)
+        sql += " ORDER BY tob.id_transacao, tob.rowid"
+        resultado: dict[int, list[tuple[int, str]]] = {}
+        for r in con.execute(sql, params):
+            resultado.setdefault(r["id_transacao"], []).append((r["id_obra"], r["titulo"] or ""))
+        return resultado
+
+    def _gravar_obras_transacao(self, cursor, id_transacao: int, obras) -> str:
+        """
+        Substitui os vínculos transacao_obra da transação. Aceita ids ou títulos;
+        retorna, em CSV, as referências que não correspondem a nenhuma obra cadastrada.
+        """
+        refs = [str(o).strip() for o in (obras or []) if str(o).strip()]
+        cursor.execute("DELETE FROM transacao_obra WHERE id_transacao = ?", (id_transacao,))
+        if not refs:
+            return ""
+        ids = self._resolver_ids_obras(cursor, refs)
+        cursor.executemany(
+            "INSERT OR IGNORE INTO transacao_obra (id_transacao, id_obra) VALUES (?, ?)",
+            [(id_transacao, ids[r]) for r in refs if r in ids]
+        )
+        return ",".join(r for r in refs if r not in ids)
 
-        sql = "SELECT * FROM transacoes"
-        if where:
-            sql += " WHERE " + " AND ".join(where)
-        sql += " ORDER BY id DESC"
+    def _atualizar_status_obras_transacao(self, cursor, id_transacao: int, novo_status: str) -> None:
+        cursor.execute(
+            "UPDATE obras SET status = ? WHERE id_obra IN (SELECT id_obra FROM transacao_obra WHERE id_transacao = ?)",
+            (novo_status, id_transacao)
+        )
 
+    def obter_status_obras(self, refs) -> dict[str, tuple[int, str, str]]:
+        """
+        Resolve referências de obra (ids ou títulos) em lote: ref -> (id_obra, titulo, status).
+        Referências sem obra correspondente ficam fora do mapa.
+        """
+        refs = [str(r).strip() for r in (refs or []) if str(r).strip()]
+        numericos = list({int(r) for r in refs if r.isdigit()})
+        titulos = list({r for r in refs if not r.isdigit()})
+        por_id: dict[int, tuple[int, str, str]] = {}
+        por_titulo: dict[str, tuple[int, str, str]] = {}
         with self.conectar() as con:
-            cursor = con.cursor()
-            cursor.execute(sql, tuple(params))
-            rows = cursor.fetchall()
-
-        return [self._row_to_transacao(r) for r in rows]
-
-    def _row_to_transacao(self, row) -> Optional[Transacao]:
+            if numericos:
+                rows = con.execute(
+                    f"SELECT id_obra, titulo, status FROM obras WHERE id_obra IN ({','.join('?' * len(numericos))})",
+                    tuple(numericos)
+                ).fetchall()
+                por_id = {r["id_obra"]: (r["id_obra"], r["titulo"], r["status"]) for r in rows}
+            if titulos:
+                # títulos repetidos: vale a obra de menor id (MIN leva as demais colunas da mesma linha)
+                rows = con.execute(
+                    f"SELECT MIN(id_obra) AS id_obra, titulo, status FROM obras WHERE titulo IN ({','.join('?' * len(titulos))}) GROUP BY titulo",
+                    tuple(titulos)
+                ).fetchall()
+                por_titulo = {r["titulo"]: (r["id_obra"], r["titulo"], r["status"]) for r in rows}
+        resultado = {}
+        for r in refs:
+            obra = por_id.get(int(r)) if r.isdigit() else por_titulo.get(r)
+            if obra:
+                resultado[r] = obra
+        return resultado
+
+    def _resolver_ids_obras(self, cursor, refs: list[str]) -> dict[str, int]:
+        """Mapeia referências de obra (id numérico ou título) para o id_obra existente."""
+        numericos = list({int(r) for r in refs if r.isdigit()})
+        titulos = list({r for r in refs if not r.isdigit()})
+        existentes: set[int] = set()
+        resultado: dict[str, int] = {}
+        if numericos:
+            cursor.execute(
+                f"SELECT id_obra FROM obras WHERE id_obra IN ({','.join('?' * len(numericos))})",
+                tuple(numericos)
+            )
+            existentes = {r["id_obra"] for r in cursor.fetchall()}
+        if titulos:
+            cursor.execute(
+                f"SELECT titulo, MIN(id_obra) AS id_obra FROM obras WHERE titulo IN ({','.join('?' * len(titulos))}) GROUP BY titulo",
+                tuple(titulos)
+            )
+            resultado.update({r["titulo"]: r["id_obra"] for r in cursor.fetchall()})
+        for r in refs:
+            if r.isdigit() and int(r) in existentes:
+                resultado[r] = int(r)
+        return resultado
+
+    def _row_to_transacao(self, row, obras_vinculadas: Optional[list[tuple[int, str]]] = None) -> Optional[Transacao]:
         if row is None:
             return None
 
@@ -597,34 +1352,19 @@ class DatabaseManager:
         data_cadastro_str = get_value("data_cadastro", 5)
         observacoes = get_value("observacoes", 6)
         obras_str = get_value("obras", 7)
+        if isinstance(row, sqlite3.Row):
+            origem = row["id_transacao_origem"] if "id_transacao_origem" in row.keys() else None
+        else:
+            origem = row[8] if len(row) > 8 else None
 
-        obras = []
+        # obras vinculadas (ids, como string) seguidas de referências legadas não resolvidas
+        obras = [str(i) for i, _ in (obras_vinculadas or [])]
+        titulos = {str(i): titulo for i, titulo in (obras_vinculadas or [])}
         if obras_str:
-            obras = [x.strip() for x in obras_str.split(",") if x.strip() != ""]
-
-        data_transacao_dt = None
-        data_cadastro_dt = None
+            obras += [x.strip() for x in obras_str.split(",") if x.strip() != ""]
 
-        if data_transacao_str:
-            try:
-                data_transacao_dt = datetime.fromisoformat(data_transacao_str)
-            except ValueError:
-                try:
-                    data_transacao_dt = datetime.strptime(data_transacao_str, "%d/%m/%Y")
-                except Exception:
-                    data_transacao_dt = None
-
-        if data_cadastro_str:
-            try:
-                data_cadastro_dt = datetime.fromisoformat(data_cadastro_str)
-            except ValueError:
-                try:
-                    data_cadastro_dt = datetime.strptime(data_cadastro_str, "%d/%m/%Y")
-                except Exception:
-                    data_cadastro_dt = None
-
-        data_transacao_fmt = data_transacao_dt.strftime("%d/%m/%Y") if data_transacao_dt else None
-        data_cadastro_fmt = data_cadastro_dt.strftime("%d/%m/%Y") if data_cadastro_dt else None
+        data_transacao_fmt = iso_para_br(data_transacao_str)
+        data_cadastro_fmt = iso_para_br(data_cadastro_str)
 
         trans = Transacao(
             cliente=cliente,
@@ -633,7 +1373,9 @@ class DatabaseManager:
             data_transacao=data_transacao_fmt,
             data_cadastro=data_cadastro_fmt,
             observacoes=observacoes,
-            obras=obras
+            obras=obras,
+            id_transacao_origem=origem,
+            titulos_obras=titulos
         )
 
         trans._Transacao__id = id_
@@ -676,11 +1418,11 @@ class DatabaseManager:
         return Artista(
             id_artista=id_artista,
             nome=nome,
-            nascimento=nascimento,
+            nascimento=iso_para_br(nascimento),
             nacionalidade=nacionalidade,
             especialidade=especialidade,
             status=status_enum,
-            data_cadastro=data_cadastro,
+            data_cadastro=iso_para_br(data_cadastro),
             biografia=biografia
         )
 
@@ -694,14 +1436,20 @@ class DatabaseManager:
         with self.cursor() as cursor:
             cursor.execute(sql, (
                 artista.nome,
-                artista.nascimento,
+                para_iso(artista.nascimento),
                 artista.nacionalidade,
                 artista.especialidade,
                 status_val,
-                artista.data_cadastro,
+                para_iso(artista.data_cadastro),
                 artista.biografia
             ))
-            return cursor.lastrowid
+            novo_id = cursor.lastrowid
+            # vincula obras cadastradas antes com o mesmo nome de artista
+            cursor.execute(
+                "UPDATE obra_artista SET id_artista = ? WHERE id_artista IS NULL AND nome = ?",
+                (novo_id, artista.nome)
+            )
+            return novo_id
 
     def atualizar_artista(self, artista: Artista) -> None:
         sql = """
@@ -714,14 +1462,15 @@ class DatabaseManager:
         with self.cursor() as cursor:
             cursor.execute(sql, (
                 artista.nome,
-                artista.nascimento,
+                para_iso(artista.nascimento),
                 artista.nacionalidade,
                 artista.especialidade,
                 status_val,
-                artista.data_cadastro,
+                para_iso(artista.data_cadastro),
                 artista.biografia,
                 artista.id_artista
             ))
+            cursor.execute("UPDATE obra_artista SET nome = ? WHERE id_artista = ?", (artista.nome, artista.id_artista))
 
     def obter_artista(self, id_artista: int) -> Optional[Artista]:
         with self.conectar() as con:
@@ -737,35 +1486,49 @@ class DatabaseManager:
             rows = cursor.fetchall()
         return [self._row_to_artista(r) for r in rows]
 
-    def buscar_artistas(self, filtros: dict = None) -> list[Artista]:
+    def buscar_artistas(self, filtros: dict = None, limite: Optional[int] = None, offset: int = 0,
+                        ordenar_por: str = "nome", decrescente: bool = False,
+                        apos: Optional[int] = None, antes: Optional[int] = None) -> list[Artista]:
+        """Artistas filtrados, ordenados no banco (ORDENACAO_ARTISTAS) e paginados por chave."""
         filtros = filtros or {}
         where, params = [], []
 
         def like(campo, valor):
             if valor:
-                where.append(f"{campo} LIKE ?")
-                params.append(f"%{valor}%")
+                where.append(f"{campo} LIKE ? ESCAPE '\\'")
+                params.append(_padrao_like(valor))
 
         like("nome", filtros.get("nome"))
-        like("nascimento", filtros.get("nascimento"))
+        like(sql_data_br("nascimento"), filtros.get("nascimento"))
         like("nacionalidade", filtros.get("nacionalidade"))
         like("especialidade", filtros.get("especialidade"))
-        like("data_cadastro", filtros.get("data_cadastro"))
+        like(sql_data_br("data_cadastro"), filtros.get("data_cadastro"))
 
         status = (filtros.get("status") or "").strip()
         if status:
             where.append("status = ?")
             params.append(status)
 
-        sql = "SELECT * FROM artistas"
+        cond, params_keyset, order_by, inverter = self._paginacao_keyset(
+            "artistas", "id_artista", ORDENACAO_ARTISTAS, ordenar_por, "a", decrescente, apos, antes)
+        if cond:
+            where.append(cond)
+            params.extend(params_keyset)
+
+        sql = "SELECT a.* FROM artistas a"
         if where:
             sql += " WHERE " + " AND ".join(where)
-        sql += " ORDER BY nome"
+        sql += " ORDER BY " + order_by
+        if limite is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([int(limite), int(offset)])
 
         with self.conectar() as con:
             c = con.cursor()
             c.execute(sql, tuple(params))
             rows = c.fetchall()
+        if inverter:
+            rows.reverse()
         return [self._row_to_artista(r) for r in rows]
 
     # ---------------------- MÉTODOS EXPOSIÇÕES ----------------------
@@ -779,9 +1542,9 @@ class DatabaseManager:
             exposicao.tema,
             exposicao.localizacao,
             status_val,
-            exposicao.data_inicio,
-            exposicao.data_fim,
-            exposicao.data_cadastro,
+            para_iso(exposicao.data_inicio),
+            para_iso(exposicao.data_fim),
+            para_iso(exposicao.data_cadastro),
             exposicao.descricao
         )
         try:
@@ -789,7 +1552,10 @@ class DatabaseManager:
                 cur = con.cursor()
                 cur.execute(sql, valores)
                 con.commit()
-                return True, cur.lastrowid
+                novo_id = cur.lastrowid
+            # status pelo período informado já no cadastro, sem esperar a virada do dia
+            self._reconciliar_status_exposicoes(ids=[novo_id])
+            return True, novo_id
         except Exception as e:
             return False, f"Erro ao inserir exposição: {e}"
 
@@ -803,9 +1569,9 @@ class DatabaseManager:
             exposicao.tema,
             exposicao.localizacao,
             status_val,
-            exposicao.data_inicio,
-            exposicao.data_fim,
-            exposicao.data_cadastro,
+            para_iso(exposicao.data_inicio),
+            para_iso(exposicao.data_fim),
+            para_iso(exposicao.data_cadastro),
             exposicao.descricao,
             exposicao.id_exposicao
         )
@@ -814,10 +1580,20 @@ class DatabaseManager:
                 cur = con.cursor()
                 cur.execute(sql, valores)
                 con.commit()
-                return True, "Exposição atualizada."
+            # as datas podem ter mudado: só esta exposição (e suas obras) é reconciliada
+            self._reconciliar_status_exposicoes(ids=[exposicao.id_exposicao])
+            return True, "Exposição atualizada."
         except Exception as e:
             return False, f"Erro ao atualizar exposição: {e}"
 
+    def _row_to_exposicao(self, r) -> Exposicao:
+        status_enum = next((s for s in StatusExposicao if s.value == r["status"]), StatusExposicao.PLANEJADA)
+        return Exposicao(
+            r["id_exposicao"], r["nome"], r["tema"], r["localizacao"], status_enum,
+            iso_para_br(r["data_inicio"]), iso_para_br(r["data_fim"]), iso_para_br(r["data_cadastro"]),
+            r["descricao"]
+        )
+
     def listar_exposicoes(self):
         res = []
         try:
@@ -827,16 +1603,25 @@ class DatabaseManager:
                 cur.execute("SELECT * FROM exposicoes ORDER BY id_exposicao ASC")
                 rows = cur.fetchall()
                 for r in rows:
-                    status_enum = next((s for s in StatusExposicao if s.value == r["status"]), StatusExposicao.PLANEJADA)
-                    e = Exposicao(
-                        r["id_exposicao"], r["nome"], r["tema"], r["localizacao"],
-                        status_enum, r["data_inicio"], r["data_fim"], r["data_cadastro"], r["descricao"]
-                    )
-                    res.append(e)
+                    res.append(self._row_to_exposicao(r))
         except Exception:
             pass
         return res
 
+    def listar_exposicoes_no_intervalo(self, inicio, fim) -> list[Exposicao]:
+        """
+        Exposições cujo período cruza [inicio, fim] (date ou texto), ordenadas pelo início.
+        Uma data ausente vale pela outra; exposições sem nenhuma data ficam de fora.
+        A busca percorre idx_exposicoes_periodo a partir de `inicio`, não a tabela inteira.
+        """
+        with self.conectar() as con:
+            rows = con.execute("""
+                SELECT * FROM exposicoes
+                WHERE IFNULL(data_fim, data_inicio) >= ? AND IFNULL(data_inicio, data_fim) <= ?
+                ORDER BY IFNULL(data_inicio, data_fim), id_exposicao
+            """, (para_iso(inicio), para_iso(fim))).fetchall()
+        return [self._row_to_exposicao(r) for r in rows]
+
     def obter_exposicao(self, id_exposicao):
         try:
             with self.conectar() as con:
@@ -846,11 +1631,7 @@ class DatabaseManager:
                 r = cur.fetchone()
                 if not r:
                     return None
-                status_enum = next((s for s in StatusExposicao if s.value == r["status"]), StatusExposicao.PLANEJADA)
-                return Exposicao(
-                    r["id_exposicao"], r["nome"], r["tema"], r["localizacao"],
-                    status_enum, r["data_inicio"], r["data_fim"], r["data_cadastro"], r["descricao"]
-                )
+                return self._row_to_exposicao(r)
         except Exception:
             return None
 
@@ -875,8 +1656,11 @@ class DatabaseManager:
             if key not in mapeamento or val is None or str(val).strip() == "":
                 continue
             col = mapeamento[key]
-            where_clauses.append(f"{col} LIKE ?")
-            params.append(f"%{val}%")
+            if key in COLUNAS_DATA["exposicoes"]:
+                # datas gravadas em ISO; o filtro por trecho continua em DD/MM/YYYY
+                col = sql_data_br(col)
+            where_clauses.append(f"{col} LIKE ? ESCAPE '\\'")
+            params.append(_padrao_like(val))
 
         if not where_clauses:
             return self.listar_exposicoes()
@@ -890,19 +1674,7 @@ class DatabaseManager:
                 cur.execute(sql, params)
                 rows = cur.fetchall()
                 for r in rows:
-                    status_enum = next((s for s in StatusExposicao if s.value == r["status"]), StatusExposicao.PLANEJADA)
-                    e = Exposicao(
-                        r["id_exposicao"],
-                        r["nome"],
-                        r["tema"],
-                        r["localizacao"],
-                        status_enum,
-                        r["data_inicio"],
-                        r["data_fim"],
-                        r["data_cadastro"],
-                        r["descricao"]
-                    )
-                    res.append(e)
+                    res.append(self._row_to_exposicao(r))
         except Exception:
             return []
         return res
@@ -929,7 +1701,7 @@ class DatabaseManager:
         if id_exposicao is None or id_obra is None:
             return False, "id_exposicao e id_obra são obrigatórios para inserir participação."
 
-        data_inclusao_val = data_inclusao or date.today().strftime("%d/%m/%Y")
+        data_inclusao_val = para_iso(data_inclusao or date.today())
 
         sql = """INSERT OR IGNORE INTO participacao_exposicao
                  (id_exposicao, id_obra, data_inclusao, observacao)
@@ -961,7 +1733,8 @@ class DatabaseManager:
                 cur = con.cursor()
                 cur.execute("""
                     SELECT pe.id as participacao_id, pe.data_inclusao, pe.observacao,
-                           o.*
+                           o.id_obra, o.titulo, o.ano, o.tipo, o.tecnica, o.dimensoes, o.localizacao,
+                           o.preco, o.status, o.imagem_hash AS imagem, o.data_cadastro
                     FROM participacao_exposicao pe
                     JOIN obras o ON o.id_obra = pe.id_obra
                     WHERE pe.id_exposicao = ?
@@ -972,6 +1745,146 @@ class DatabaseManager:
         except Exception:
             return []
 
+    def iter_exposicoes_com_obras(self, inicio=None, fim=None,
+                                  tamanho_lote: int = 200) -> Iterator[tuple[Exposicao, list[dict]]]:
+        """
+        Percorre as exposições em ordem de início (só as que cruzam [inicio, fim], se informado),
+        cada uma com suas obras participantes: os campos de listar_participacoes_por_exposicao
+        mais `artistas`. Uma data de início ausente vale pela de fim.
+
+        São duas consultas com LEFT JOIN, ambas já na ordem de um índice: as exposições com início
+        (idx_exposicoes_inicio) e as sem início (idx_exposicoes_sem_inicio, pelo fim), intercaladas
+        com heapq.merge. Nenhuma delas ordena em memória, então a primeira linha sai sem ler o
+        resto; os cursores são lidos em lotes de `tamanho_lote` linhas (fetchmany).
+
+        A leitura usa uma conexão própria, fora do pool, dentro de uma transação de leitura: as
+        duas consultas veem o mesmo estado do banco e escritas feitas enquanto o arquivo é gravado
+        (inclusive na conexão da própria thread) não interferem nos cursores abertos. A conexão é
+        fechada quando o iterador termina ou é descartado; consuma-o numa única thread.
+        """
+        com_inicio, params_com = ["e.data_inicio IS NOT NULL"], []
+        sem_inicio, params_sem = ["e.data_inicio IS NULL"], []
+        if inicio:
+            com_inicio.append("IFNULL(e.data_fim, e.data_inicio) >= ?")
+            sem_inicio.append("e.data_fim >= ?")
+            params_com.append(para_iso(inicio))
+            params_sem.append(para_iso(inicio))
+        if fim:
+            com_inicio.append("e.data_inicio <= ?")
+            sem_inicio.append("e.data_fim <= ?")
+            params_com.append(para_iso(fim))
+            params_sem.append(para_iso(fim))
+        sql = """
+            SELECT e.*,
+                   pe.id AS p_participacao_id, pe.data_inclusao AS p_data_inclusao, pe.observacao AS p_observacao,
+                   o.id_obra AS p_id_obra, o.titulo AS p_titulo, o.ano AS p_ano, o.tipo AS p_tipo,
+                   o.tecnica AS p_tecnica, o.dimensoes AS p_dimensoes, o.localizacao AS p_localizacao,
+                   o.preco AS p_preco, o.status AS p_status, o.data_cadastro AS p_data_cadastro,
+                   (SELECT group_concat(nome, ', ') FROM
+                        (SELECT oa.nome FROM obra_artista oa WHERE oa.id_obra = o.id_obra ORDER BY oa.posicao)
+                   ) AS p_artistas
+            FROM exposicoes e INDEXED BY {indice}
+            LEFT JOIN participacao_exposicao pe ON pe.id_exposicao = e.id_exposicao
+            LEFT JOIN obras o ON o.id_obra = pe.id_obra
+            WHERE {where}
+            ORDER BY {chave}, e.id_exposicao, pe.id
+        """
+
+        con, partes = self._pool.abrir_avulsa(), []
+        try:
+            con.execute("BEGIN")
+            partes += [
+                self._agrupar_obras_exposicao(
+                    con.execute(sql.format(indice="idx_exposicoes_inicio", where=" AND ".join(com_inicio),
+                                           chave="e.data_inicio"), tuple(params_com)), tamanho_lote),
+                self._agrupar_obras_exposicao(
+                    con.execute(sql.format(indice="idx_exposicoes_sem_inicio", where=" AND ".join(sem_inicio),
+                                           chave="e.data_fim"), tuple(params_sem)), tamanho_lote),
+            ]
+            # sem nenhuma data, a chave vazia vem antes de qualquer data (como NULL no ORDER BY)
+            ordem = lambda par: (par[0]["data_inicio"] or par[0]["data_fim"] or "", par[0]["id_exposicao"])
+            for expo, obras in heapq.merge(*partes, key=ordem):
+                yield self._row_to_exposicao(expo), obras
+        finally:
+            for parte in partes:
+                parte.close()
+            con.close()
+
+    @staticmethod
+    def _agrupar_obras_exposicao(cur, tamanho_lote: int) -> Iterator[tuple[sqlite3.Row, list[dict]]]:
+        """Agrupa as linhas (exposição x obra) consecutivas de `cur` em (linha da exposição, obras)."""
+        try:
+            atual, obras = None, []
+            while True:
+                rows = cur.fetchmany(tamanho_lote)
+                if not rows:
+                    break
+                for r in rows:
+                    if atual is None or r["id_exposicao"] != atual["id_exposicao"]:
+                        if atual is not None:
+                            yield atual, obras
+                        atual, obras = r, []
+                    if r["p_id_obra"] is not None:
+                        obras.append({k[2:]: r[k] for k in r.keys() if k.startswith("p_")})
+            if atual is not None:
+                yield atual, obras
+        finally:
+            cur.close()
+
+    def aplicar_participacoes(self, id_exposicao: int, adicionar, remover) -> list[int]:
+        """
+        Aplica em uma única transação as inclusões e remoções de obras de uma exposição,
+        com os status das obras ajustados por `executemany`. Só entram obras livres no
+        período da exposição (mesma regra de listar_obras_disponiveis); as recusadas são
+        devolvidas. Obras removidas voltam a Disponível se não estiverem em outra
+        exposição em curso hoje.
+        """
+        id_exposicao = int(id_exposicao)
+        remover = sorted({int(i) for i in remover or []})
+        adicionar = sorted({int(i) for i in adicionar or []} - set(remover))
+        hoje = date.today().isoformat()
+
+        with self.cursor() as cur:
+            cur.execute("SELECT data_inicio, data_fim FROM exposicoes WHERE id_exposicao = ?", (id_exposicao,))
+            expo = cur.fetchone()
+            if expo is None:
+                raise ValueError(f"Exposição {id_exposicao} não encontrada")
+
+            cur.executemany(
+                "DELETE FROM participacao_exposicao WHERE id_exposicao = ? AND id_obra = ?",
+                [(id_exposicao, oid) for oid in remover]
+            )
+            cur.executemany("""
+                UPDATE obras SET status = ?
+                WHERE id_obra = ? AND status = ? AND NOT EXISTS (
+                    SELECT 1 FROM participacao_exposicao pe
+                    JOIN exposicoes e ON e.id_exposicao = pe.id_exposicao
+                    WHERE pe.id_obra = obras.id_obra
+                      AND (e.data_inicio IS NULL OR e.data_fim IS NULL OR (e.data_inicio <= ? AND e.data_fim >= ?))
+                )
+            """, [(StatusObra.DISPONIVEL.value, oid, StatusObra.EM_EXPOSICAO.value, hoje, hoje) for oid in remover])
+
+            aceitas: list[int] = []
+            if adicionar:
+                where, params = self._condicao_obra_disponivel(
+                    expo["data_inicio"], expo["data_fim"], id_exposicao,
+                    (StatusObra.DISPONIVEL.value, StatusObra.EM_EXPOSICAO.value))
+                cur.execute(
+                    f"SELECT o.id_obra FROM obras o WHERE o.id_obra IN ({','.join('?' * len(adicionar))}) AND {where}",
+                    (*adicionar, *params)
+                )
+                aceitas = sorted(r["id_obra"] for r in cur.fetchall())
+            cur.executemany(
+                "INSERT OR IGNORE INTO participacao_exposicao (id_exposicao, id_obra, data_inclusao) VALUES (?, ?, ?)",
+                [(id_exposicao, oid, hoje) for oid in aceitas]
+            )
+            cur.executemany(
+                "UPDATE obras SET status = ? WHERE id_obra = ?",
+                [(StatusObra.EM_EXPOSICAO.value, oid) for oid in aceitas]
+            )
+
+        return sorted(set(adicionar) - set(aceitas))
+
     def verificar_participacao(self, id_exposicao, id_obra):
         try:
             with self.conectar() as con:
@@ -982,8 +1895,35 @@ class DatabaseManager:
             return False
 
 
+# ---------------------- INSTÂNCIA COMPARTILHADA ----------------------
+_managers: dict[str, DatabaseManager] = {}
+_managers_lock = threading.Lock()
+
+
+def obter_manager(db_file: Optional[str] = None) -> DatabaseManager:
+    """
+    Retorna o DatabaseManager compartilhado do processo para `db_file`.
+    Criação de tabelas e reconciliação de status rodam só na primeira chamada.
+    """
+    chave = os.path.abspath(db_file or DB_FILE_PADRAO)
+    with _managers_lock:
+        manager = _managers.get(chave)
+        if manager is None:
+            manager = DatabaseManager(chave)
+            _managers[chave] = manager
+        return manager
+
+
+@atexit.register
+def _fechar_managers():
+    with _managers_lock:
+        for manager in _managers.values():
+            manager.fechar()
+        _managers.clear()
+
+
 # Instância global segura do gerenciador
 try:
-    db = DatabaseManager()
+    db = obter_manager()
 except Exception:
     db = None
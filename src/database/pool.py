@@ -0,0 +1,91 @@
+import sqlite3
+import threading
+
+
+class ConnectionPool:
+    """
+    Pool limitado de conexões SQLite.
+    Cada thread recebe uma única conexão, reutilizada em todas as chamadas
+    feitas por ela; as conexões só são fechadas em `liberar()` ou `fechar_todas()`.
+    """
+
+    def __init__(self, db_file: str, max_conexoes: int = 8, timeout: float = 10.0):
+        self.db_file = db_file
+        self.max_conexoes = max(1, int(max_conexoes))
+        self.timeout = timeout
+        self._conexoes: dict[int, sqlite3.Connection] = {}
+        self._cond = threading.Condition()
+        self._fechado = False
+
+    def _nova_conexao(self) -> sqlite3.Connection:
+        # check_same_thread=False apenas para permitir o fechamento centralizado;
+        # o uso continua restrito à thread dona da conexão.
+        con = sqlite3.connect(self.db_file, timeout=self.timeout, check_same_thread=False)
+        con.row_factory = sqlite3.Row
+        # lower() nativo do SQLite só trata ASCII; filtros por substring usam esta versão Unicode
+        con.create_function("minusculas", 1, lambda v: v.lower() if isinstance(v, str) else v, deterministic=True)
+        try:
+            con.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.DatabaseError:
+            pass
+        return con
+
+    def _descartar_threads_encerradas(self) -> None:
+        vivas = {t.ident for t in threading.enumerate()}
+        for ident in [i for i in self._conexoes if i not in vivas]:
+            con = self._conexoes.pop(ident)
+            try:
+                con.close()
+            except Exception:
+                pass
+
+    def _tem_vaga(self) -> bool:
+        if len(self._conexoes) >= self.max_conexoes:
+            self._descartar_threads_encerradas()
+        return len(self._conexoes) < self.max_conexoes
+
+    def obter(self) -> sqlite3.Connection:
+        """Retorna a conexão da thread atual, abrindo-a se necessário."""
+        ident = threading.get_ident()
+        with self._cond:
+            con = self._conexoes.get(ident)
+            if con is not None:
+                return con
+            if self._fechado:
+                raise sqlite3.ProgrammingError("Pool de conexões já foi encerrado.")
+            if not self._cond.wait_for(self._tem_vaga, timeout=self.timeout):
+                raise sqlite3.OperationalError("Limite de conexões do pool atingido.")
+            con = self._nova_conexao()
+            self._conexoes[ident] = con
+            return con
+
+    def abrir_avulsa(self) -> sqlite3.Connection:
+        """
+        Conexão nova, fora do pool, para leituras longas que não devem dividir a conexão da
+        thread com escritas; quem abre é responsável por fechá-la.
+        """
+        return self._nova_conexao()
+
+    def liberar(self) -> None:
+        """Fecha a conexão da thread atual (threads de trabalho ao terminar)."""
+        with self._cond:
+            con = self._conexoes.pop(threading.get_ident(), None)
+            self._cond.notify()
+        if con is not None:
+            try:
+                con.close()
+            except Exception:
+                pass
+
+    def fechar_todas(self) -> None:
+        """Fecha todas as conexões abertas; chamado no encerramento da aplicação."""
+        with self._cond:
+            self._fechado = True
+            conexoes = list(self._conexoes.values())
+            self._conexoes.clear()
+            self._cond.notify_all()
+        for con in conexoes:
+            try:
+                con.close()
+            except Exception:
+                pass
@@ -8,7 +8,7 @@ class TiposTransacao(Enum):
     EMPRÉSTIMO = "Empréstimo"
 
 class Transacao:
-    def __init__(self, cliente, valor, tipo, data_transacao, observacoes=None, obras=None, id=None, data_cadastro=None):
+    def __init__(self, cliente, valor, tipo, data_transacao, observacoes=None, obras=None, id=None, data_cadastro=None, id_transacao_origem=None, titulos_obras=None):
         self.__id = id
         self.__cliente = cliente
         self.__valor = valor
@@ -18,6 +18,8 @@ class Transacao:
         self.__obras = obras or []
         self.__data_cadastro = data_cadastro if data_cadastro else datetime.now()
         self.__devolucao = None  # atributo privado para devolução, inicializado como None
+        self.__id_transacao_origem = id_transacao_origem  # transação original (só em devoluções)
+        self.__titulos_obras = titulos_obras or {}  # id (string) -> título, preenchido pelo banco
 
     # ---------- Propriedades existentes ----------
     @property
@@ -101,3 +103,15 @@ class Transacao:
     @devolucao.setter
     def devolucao(self, valor):
         self.__devolucao = valor  # pode ser None ou uma string/data
+
+    @property
+    def titulos_obras(self):
+        return self.__titulos_obras
+
+    @property
+    def id_transacao_origem(self):
+        return self.__id_transacao_origem
+
+    @id_transacao_origem.setter
+    def id_transacao_origem(self, valor):
+        self.__id_transacao_origem = int(valor) if valor is not None else None
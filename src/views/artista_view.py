@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from src.controllers.artista_controller import ArtistaController
+from src.views.lista_virtual import ListaVirtual
 
 NACIONALIDADES = ["Brasil","Argentina","Chile","Espanha","Portugal","França","Itália","Alemanha","Estados Unidos","Outro"]
 ESPECIALIDADES = ["Pintura","Escultura","Fotografia","Gravura","Instalação","Performance","Outros"]
@@ -30,6 +31,7 @@ class ArtistaView:
         style.configure("TLabel", background=bg)
 
         self._id_atual = None
+        self._filtros = {}
         self.criar_interface()
         self._carregar_lista()
 
@@ -119,6 +121,15 @@ class ArtistaView:
 
         self.tree.bind("<<TreeviewSelect>>", self._on_select)
 
+        self.lista = ListaVirtual(
+            self.tree, self._pagina_artistas, self._linha_artista, lambda a: a.id_artista, (self, "artistas"),
+            ordenacao={"ID": "id_artista", "Nome": "nome", "Nascimento": "nascimento",
+                       "Nacionalidade": "nacionalidade", "Especialidade": "especialidade",
+                       "Status": "status", "Data Cadastro": "data_cadastro"},
+            ordenar_por="nome",
+            ao_falhar=lambda e: messagebox.showerror("Artistas", f"Erro ao carregar artistas: {e}")
+        )
+
     # --- Ações ---
     def _salvar(self):
         ok, msg = self.controller.salvar(
@@ -147,19 +158,20 @@ class ArtistaView:
             "status": (self.status.get() or "").strip(),
             "data_cadastro": self.data_cadastro.get().strip().replace("DD/MM/YYYY", "").strip(),
         }
-        artistas = self.controller.buscar(filtros)
-        self._preencher_tree(artistas)
+        self._filtros = filtros
+        self.lista.recarregar()
 
     def _carregar_lista(self):
-        self._preencher_tree(self.controller.listar())
-
-    def _preencher_tree(self, artistas):
-        for i in self.tree.get_children(): self.tree.delete(i)
-        for a in artistas:
-            self.tree.insert("", tk.END, values=(
-                a.id_artista, a.nome, a.nascimento, a.nacionalidade,
-                a.especialidade, a.status.value, a.data_cadastro
-            ))
+        self._filtros = {}
+        self.lista.recarregar()
+
+    def _pagina_artistas(self, ordenar_por, decrescente, apos, antes, limite):
+        return self.controller.buscar(self._filtros, limite=limite, ordenar_por=ordenar_por,
+                                      decrescente=decrescente, apos=apos, antes=antes)
+
+    def _linha_artista(self, a):
+        return (a.id_artista, a.nome, a.nascimento, a.nacionalidade,
+                a.especialidade, a.status.value, a.data_cadastro)
 
     def _on_select(self, _):
         item = self.tree.focus()
@@ -3,40 +3,75 @@ import sys
 import math
 import hashlib
 import colorsys
+import calendar
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import date, datetime, timedelta
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import tkinter.font as tkfont
 from src.controllers.exposicao_controller import ExposicaoController
+from src.views.tarefas import obter_executor, indicador_ocupado
+from src.views.layout_calendario import (Grade, atribuir_faixas, segmentos_por_semana, eventos_por_dia,
+                                         retangulos, retangulos_resumidos)
+from src.views.renderizador_canvas import RenderizadorCanvas
 
 WEEKDAYS_PT = ["DOM", "SEG", "TER", "QUA", "QUI", "SEX", "SÁB"]
 MESES_PT = [
     "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
     "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
 ]
+LIMITE_CACHE_PERIODOS = 36  # períodos recentes mantidos em memória (navegação ◀/▶ sem ir ao banco)
+LIMITE_CACHE_LADRILHOS = 96  # meses já desenhados nas visões gerais, em coordenadas locais
+ROTULOS_MODO = {"Mês": "mes", "6 meses": "semestre", "Ano": "ano"}
+MESES_POR_MODO = {"mes": 1, "semestre": 6, "ano": 12}
+LADRILHOS = {"semestre": (3, 2), "ano": (4, 3)}  # (colunas, linhas) de meses nas visões gerais
+TEXTO_RODAPE = {
+    "mes": "Clique em um dia para ver exposições.",
+    "semestre": "Clique em um mês para abri-lo.",
+    "ano": "Clique em um mês para abri-lo.",
+}
 
 # ---------------- Helpers ----------------
 def _parse_data_valida(v):
-    """Aceita date, datetime, ISO (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS) e DD/MM/YYYY. Retorna date ou None."""
+    """Aceita date, datetime ou DD/MM/YYYY (formato entregue pelo controller). Retorna date ou None."""
     if v is None:
         return None
-    if isinstance(v, date) and not isinstance(v, datetime):
-        return v
     if isinstance(v, datetime):
         return v.date()
+    if isinstance(v, date):
+        return v
     s = str(v).strip()
     if not s:
         return None
-    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%d/%m/%Y"):
-        try:
-            return datetime.strptime(s, fmt).date()
-        except Exception:
-            continue
     try:
-        return datetime.fromisoformat(s).date()
-    except Exception:
+        return datetime.strptime(s, "%d/%m/%Y").date()
+    except ValueError:
         return None
 
+def _grade_do_mes(ano: int, mes: int):
+    """(primeira data exibida, número de semanas) da grade do mês, com semanas começando no domingo."""
+    primeiro = date(ano, mes, 1)
+    _, ndias = calendar.monthrange(ano, mes)
+    inicio_sem = (primeiro.weekday() + 1) % 7  # domingo=0
+    linhas = max(4, min(6, math.ceil((inicio_sem + ndias) / 7)))
+    return primeiro - timedelta(days=inicio_sem), linhas
+
+def _mes_vizinho(ano: int, mes: int, delta: int):
+    n = ano * 12 + (mes - 1) + delta
+    return n // 12, n % 12 + 1
+
+def _meses_do_periodo(modo: str, ano: int, mes: int):
+    """Meses exibidos no modo a partir de (ano, mes): 1, 6 ou 12 meses consecutivos."""
+    return tuple(_mes_vizinho(ano, mes, k) for k in range(MESES_POR_MODO[modo]))
+
+def _intervalo_dos_meses(meses):
+    """(primeira, última) data exibida pelas grades dos meses, incluindo os dias dos meses vizinhos."""
+    primeira, _ = _grade_do_mes(*meses[0])
+    inicio_ultima, linhas = _grade_do_mes(*meses[-1])
+    return primeira, inicio_ultima + timedelta(days=linhas * 7 - 1)
+
 def _hsv_para_hex(h, s, v):
     r, g, b = colorsys.hsv_to_rgb(h, s, v)
     return "#{:02X}{:02X}{:02X}".format(int(r*255), int(g*255), int(b*255))
@@ -72,22 +107,46 @@ def _cor_texto_contraste(hexcolor: str):
     brightness = (r * 299 + g * 587 + b * 114) / 1000
     return "#000000" if brightness > 125 else "#FFFFFF"
 
-def _truncar_texto(texto: str, fonte: tkfont.Font, largura_max: int):
+@lru_cache(maxsize=1024)
+def _cores_evento(titulo: str, inicio: date, fim: date):
+    """(cor de fundo, cor do texto) do evento; calculadas uma vez por exposição."""
+    cor = _garantir_cor_visivel(_cor_deterministica(titulo, inicio, fim))
+    return cor, _cor_texto_contraste(cor)
+
+# truncamento memorizado: a largura disponível é arredondada para baixo em baldes de
+# LARGURA_BALDE px (o texto nunca passa do espaço real) e cada medida do Tk é feita uma vez
+LARGURA_BALDE = 4
+_fontes = weakref.WeakValueDictionary()  # nome da fonte no Tk -> tkfont.Font
+
+@lru_cache(maxsize=16384)
+def _medir(nome_fonte: str, texto: str) -> int:
+    return _fontes[nome_fonte].measure(texto)
+
+@lru_cache(maxsize=4096)
+def _truncar_no_balde(texto: str, nome_fonte: str, balde: int) -> str:
+    largura_max = balde * LARGURA_BALDE
     if largura_max <= 0:
         return "…"
-    if fonte.measure(texto) <= largura_max:
+    if _medir(nome_fonte, texto) <= largura_max:
         return texto
     ell = "..."
+    # busca binária pelo maior prefixo que cabe com as reticências
     low, high = 0, len(texto)
     while low < high:
         mid = (low + high + 1) // 2
-        cand = texto[:mid] + ell
-        if fonte.measure(cand) <= largura_max:
+        if _medir(nome_fonte, texto[:mid] + ell) <= largura_max:
             low = mid
         else:
             high = mid - 1
     return (texto[:low] + ell) if low > 0 else "…"
 
+def _truncar_texto(texto: str, fonte: tkfont.Font, largura_max: int):
+    if largura_max <= 0:
+        return "…"
+    nome = str(fonte)
+    _fontes[nome] = fonte
+    return _truncar_no_balde(texto, nome, int(largura_max) // LARGURA_BALDE)
+
 # ---------------- View ----------------
 class CronogramaView:
     def __init__(self, root, controller=None, manager=None):
@@ -105,27 +164,100 @@ class CronogramaView:
         self.bg = "#F3F4F6"
         self.root.configure(bg=self.bg)
 
-        # carregar exposições
-        self.eventos = self._obter_eventos_do_db()
+        # exposições da grade exibida, carregadas em segundo plano (ver _carregar_eventos)
+        self.executor = obter_executor()
+        self.eventos = []
+        self._carregando = False
+        self._cache_periodos = OrderedDict()  # (modo, ano, mes) -> eventos do período (LRU)
+        self._cache_ladrilhos = OrderedDict()  # assinatura do mês -> primitivas do ladrilho (LRU)
 
-        # fontes e meta
+        # fontes
         self.fonte_evento = tkfont.Font(family="Segoe UI", size=9)
         self.fonte_dia = tkfont.Font(family="Segoe UI", size=11)
-        self.cell_meta = {}
+        self.fonte_mini = tkfont.Font(family="Segoe UI", size=7)
+        self.grade = None  # geometria do último desenho (ver desenhar_calendario)
+        self._ladrilhos = None  # geometria dos meses na visão geral (ver _desenhar_visao_geral)
 
+        self.modo = "mes"
         self.ano_exib = date.today().year
         self.mes_exib = date.today().month
 
         self.criar_interface()
-        self.desenhar_calendario()
         self._bind_redimensionamento()
+        self._carregar_eventos()
+
+    def _chave_atual(self):
+        # a visão anual sempre começa em janeiro; mês e semestre começam no mês exibido
+        return (self.modo, self.ano_exib, 1 if self.modo == "ano" else self.mes_exib)
+
+    def _carregar_eventos(self):
+        """Exibe o período atual: do cache, se visto há pouco; senão uma única consulta pelo intervalo inteiro."""
+        chave = self._chave_atual()
+        if chave in self._cache_periodos:
+            self._cache_periodos.move_to_end(chave)
+            self._carregando = False
+            self.eventos = self._cache_periodos[chave]
+            self.desenhar_calendario()
+            self._precarregar_vizinhos()
+            return
+
+        def exibir(eventos):
+            self._guardar_periodo(chave, eventos)
+            if chave == self._chave_atual():
+                self._carregando = False
+                self.eventos = eventos
+                self.desenhar_calendario()
+                self._precarregar_vizinhos()
 
-    def _obter_eventos_do_db(self):
-        """Lê exposições do controller e converte para lista de eventos simples."""
+        self._carregando = True
+        self.eventos = []
+        self.desenhar_calendario()
+        self.executor.agendar(
+            self.canvas, (self, "eventos"),
+            lambda: self._obter_eventos_do_db(*_intervalo_dos_meses(_meses_do_periodo(*chave))), exibir,
+            lambda e: messagebox.showerror("Erro", f"Erro ao carregar exposições: {e}"),
+            ocupado=indicador_ocupado(self.canvas)
+        )
+
+    def _passo(self):
+        return 12 if self.modo == "ano" else 1
+
+    def _precarregar_vizinhos(self):
+        # período anterior e seguinte em segundo plano, para ◀/▶ saírem do cache
+        modo, ano, mes = self._chave_atual()
+        vizinhos = [(modo,) + _mes_vizinho(ano, mes, d) for d in (-self._passo(), self._passo())]
+        faltando = [c for c in vizinhos if c not in self._cache_periodos]
+        if not faltando:
+            return
+
+        def guardar(por_periodo):
+            for chave, eventos in por_periodo.items():
+                self._guardar_periodo(chave, eventos)
+
+        self.executor.agendar(self.canvas, (self, "vizinhos"),
+                              lambda: {c: self._obter_eventos_do_db(*_intervalo_dos_meses(_meses_do_periodo(*c)))
+                                       for c in faltando},
+                              guardar)
+
+    def _guardar_periodo(self, chave, eventos):
+        if chave[0] != "mes":
+            # a consulta do período já cobre cada mês: abrir um deles não volta ao banco
+            for ano, mes in _meses_do_periodo(*chave):
+                if ("mes", ano, mes) not in self._cache_periodos:
+                    inicio, fim = _intervalo_dos_meses(((ano, mes),))
+                    self._cache_periodos[("mes", ano, mes)] = [ev for ev in eventos
+                                                              if ev["fim"] >= inicio and ev["inicio"] <= fim]
+        self._cache_periodos[chave] = eventos
+        self._cache_periodos.move_to_end(chave)
+        while len(self._cache_periodos) > LIMITE_CACHE_PERIODOS:
+            self._cache_periodos.popitem(last=False)
+
+    def _obter_eventos_do_db(self, inicio, fim):
+        """Lê do controller as exposições que cruzam [inicio, fim] e converte para eventos simples."""
         eventos = []
-        if not self.exposicao_controller or not hasattr(self.exposicao_controller, "listar"):
+        if not self.exposicao_controller or not hasattr(self.exposicao_controller, "listar_no_intervalo"):
             return eventos
-        expos = self.exposicao_controller.listar() or []
+        expos = self.exposicao_controller.listar_no_intervalo(inicio, fim) or []
         for ex in expos:
             nome = getattr(ex, "nome", None) or (ex.get("nome") if isinstance(ex, dict) else None)
             di_raw = getattr(ex, "data_inicio", None) or (ex.get("data_inicio") if isinstance(ex, dict) else None)
@@ -138,8 +270,8 @@ class CronogramaView:
                 di = df
             if not nome or not di or not df:
                 continue
-            cor = _garantir_cor_visivel(_cor_deterministica(nome, di, df))
-            eventos.append({"titulo": nome, "inicio": di, "fim": df, "cor": cor})
+            cor, cor_texto = _cores_evento(nome, di, df)
+            eventos.append({"titulo": nome, "inicio": di, "fim": df, "cor": cor, "cor_texto": cor_texto})
         return eventos
 
     # ---------- Interface ----------
@@ -169,9 +301,15 @@ class CronogramaView:
         self.combo_ano.pack(side="left", padx=(4,8))
         self.combo_ano.bind("<<ComboboxSelected>>", lambda e: self._on_ano_trocado())
 
+        self.var_modo = tk.StringVar(value="Mês")
+        self.combo_modo = ttk.Combobox(topo, values=list(ROTULOS_MODO), textvariable=self.var_modo, state="readonly", width=8)
+        self.combo_modo.pack(side="left", padx=(4,8))
+        self.combo_modo.bind("<<ComboboxSelected>>", lambda e: self._on_modo_trocado())
+
         ttk.Button(topo, text="◀", width=3, command=self._mes_anterior).pack(side="left", padx=(8,2))
         ttk.Button(topo, text="▶", width=3, command=self._mes_seguinte).pack(side="left", padx=(2,6))
         ttk.Button(topo, text="Hoje", command=self.ir_para_hoje).pack(side="left", padx=(6,6))
+        ttk.Button(topo, text="Exportar", command=self.exportar_cronograma).pack(side="left", padx=(6,6))
 
         frame_home = tk.Frame(topo, bg=self.bg)
         frame_home.pack(side="right", padx=(0,6))
@@ -185,52 +323,61 @@ class CronogramaView:
         self.canvas = tk.Canvas(card, bg=self.bg, highlightthickness=0)
         self.canvas.pack(fill="both", expand=True)
         self.canvas.bind("<Button-1>", self._ao_clicar_canvas)
+        self.renderizador = RenderizadorCanvas(self.canvas, ("grade", "eventos", "aviso"))
 
-        rodape = ttk.Label(self.root, text="Clique em um dia para ver exposições.", background=self.bg)
-        rodape.pack(fill="x", padx=12, pady=(0,8))
+        self.rodape = ttk.Label(self.root, text=TEXTO_RODAPE[self.modo], background=self.bg)
+        self.rodape.pack(fill="x", padx=12, pady=(0,8))
 
     # ---------- controles mês/ano ----------
     def _on_mes_trocado(self):
         v = self.combo_mes.get()
         if v in MESES_PT:
             self.mes_exib = MESES_PT.index(v) + 1
-            self.desenhar_calendario()
+            self._carregar_eventos()
 
     def _on_ano_trocado(self):
         try:
             self.ano_exib = int(self.combo_ano.get())
-            self.desenhar_calendario()
+            self._carregar_eventos()
         except Exception:
             pass
 
+    def _on_modo_trocado(self):
+        modo = ROTULOS_MODO.get(self.combo_modo.get())
+        if modo and modo != self.modo:
+            self.modo = modo
+            self.rodape.configure(text=TEXTO_RODAPE[modo])
+            self._carregar_eventos()
+
     def _mes_anterior(self):
-        m = self.mes_exib - 1
-        a = self.ano_exib
-        if m < 1:
-            m = 12
-            a -= 1
-        self.mes_exib, self.ano_exib = m, a
-        self.var_mes.set(MESES_PT[self.mes_exib-1])
-        self.var_ano.set(self.ano_exib)
-        self.desenhar_calendario()
+        self._navegar(-1)
 
     def _mes_seguinte(self):
-        m = self.mes_exib + 1
-        a = self.ano_exib
-        if m > 12:
-            m = 1
-            a += 1
-        self.mes_exib, self.ano_exib = m, a
-        self.var_mes.set(MESES_PT[self.mes_exib-1])
-        self.var_ano.set(self.ano_exib)
-        self.desenhar_calendario()
+        self._navegar(1)
+
+    def _navegar(self, sentido):
+        # no modo anual ◀/▶ trocam o ano; mês e semestre andam um mês
+        self.ano_exib, self.mes_exib = _mes_vizinho(self.ano_exib, self.mes_exib, sentido * self._passo())
+        self._sincronizar_controles()
+        self._carregar_eventos()
+
+    def _abrir_mes(self, ano, mes):
+        self.modo = "mes"
+        self.var_modo.set("Mês")
+        self.rodape.configure(text=TEXTO_RODAPE["mes"])
+        self.ano_exib, self.mes_exib = ano, mes
+        self._sincronizar_controles()
+        self._carregar_eventos()
 
     def ir_para_hoje(self):
         t = date.today()
         self.ano_exib, self.mes_exib = t.year, t.month
+        self._sincronizar_controles()
+        self._carregar_eventos()
+
+    def _sincronizar_controles(self):
         self.var_mes.set(MESES_PT[self.mes_exib-1])
         self.var_ano.set(self.ano_exib)
-        self.desenhar_calendario()
 
     # ---------- desenho do calendário ----------
     def _bind_redimensionamento(self):
@@ -254,7 +401,13 @@ class CronogramaView:
     def desenhar_calendario(self):
         if not getattr(self.canvas, "winfo_exists", lambda: 0)():
             return
-        self.canvas.delete("all")
+        if self.modo != "mes":
+            self._desenhar_visao_geral()
+            return
+        self._ladrilhos = None
+        # modo retido: o quadro é descrito inteiro e o renderizador só atualiza os itens que mudaram
+        r = self.renderizador
+        r.iniciar()
 
         largura = max(700, self.canvas.winfo_width())
         altura = max(420, self.canvas.winfo_height())
@@ -265,13 +418,9 @@ class CronogramaView:
         pad_esq, pad_dir, pad_top, pad_bot = 12, 12, 10, 12
 
         titulo = f"{MESES_PT[self.mes_exib-1]} {self.ano_exib}"
-        self.canvas.create_text(int(largura//2), int(pad_top + altura_header//2), text=titulo, font=("Segoe UI", 16, "bold"))
+        r.texto("grade", int(largura//2), int(pad_top + altura_header//2), text=titulo, font=("Segoe UI", 16, "bold"))
 
-        primeiro = date(self.ano_exib, self.mes_exib, 1)
-        _, ndias = __import__("calendar").monthrange(self.ano_exib, self.mes_exib)
-        inicio_sem = (primeiro.weekday() + 1) % 7  # domingo=0
-        total_celulas = inicio_sem + ndias
-        linhas = max(4, min(6, math.ceil(total_celulas / 7)))
+        primeira_celula, linhas = _grade_do_mes(self.ano_exib, self.mes_exib)
 
         topo_grade = pad_top + altura_header
         altura_grade = altura - topo_grade - pad_bot
@@ -284,201 +433,202 @@ class CronogramaView:
             y1 = topo_grade
             x2 = x1 + cell_w
             y2 = y1 + altura_weekday
-            self.canvas.create_rectangle(int(round(x1)), int(round(y1)), int(round(x2)), int(round(y2)), fill="#EEEEEE", outline="#D0D0D0")
-            self.canvas.create_text(int(round((x1+x2)/2)), int(round((y1+y2)/2)), text=WEEKDAYS_PT[c], font=("Segoe UI", 10, "bold"))
+            r.retangulo("grade", int(round(x1)), int(round(y1)), int(round(x2)), int(round(y2)), fill="#EEEEEE", outline="#D0D0D0")
+            r.texto("grade", int(round((x1+x2)/2)), int(round((y1+y2)/2)), text=WEEKDAYS_PT[c], font=("Segoe UI", 10, "bold"))
 
-        primeira_celula = primeiro - timedelta(days=inicio_sem)
-        self.cell_meta = {}
-        cur = primeira_celula
-        for r in range(linhas):
+        self.grade = Grade(primeira_celula, linhas, pad_esq, topo_grade + altura_weekday, cell_w, cell_h)
+        hoje = date.today()
+        for lin in range(linhas):
             for c in range(colunas):
-                x1 = pad_esq + c * cell_w
-                y1 = topo_grade + altura_weekday + r * cell_h
-                x2 = x1 + cell_w
-                y2 = y1 + cell_h
-                ix1, iy1, ix2, iy2 = int(round(x1)), int(round(y1)), int(round(x2)), int(round(y2))
-                is_hoje = (cur == date.today())
+                cur = self.grade.data(lin, c)
+                ix1, iy1, ix2, iy2 = self.grade.bbox(lin, c)
+                is_hoje = (cur == hoje)
                 fill = "#FFF5CC" if (cur.month == self.mes_exib and is_hoje) else ("white" if cur.month == self.mes_exib else "#F7F7F7")
-                self.canvas.create_rectangle(ix1, iy1, ix2, iy2, fill=fill, outline="#DDDDDD")
+                r.retangulo("grade", ix1, iy1, ix2, iy2, fill=fill, outline="#DDDDDD")
                 cor_dia = "#333333" if cur.month == self.mes_exib else "#B5B5B5"
-                self.canvas.create_text(ix1 + 8, iy1 + 10, anchor="nw", text=str(cur.day), font=self.fonte_dia, fill=cor_dia)
-                self.cell_meta[cur] = {"bbox": (ix1, iy1, ix2, iy2), "row": r, "col": c}
-                cur += timedelta(days=1)
+                r.texto("grade", ix1 + 8, iy1 + 10, anchor="nw", text=str(cur.day), font=self.fonte_dia, fill=cor_dia)
 
         if not self.eventos:
-            self.canvas.create_text(int(largura//2), int(topo_grade + altura_weekday + altura_grade/2), text="Nenhuma exposição cadastrada.", font=("Segoe UI", 12), fill="#666")
-            return
-
-        self._desenhar_eventos(cell_w, cell_h)
-
-    def _desenhar_eventos(self, cell_w, cell_h):
-        dates_displayed = sorted(self.cell_meta.keys())
-        if not dates_displayed:
-            return
+            if not self._carregando:
+                r.texto("aviso", int(largura//2), int(topo_grade + altura_weekday + altura_grade/2), text="Nenhuma exposição neste período.", font=("Segoe UI", 12), fill="#666")
+        else:
+            self._desenhar_eventos()
+        r.finalizar()
+
+    def _segmentos(self):
+        # faixas, segmentos e o índice por dia só dependem dos eventos e das datas da grade: redimensionar reaproveita
+        chave = (self.grade.primeira, self.grade.semanas)
+        if getattr(self, "_segmentos_eventos", None) is not self.eventos or self._segmentos_chave != chave:
+            self._segmentos_eventos, self._segmentos_chave = self.eventos, chave
+            self._segmentos_cache = segmentos_por_semana(self.eventos, self.grade.primeira, self.grade.semanas)
+            self._eventos_por_dia = eventos_por_dia(self._segmentos_cache, self.grade.primeira)
+        return self._segmentos_cache
+
+    def _desenhar_eventos(self):
+        altura_fonte = self.fonte_evento.metrics("linespace")
+        for ret in retangulos(self._segmentos(), self.grade, altura_fonte):
+            ev = self.eventos[ret.segmento.evento]
+            cor = ev.get("cor", "#CFE8FF")
+            rx1, ry1, rx2, ry2 = ret.x1, ret.y1, ret.x2, ret.y2
+            self.renderizador.retangulo("eventos", rx1, ry1, rx2, ry2, fill=cor, outline=cor, width=1)
+            padding = 6
+            largura_disp = max(0, (rx2 - rx1) - padding*2)
+            texto = _truncar_texto(ev.get("titulo", ""), self.fonte_evento, largura_disp)
+            cor_txt = ev.get("cor_texto") or _cor_texto_contraste(cor)
+            yc = int((ry1 + ry2) / 2)
+            self.renderizador.texto("eventos", int((rx1 + rx2) / 2), yc, text=texto, font=self.fonte_evento, fill=cor_txt)
+
+    # ---------- visões de 6 e 12 meses ----------
+    def _desenhar_visao_geral(self):
+        # um ladrilho por mês; as faixas valem para o período inteiro e cada ladrilho vem do cache
+        # enquanto seus eventos e seu tamanho não mudam
+        r = self.renderizador
+        r.iniciar()
+        self.grade = None
 
-        data_para_eventos = {d: [] for d in dates_displayed}
-        for idx, ev in enumerate(self.eventos):
-            s, e = ev["inicio"], ev["fim"]
-            if not s or not e:
-                continue
-            for i in range((e - s).days + 1):
-                d = s + timedelta(days=i)
-                if d in data_para_eventos:
-                    data_para_eventos[d].append(idx)
-
-        # lane assignment global
-        lane_por_evento = {}
-        usado = {d: set() for d in dates_displayed}
-        order = sorted(range(len(self.eventos)), key=lambda i: (self.eventos[i]["inicio"], self.eventos[i]["titulo"]))
-        for i in order:
-            ev = self.eventos[i]
-            s, e = ev["inicio"], ev["fim"]
-            cobertos = [d for d in dates_displayed if s <= d <= e]
-            if not cobertos:
-                continue
-            lane = 0
-            while any(lane in usado[d] for d in cobertos):
-                lane += 1
-            for d in cobertos:
-                usado[d].add(lane)
-            lane_por_evento[i] = lane
-
-        # row -> datas
-        rows = {}
-        for d, meta in self.cell_meta.items():
-            rows.setdefault(meta["row"], []).append(d)
-        for r in rows:
-            rows[r].sort()
-
-        reservado_top = 28
-        gap_padrao = 4
-        alturas_por_row = {}
-        offsets_por_row = {}
-
-        for r, datas in rows.items():
-            necessario = max((len(data_para_eventos.get(d, [])) for d in datas), default=0)
-            max_idx = -1
-            for d in datas:
-                if usado.get(d):
-                    max_idx = max(max_idx, max(usado[d]))
-            if max_idx >= 0:
-                necessario = max(necessario, max_idx + 1)
-            if necessario <= 0:
-                alturas_por_row[r] = []
-                offsets_por_row[r] = []
-                continue
+        largura = max(700, self.canvas.winfo_width())
+        altura = max(420, self.canvas.winfo_height())
+        pad, altura_header, gap = 12, 50, 10
+        colunas, linhas = LADRILHOS[self.modo]
+        meses = _meses_do_periodo(*self._chave_atual())
 
-            efetivos = max(2, necessario)
-            disponivel_vertical = max(0, int(cell_h) - reservado_top - 4)
-            gap_lane = gap_padrao if disponivel_vertical / efetivos >= 12 else 2
-            disponivel_para_lanes = max(0, disponivel_vertical - (efetivos - 1) * gap_lane)
-            altura_fonte = max(10, self.fonte_evento.metrics("linespace"))
-            min_lane_h = max(10, altura_fonte + 4)
-
-            if disponivel_para_lanes <= 0:
-                base, resto = 1, 0
-            else:
-                if disponivel_para_lanes >= min_lane_h * efetivos:
-                    base = disponivel_para_lanes // efetivos
-                    resto = disponivel_para_lanes % efetivos
+        if self.modo == "ano":
+            titulo = str(self.ano_exib)
+        else:
+            (a0, m0), (a1, m1) = meses[0], meses[-1]
+            titulo = f"{MESES_PT[m0-1]} {a0} – {MESES_PT[m1-1]} {a1}"
+        r.texto("grade", int(largura//2), int(pad + altura_header//2), text=titulo, font=("Segoe UI", 16, "bold"))
+
+        topo = pad + altura_header
+        larg_lad = int((largura - 2*pad - (colunas-1)*gap) / colunas)
+        alt_lad = int((altura - topo - pad - (linhas-1)*gap) / linhas)
+        self._ladrilhos = (pad, topo, larg_lad, alt_lad, gap, colunas, meses)
+
+        faixas_por_mes = self._faixas_por_mes(meses)
+        hoje = date.today()
+        for k, (ano, mes) in enumerate(meses):
+            lin, col = divmod(k, colunas)
+            ox, oy = pad + col * (larg_lad + gap), topo + lin * (alt_lad + gap)
+            for camada, tipo, coords, opcoes in self._ladrilho(ano, mes, larg_lad, alt_lad, faixas_por_mes[(ano, mes)], hoje):
+                if tipo == "r":
+                    x1, y1, x2, y2 = coords
+                    r.retangulo(camada, x1 + ox, y1 + oy, x2 + ox, y2 + oy, **opcoes)
                 else:
-                    base = max(1, disponivel_para_lanes // efetivos)
-                    resto = disponivel_para_lanes - base * efetivos
-
-            alturas = [(base + (1 if idx < resto else 0)) for idx in range(efetivos)]
-            offsets = []
-            cum = 0
-            for idx, h in enumerate(alturas):
-                offsets.append(cum)
-                cum += h
-                if idx < efetivos - 1:
-                    cum += gap_lane
-            alturas_por_row[r] = alturas
-            offsets_por_row[r] = offsets
-
-        eventos_por_lane = {}
-        for i, lane in lane_por_evento.items():
-            eventos_por_lane.setdefault(lane, []).append(i)
-        for lane in sorted(eventos_por_lane.keys()):
-            for i in sorted(eventos_por_lane[lane], key=lambda k: (self.eventos[k]["inicio"], self.eventos[k]["titulo"])):
-                ev = self.eventos[i]
-                s, e = ev["inicio"], ev["fim"]
-                cor = ev.get("cor", "#CFE8FF")
-                todas_datas = [s + timedelta(days=d) for d in range((e - s).days + 1)]
-                cobertos = [d for d in todas_datas if d in self.cell_meta]
-                if not cobertos:
+                    x, y = coords
+                    r.texto(camada, x + ox, y + oy, **opcoes)
+        r.finalizar()
+
+    def _faixas_por_mes(self, meses):
+        """Faixas dos eventos de cada mês, atribuídas uma única vez sobre o período (a mesma exposição mantém a faixa entre meses)."""
+        cache = getattr(self, "_faixas_cache", None)
+        if cache is None or cache[0] is not self.eventos or cache[1] != meses:
+            faixas = atribuir_faixas(self.eventos, *_intervalo_dos_meses(meses))
+            por_mes = {}
+            for ano, mes in meses:
+                inicio, fim = _intervalo_dos_meses(((ano, mes),))
+                por_mes[(ano, mes)] = {i: f for i, f in faixas.items()
+                                       if self.eventos[i]["fim"] >= inicio and self.eventos[i]["inicio"] <= fim}
+            self._faixas_cache = cache = (self.eventos, meses, por_mes)
+        return cache[2]
+
+    def _ladrilho(self, ano, mes, largura, altura, faixas, hoje):
+        """Primitivas (camada, tipo, coords, opções) do mês em coordenadas locais, memorizadas por assinatura."""
+        titulo = MESES_PT[mes-1] if self.modo == "ano" else f"{MESES_PT[mes-1]} {ano}"
+        assinatura = tuple(sorted((self.eventos[i]["titulo"], self.eventos[i]["inicio"], self.eventos[i]["fim"],
+                                   self.eventos[i]["cor"], f) for i, f in faixas.items()))
+        chave = (ano, mes, titulo, largura, altura, hoje, assinatura)
+        prims = self._cache_ladrilhos.get(chave)
+        if prims is not None:
+            self._cache_ladrilhos.move_to_end(chave)
+            return prims
+
+        altura_titulo, altura_dias = 20, 14
+        prims = [("grade", "r", (0, 0, largura, altura), {"fill": "white", "outline": "#D0D0D0"}),
+                 ("grade", "t", (largura // 2, altura_titulo // 2 + 2), {"text": titulo, "font": ("Segoe UI", 10, "bold")})]
+        primeira, semanas = _grade_do_mes(ano, mes)
+        topo_grade = altura_titulo + altura_dias
+        grade = Grade(primeira, semanas, 4, topo_grade, (largura - 8) / 7, (altura - topo_grade - 4) / semanas)
+        for c in range(7):
+            x1, _, x2, _ = grade.bbox(0, c)
+            prims.append(("grade", "t", ((x1 + x2) // 2, altura_titulo + altura_dias // 2),
+                          {"text": WEEKDAYS_PT[c][0], "font": self.fonte_mini, "fill": "#888888"}))
+        for lin in range(semanas):
+            for c in range(7):
+                d = grade.data(lin, c)
+                if d.month != mes:
                     continue
-                agrup = {}
-                for d in cobertos:
-                    r = self.cell_meta[d]["row"]
-                    agrup.setdefault(r, []).append(d)
-                for r in sorted(agrup.keys()):
-                    dias = sorted(agrup[r])
-                    primeiro, ultimo = dias[0], dias[-1]
-                    bbox_p = self.cell_meta[primeiro]["bbox"]
-                    bbox_u = self.cell_meta[ultimo]["bbox"]
-                    x1, x2 = bbox_p[0], bbox_u[2]
-                    rx1, rx2 = int(round(x1)) - 1, int(round(x2)) + 1
-
-                    alturas = alturas_por_row.get(r, [])
-                    offsets = offsets_por_row.get(r, [])
-                    if not alturas or lane >= len(alturas):
-                        topo_cel = self.cell_meta[primeiro]["bbox"][1]
-                        ry1 = int(topo_cel + reservado_top + lane * 12)
-                        ry2 = ry1 + 10
-                    else:
-                        topo_cel = self.cell_meta[primeiro]["bbox"][1]
-                        ry1 = int(topo_cel + reservado_top + offsets[lane])
-                        ry2 = ry1 + int(alturas[lane])
-
-                    cell_bottom = self.cell_meta[primeiro]["bbox"][3]
-                    if ry2 > cell_bottom - 2:
-                        ry2 = cell_bottom - 2
-                        if ry1 >= ry2:
-                            ry1 = max(self.cell_meta[primeiro]["bbox"][1] + reservado_top, ry2 - 4)
-
-                    self.canvas.create_rectangle(rx1, ry1, rx2, ry2, fill=cor, outline=cor, width=1, tags=(f"evt_ret_{i}_{r}",))
-                    padding = 6
-                    largura_disp = max(0, (rx2 - rx1) - padding*2)
-                    texto = _truncar_texto(ev.get("titulo", ""), self.fonte_evento, largura_disp)
-                    cor_txt = _cor_texto_contraste(cor)
-                    yc = int((ry1 + ry2) / 2)
-                    self.canvas.create_text(int((rx1 + rx2) / 2), yc, text=texto, font=self.fonte_evento, fill=cor_txt, tags=(f"evt_txt_{i}_{r}",))
-                    handler = self._criar_handler_evento()
-                    self.canvas.tag_bind(f"evt_ret_{i}_{r}", "<Button-1>", handler)
-                    self.canvas.tag_bind(f"evt_txt_{i}_{r}", "<Button-1>", handler)
-
-    def _criar_handler_evento(self):
-        def handler(tk_event):
-            x, y = tk_event.x, tk_event.y
-            for d, meta in self.cell_meta.items():
-                x1, y1, x2, y2 = meta["bbox"]
-                if x1 <= x <= x2 and y1 <= y <= y2:
-                    self.mostrar_eventos_no_dia(d)
-                    return
-        return handler
+                x1, y1, x2, y2 = grade.bbox(lin, c)
+                if d == hoje:
+                    prims.append(("grade", "r", (x1, y1, x2, y2), {"fill": "#FFF5CC", "outline": ""}))
+                prims.append(("grade", "t", (x1 + 2, y1), {"anchor": "nw", "text": str(d.day),
+                                                          "font": self.fonte_mini, "fill": "#555555"}))
+
+        segmentos = segmentos_por_semana(self.eventos, primeira, semanas, faixas=faixas)
+        reservado = self.fonte_mini.metrics("linespace") + 1
+        for ret in retangulos_resumidos(segmentos, grade, reservado):
+            cor = self.eventos[ret.segmento.evento]["cor"]
+            prims.append(("eventos", "r", (ret.x1, ret.y1, ret.x2, ret.y2), {"fill": cor, "outline": ""}))
+
+        self._cache_ladrilhos[chave] = prims
+        while len(self._cache_ladrilhos) > LIMITE_CACHE_LADRILHOS:
+            self._cache_ladrilhos.popitem(last=False)
+        return prims
+
+    def _mes_em(self, x, y):
+        """(ano, mes) do ladrilho sob o ponto na visão geral, por aritmética sobre a geometria."""
+        if not self._ladrilhos:
+            return None
+        pad, topo, larg_lad, alt_lad, gap, colunas, meses = self._ladrilhos
+        col, dx = divmod(x - pad, larg_lad + gap)
+        lin, dy = divmod(y - topo, alt_lad + gap)
+        k = int(lin) * colunas + int(col)
+        if 0 <= col < colunas and lin >= 0 and dx <= larg_lad and dy <= alt_lad and k < len(meses):
+            return meses[k]
+        return None
 
     def _ao_clicar_canvas(self, tk_event):
-        x, y = tk_event.x, tk_event.y
-        itens = self.canvas.find_overlapping(x, y, x, y)
-        for it in itens:
-            tags = self.canvas.gettags(it)
-            if any(t.startswith("evt_") for t in tags):
-                return
-        for d, meta in self.cell_meta.items():
-            x1,y1,x2,y2 = meta["bbox"]
-            if x1 <= x <= x2 and y1 <= y <= y2:
-                self.mostrar_eventos_no_dia(d)
-                return
+        # único handler de clique do canvas (vale também para cliques sobre as faixas dos eventos);
+        # a célula sai direto da geometria da grade, sem percorrer as células desenhadas
+        if self.modo != "mes":
+            mes = self._mes_em(tk_event.x, tk_event.y)
+            if mes is not None:
+                self._abrir_mes(*mes)
+            return
+        grade = getattr(self, "grade", None)
+        d = grade.data_em(tk_event.x, tk_event.y) if grade else None
+        if d is not None:
+            self.mostrar_eventos_no_dia(d)
 
     def mostrar_eventos_no_dia(self, d):
-        evs = [ev for ev in self.eventos if ev["inicio"] <= d <= ev["fim"]]
+        self._segmentos()
+        evs = [self.eventos[i] for i in self._eventos_por_dia.get(d, [])]
         if not evs:
             messagebox.showinfo(f"Dia {d.strftime('%d/%m/%Y')}", "Nenhuma exposição neste dia.")
             return
         linhas = [f"- {ev['titulo']} ({ev['inicio'].strftime('%d/%m/%Y')} → {ev['fim'].strftime('%d/%m/%Y')})" for ev in evs]
         messagebox.showinfo(f"Exposições em {d.strftime('%d/%m/%Y')}", "\n".join(linhas))
 
+    def exportar_cronograma(self):
+        """Exporta o cronograma inteiro (exposições e obras) para .ics ou .csv, em segundo plano."""
+        if not self.exposicao_controller or not hasattr(self.exposicao_controller, "exportar_cronograma"):
+            return
+        caminho = filedialog.asksaveasfilename(
+            title="Exportar cronograma", defaultextension=".ics", initialfile="cronograma.ics",
+            filetypes=[("iCalendar", "*.ics"), ("CSV", "*.csv")]
+        )
+        if not caminho:
+            return
+
+        def concluir(resultado):
+            ok, msg = resultado
+            (messagebox.showinfo if ok else messagebox.showerror)("Exportar cronograma", msg)
+
+        self.executor.agendar(
+            self.canvas, (self, "exportar"), lambda: self.exposicao_controller.exportar_cronograma(caminho),
+            concluir, lambda e: messagebox.showerror("Erro", f"Erro ao exportar cronograma: {e}"),
+            ocupado=indicador_ocupado(self.canvas)
+        )
+
     def voltar_inicio(self):
         try:
             from src.views.tela_inicial_view import TelaInicial
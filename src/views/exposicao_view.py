@@ -4,6 +4,7 @@ from datetime import datetime, date
 from typing import Optional
 from src.controllers.exposicao_controller import ExposicaoController
 from src.controllers.obra_controller import ObraController
+from src.views.tarefas import obter_executor, indicador_ocupado
 
 class ExposicaoView:
     def __init__(self, root, controller=None, manager=None):
@@ -11,6 +12,7 @@ class ExposicaoView:
         self.controller = controller or ExposicaoController()
         self.obra_controller = ObraController()
         self.manager = manager
+        self.executor = obter_executor()
 
         # limpa widgets existentes
         for w in self.root.winfo_children(): w.destroy()
@@ -88,10 +90,8 @@ class ExposicaoView:
     # ---------------- helpers ----------------
     def _parse_data(self, s: str) -> Optional[date]:
         if not s: return None
-        for fmt in ("%d/%m/%Y","%Y-%m-%d"):
-            try: return datetime.strptime(s, fmt).date()
-            except Exception: continue
-        return None
+        try: return datetime.strptime(s, "%d/%m/%Y").date()
+        except ValueError: return None
 
     def _compute_status_from_dates(self, inicio_s: str, fim_s: str) -> str:
         inicio = self._parse_data(inicio_s); fim = self._parse_data(fim_s); hoje = date.today()
@@ -157,27 +157,7 @@ class ExposicaoView:
 
     def _obra_ocupada_em_periodo(self, id_obra:int, inicio:Optional[date], fim:Optional[date], exclude_expo_id:Optional[int]=None) -> bool:
         try:
-            expos_all = self.controller.listar() or []
-            for ex in expos_all:
-                try:
-                    ex_id = getattr(ex,"id_exposicao",None) or (ex.get("id_exposicao") if isinstance(ex,dict) else ex["id_exposicao"])
-                    if exclude_expo_id and int(ex_id) == int(exclude_expo_id): continue
-                    s_raw = getattr(ex,"data_inicio",None) or (ex.get("data_inicio") if isinstance(ex,dict) else None)
-                    e_raw = getattr(ex,"data_fim",None) or (ex.get("data_fim") if isinstance(ex,dict) else None)
-                    s = self._parse_data(str(s_raw)) if s_raw else None
-                    e = self._parse_data(str(e_raw)) if e_raw else None
-                    # obtém ids das obras participantes desta exposição
-                    obras = self.controller.listar_obras(ex_id) or []
-                    ids = { (getattr(p,"id_obra",None) or (p.get("id_obra") if isinstance(p,dict) else p["id_obra"])) for p in obras }
-                    if int(id_obra) not in {int(x) for x in ids}: continue
-                    if s and e and inicio and fim:
-                        if not (e < inicio or s > fim):
-                            return True
-                    else:
-                        # dados incompletos: assume ocupado por segurança
-                        return True
-                except Exception:
-                    continue
+            return not self.controller.obra_livre_no_periodo(id_obra, inicio, fim, exclude_expo_id=exclude_expo_id)
         except Exception:
             try:
                 status_raw = self._get_status_da_obra(id_obra)
@@ -186,7 +166,6 @@ class ExposicaoView:
                 return True
             except Exception:
                 return False
-        return False
 
     def _obra_em_qualquer_exposicao_ativa_hoje(self, id_obra:int, exclude_expo_id:Optional[int]=None) -> bool:
         hoje = date.today(); return self._obra_ocupada_em_periodo(id_obra, hoje, hoje, exclude_expo_id=exclude_expo_id)
@@ -234,8 +213,15 @@ class ExposicaoView:
             messagebox.showerror("Erro", f"Erro na busca: {ex}")
 
     def _carregar_lista(self):
+        # consulta em segundo plano; a árvore é preenchida em _preencher_lista
+        self.executor.agendar(
+            self.tree, (self, "exposicoes"), self.controller.listar, self._preencher_lista,
+            lambda e: messagebox.showerror("Erro", f"Erro ao carregar exposições: {e}"),
+            ocupado=indicador_ocupado(self.tree)
+        )
+
+    def _preencher_lista(self, expos):
         for i in self.tree.get_children(): self.tree.delete(i)
-        expos = self.controller.listar()
         for e in expos:
             try:
                 id_ex = e.id_exposicao; nome = e.nome; tema = e.tema; local = e.localizacao; di = e.data_inicio or ""; df = e.data_fim or ""; dc = e.data_cadastro or ""
@@ -362,7 +348,6 @@ class ExposicaoView:
 
     # ---------------- abertura do modal gerenciar obras ----------------
     def _abrir_gerenciar_obras(self, id_exposicao: int, data_inicio: Optional[date], data_fim: Optional[date]):
-        initial_participacao_ids = set()
         to_add = set()
         to_remove = set()
 
@@ -389,27 +374,35 @@ class ExposicaoView:
         tree.tag_configure("to_add", background="#D6F5D6")
         tree.tag_configure("to_remove", background="#F5D6D6")
 
+        # obras e participações lidas uma vez; Adicionar/Remover só redesenham a lista
+        participacoes = self.controller.listar_obras(id_exposicao) or []
+        initial_participacao_ids = {int(p["id_obra"]) for p in participacoes}
+        # todas as obras com o indicador `livre` (fora desta exposição) em uma única consulta: no período
+        # da exposição ou, sem período, hoje; o status é tratado abaixo
+        if data_inicio and data_fim:
+            obras = self.obra_controller.listar_obras_com_disponibilidade(data_inicio, data_fim, exclude_expo_id=id_exposicao)
+        else:
+            hoje = date.today()
+            obras = self.obra_controller.listar_obras_com_disponibilidade(hoje, hoje, exclude_expo_id=id_exposicao)
+        livres = {o["id_obra"] for o in obras if o["livre"]}
+
         def carregar():
-            nonlocal initial_participacao_ids
             for i in tree.get_children(): tree.delete(i)
-            participacoes = self.controller.listar_obras(id_exposicao) or []
-            initial_participacao_ids = {int(p["id_obra"]) for p in participacoes}
-            obras = self.obra_controller.listar_obras() or []
             for o in obras:
-                oid = int(o.id_obra)
-                titulo = o.titulo
-                artista = str(o.artista) if o.artista is not None else ""
-                status_db = self._normalizar_status(o.status)
+                oid = int(o["id_obra"])
+                titulo = o["titulo"]
+                artista = o["artistas"] or ""
+                status_db = self._normalizar_status(o["status"])
 
                 if oid in to_add or oid in initial_participacao_ids:
                     status_display = "Em Exposição"
                 else:
                     if data_inicio and data_fim:
-                        ocupado = self._obra_ocupada_em_periodo(oid, data_inicio, data_fim, exclude_expo_id=id_exposicao)
+                        ocupado = oid not in livres
                         status_display = "Em Exposição" if ocupado else ("Disponível" if status_db not in ("Alugada", "Vendida", "Empréstimo") else status_db)
                     else:
                         if status_db == "Em Exposição":
-                            ocupado_hoje = self._obra_em_qualquer_exposicao_ativa_hoje(oid, exclude_expo_id=id_exposicao)
+                            ocupado_hoje = oid not in livres
                             status_display = "Em Exposição" if ocupado_hoje else "Disponível"
                         else:
                             status_display = status_db or "Disponível"
@@ -471,39 +464,14 @@ class ExposicaoView:
             if changed: carregar()
 
         def confirmar():
-            nonlocal id_exposicao
-            id_exposicao = int(id_exposicao)
-            any_change = False
-
-            for id_obra in list(to_remove):
-                id_obra = int(id_obra)
-                res = self.controller.remover_obra(id_exposicao, id_obra)
-                ok = bool(res[0]) if isinstance(res, tuple) else bool(res)
-                msg = res[1] if isinstance(res, tuple) and len(res) > 1 else None
-                if ok:
-                    if not self._obra_em_qualquer_exposicao_ativa_hoje(id_obra, exclude_expo_id=id_exposicao):
-                        self._set_obra_status(id_obra, "Disponível")
-                    any_change = True
-                else:
-                    messagebox.showerror("Erro", msg or f"Não foi possível remover obra ID {id_obra}.")
-
-            for id_obra in list(to_add):
-                id_obra = int(id_obra)
-                if not self._obra_efetivamente_disponivel(id_obra, data_inicio, data_fim, exclude_expo_id=id_exposicao):
-                    messagebox.showwarning("Atenção", f"Obra ID {id_obra} não está disponível."); continue
-                ocupado = self._obra_ocupada_em_periodo(id_obra, data_inicio, data_fim, exclude_expo_id=id_exposicao)
-                if ocupado:
-                    messagebox.showwarning("Atenção", f"Obra ID {id_obra} está ocupada no período."); continue
-                res = self.controller.adicionar_obra(id_exposicao, id_obra)
-                ok = bool(res[0]) if isinstance(res, tuple) else bool(res)
-                msg = res[1] if isinstance(res, tuple) and len(res) > 1 else None
-                if ok:
-                    self._set_obra_status(id_obra, "Em Exposição")
-                    any_change = True
-                else:
-                    messagebox.showerror("Erro", msg or f"Não foi possível adicionar obra ID {id_obra}.")
-
-            if any_change: messagebox.showinfo("Sucesso", "Alterações aplicadas.")
+            if not to_add and not to_remove:
+                win.destroy(); return
+            # tudo em uma transação: inclusões, remoções e status das obras
+            ok, msg, recusadas = self.controller.aplicar_alteracoes(int(id_exposicao), to_add, to_remove)
+            if not ok:
+                messagebox.showerror("Erro", msg); return
+            if recusadas: messagebox.showwarning("Atenção", msg)
+            else: messagebox.showinfo("Sucesso", msg)
             win.destroy(); self._carregar_lista()
 
         # botões
@@ -0,0 +1,213 @@
+"""
+Layout do calendário de exposições, sem dependência do Tk.
+As faixas (lanes) são atribuídas por varredura: eventos em ordem de início, um heap com o
+fim dos eventos ativos e outro com as faixas livres, O(n log n) no total. O resultado são
+segmentos por semana da grade (independentes do tamanho da janela) e, a partir deles e da
+geometria da grade, os retângulos que a tela só precisa desenhar.
+"""
+import heapq
+from datetime import date, timedelta
+from typing import Optional, Sequence
+
+RESERVADO_TOPO = 28  # espaço do número do dia, acima das faixas
+GAP_FAIXAS = 4
+
+
+class Segmento:
+    """Trecho de um evento dentro de uma semana da grade: colunas [col_ini, col_fim] na faixa `faixa`."""
+
+    def __init__(self, evento: int, linha: int, col_ini: int, col_fim: int, faixa: int):
+        self.evento = evento
+        self.linha = linha
+        self.col_ini = col_ini
+        self.col_fim = col_fim
+        self.faixa = faixa
+
+
+class Retangulo:
+    """Retângulo de um segmento já posicionado na tela (coordenadas inteiras do canvas)."""
+
+    def __init__(self, segmento: Segmento, x1: int, y1: int, x2: int, y2: int):
+        self.segmento = segmento
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+
+
+class Grade:
+    """Geometria de uma grade de `semanas` x 7 dias que começa em `primeira` (um domingo)."""
+
+    def __init__(self, primeira: date, semanas: int, x0: float, y0: float, cell_w: float, cell_h: float):
+        self.primeira = primeira
+        self.semanas = semanas
+        self.x0, self.y0 = x0, y0
+        self.cell_w, self.cell_h = cell_w, cell_h
+
+    @property
+    def ultima(self) -> date:
+        return self.primeira + timedelta(days=self.semanas * 7 - 1)
+
+    def data(self, linha: int, col: int) -> date:
+        return self.primeira + timedelta(days=linha * 7 + col)
+
+    def posicao(self, d: date) -> tuple[int, int]:
+        """(linha, coluna) da data na grade."""
+        return divmod((d - self.primeira).days, 7)
+
+    def celula_em(self, x: float, y: float) -> Optional[tuple[int, int]]:
+        """(linha, coluna) da célula sob o ponto, por aritmética sobre a geometria (None fora da grade)."""
+        if self.cell_w <= 0 or self.cell_h <= 0:
+            return None
+        col = int((x - self.x0) // self.cell_w)
+        linha = int((y - self.y0) // self.cell_h)
+        # ajusta à borda arredondada das células desenhadas (bbox)
+        x1, y1, x2, y2 = self.bbox(linha, col)
+        col += -1 if x < x1 else (1 if x >= x2 else 0)
+        linha += -1 if y < y1 else (1 if y >= y2 else 0)
+        if 0 <= col < 7 and 0 <= linha < self.semanas:
+            return linha, col
+        return None
+
+    def data_em(self, x: float, y: float) -> Optional[date]:
+        celula = self.celula_em(x, y)
+        return self.data(*celula) if celula else None
+
+    def bbox(self, linha: int, col: int) -> tuple[int, int, int, int]:
+        x1 = self.x0 + col * self.cell_w
+        y1 = self.y0 + linha * self.cell_h
+        return (int(round(x1)), int(round(y1)), int(round(x1 + self.cell_w)), int(round(y1 + self.cell_h)))
+
+
+def atribuir_faixas(eventos: Sequence[dict], inicio: date, fim: date) -> dict[int, int]:
+    """
+    Faixa de cada evento (índice em `eventos`) que cruza [inicio, fim]: a menor faixa livre no
+    início do evento, na ordem (início, título). Só a parte visível conta para a sobreposição.
+    """
+    visiveis = []
+    for i, ev in enumerate(eventos):
+        s, e = ev["inicio"], ev["fim"]
+        if not s or not e or e < inicio or s > fim:
+            continue
+        visiveis.append((s, ev.get("titulo", ""), i, max(s, inicio), min(e, fim)))
+    visiveis.sort()  # o início recortado cresce junto com o início real
+
+    faixas: dict[int, int] = {}
+    ativos: list[tuple[date, int]] = []  # (fim, faixa) dos eventos em andamento
+    livres: list[int] = []
+    proxima = 0
+    for _, _, i, s, e in visiveis:
+        while ativos and ativos[0][0] < s:
+            heapq.heappush(livres, heapq.heappop(ativos)[1])
+        if livres:
+            faixa = heapq.heappop(livres)
+        else:
+            faixa, proxima = proxima, proxima + 1
+        heapq.heappush(ativos, (e, faixa))
+        faixas[i] = faixa
+    return faixas
+
+
+def segmentos_por_semana(eventos: Sequence[dict], primeira: date, semanas: int,
+                         faixas: Optional[dict[int, int]] = None) -> list[list[Segmento]]:
+    """
+    Segmentos de cada semana da grade (lista indexada pela linha), já com a faixa de cada evento.
+    `faixas` pode vir de atribuir_faixas sobre um período maior (visões de vários meses).
+    """
+    ultima = primeira + timedelta(days=semanas * 7 - 1)
+    if faixas is None:
+        faixas = atribuir_faixas(eventos, primeira, ultima)
+    linhas: list[list[Segmento]] = [[] for _ in range(semanas)]
+    for i, faixa in faixas.items():
+        ev = eventos[i]
+        if ev["fim"] < primeira or ev["inicio"] > ultima:
+            continue  # faixas de um período maior que a grade
+        ini = (max(ev["inicio"], primeira) - primeira).days
+        fim = (min(ev["fim"], ultima) - primeira).days
+        for linha in range(ini // 7, fim // 7 + 1):
+            col_ini = ini - linha * 7 if linha == ini // 7 else 0
+            col_fim = fim - linha * 7 if linha == fim // 7 else 6
+            linhas[linha].append(Segmento(i, linha, col_ini, col_fim, faixa))
+    return linhas
+
+
+def eventos_por_dia(segmentos: list[list[Segmento]], primeira: date) -> dict[date, list[int]]:
+    """Índice data -> eventos (índices, em ordem crescente) visíveis naquele dia, montado a partir dos segmentos."""
+    baldes: dict[date, list[int]] = {}
+    for linha, segs in enumerate(segmentos):
+        for seg in segs:
+            for col in range(seg.col_ini, seg.col_fim + 1):
+                baldes.setdefault(primeira + timedelta(days=linha * 7 + col), []).append(seg.evento)
+    for eventos in baldes.values():
+        eventos.sort()
+    return baldes
+
+
+def alturas_faixas(n_faixas: int, cell_h: float, altura_fonte: int,
+                   reservado_topo: int = RESERVADO_TOPO) -> tuple[list[int], list[int]]:
+    """(alturas, deslocamentos) das faixas de uma semana com `n_faixas` ocupadas (mínimo de 2 faixas)."""
+    efetivos = max(2, n_faixas)
+    disponivel_vertical = max(0, int(cell_h) - reservado_topo - 4)
+    gap = GAP_FAIXAS if disponivel_vertical / efetivos >= 12 else 2
+    disponivel = max(0, disponivel_vertical - (efetivos - 1) * gap)
+    min_faixa = max(10, max(10, altura_fonte) + 4)
+
+    if disponivel <= 0:
+        base, resto = 1, 0
+    elif disponivel >= min_faixa * efetivos:
+        base, resto = disponivel // efetivos, disponivel % efetivos
+    else:
+        base = max(1, disponivel // efetivos)
+        resto = disponivel - base * efetivos
+
+    alturas = [base + (1 if k < resto else 0) for k in range(efetivos)]
+    deslocamentos, acumulado = [], 0
+    for h in alturas:
+        deslocamentos.append(acumulado)
+        acumulado += h + gap
+    return alturas, deslocamentos
+
+
+def retangulos(segmentos: list[list[Segmento]], grade: Grade, altura_fonte: int,
+               reservado_topo: int = RESERVADO_TOPO) -> list[Retangulo]:
+    """Posiciona os segmentos na grade; cada semana divide sua altura pelas faixas que usa."""
+    saida = []
+    for linha, segs in enumerate(segmentos):
+        if not segs:
+            continue
+        alturas, deslocamentos = alturas_faixas(max(s.faixa for s in segs) + 1, grade.cell_h,
+                                                altura_fonte, reservado_topo)
+        for seg in segs:
+            bx1, by1, _, by2 = grade.bbox(linha, seg.col_ini)
+            bx2 = grade.bbox(linha, seg.col_fim)[2]
+            y1 = int(by1 + reservado_topo + deslocamentos[seg.faixa])
+            y2 = y1 + int(alturas[seg.faixa])
+            if y2 > by2 - 2:
+                y2 = by2 - 2
+                if y1 >= y2:
+                    y1 = max(by1 + reservado_topo, y2 - 4)
+            saida.append(Retangulo(seg, bx1 - 1, y1, bx2 + 1, y2))
+    return saida
+
+
+def retangulos_resumidos(segmentos: list[list[Segmento]], grade: Grade, reservado_topo: int,
+                         altura_max: int = 4, gap: int = 1) -> list[Retangulo]:
+    """
+    Faixas recolhidas para as visões de vários meses: barras finas, sem texto. As faixas usadas
+    na grade são renumeradas em ordem (sem buracos) e as que não cabem na célula ficam
+    sobrepostas à última faixa visível.
+    """
+    usadas = sorted({seg.faixa for segs in segmentos for seg in segs})
+    if not usadas:
+        return []
+    ordem = {faixa: k for k, faixa in enumerate(usadas)}
+    disponivel = int(grade.cell_h) - reservado_topo - 1
+    altura = max(1, min(altura_max, (disponivel + gap) // len(usadas) - gap))
+    capacidade = max(1, (disponivel + gap) // (altura + gap))
+
+    saida = []
+    for linha, segs in enumerate(segmentos):
+        for seg in segs:
+            k = min(ordem[seg.faixa], capacidade - 1)
+            bx1, by1, _, _ = grade.bbox(linha, seg.col_ini)
+            bx2 = grade.bbox(linha, seg.col_fim)[2]
+            y1 = by1 + reservado_topo + k * (altura + gap)
+            saida.append(Retangulo(seg, bx1 + 1, y1, bx2 - 1, y1 + altura))
+    return saida
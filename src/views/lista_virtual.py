@@ -0,0 +1,203 @@
+"""
+Lista virtual sobre um ttk.Treeview para resultados grandes.
+Só uma janela de páginas fica materializada na árvore; ao rolar perto do fim (ou do
+início) a página seguinte (ou anterior) é buscada no banco por paginação de chave e a
+página mais distante é descartada. Filtro e ordenação ficam no SQLite: clicar em um
+cabeçalho ordenável refaz a consulta, nunca ordena as linhas em memória.
+"""
+import tkinter as tk
+from collections import deque
+from typing import Any, Callable, Hashable, Optional
+
+from src.views.tarefas import obter_executor, indicador_ocupado
+
+# carregar_pagina(ordenar_por, decrescente, apos, antes, limite) -> registros na ordem de exibição
+CarregarPagina = Callable[[Optional[str], bool, Any, Any, int], list]
+
+
+class ListaVirtual:
+    def __init__(self, tree, carregar_pagina: CarregarPagina, formatar: Callable[[Any], tuple],
+                 id_de: Callable[[Any], Any], canal: Hashable, tamanho_pagina: int = 100,
+                 max_paginas: int = 3, ordenacao: Optional[dict[str, str]] = None,
+                 ordenar_por: Optional[str] = None, decrescente: bool = False,
+                 ao_falhar: Optional[Callable[[Exception], None]] = None, margem: float = 0.2,
+                 tags_de: Optional[Callable[[Any], tuple]] = None,
+                 ao_inserir: Optional[Callable[[list[str]], None]] = None):
+        """
+        `formatar(registro)` devolve os valores das colunas e `id_de(registro)` a chave do
+        registro no banco (também usada como iid). `ordenacao` mapeia coluna da árvore ->
+        campo de ordenação aceito por `carregar_pagina`. `tags_de(registro)` dá as tags da
+        linha e `ao_inserir(iids)` é chamado a cada página materializada (ex.: para
+        restaurar a seleção de linhas que voltaram à árvore).
+        """
+        self.tree = tree
+        self.carregar_pagina = carregar_pagina
+        self.formatar = formatar
+        self.id_de = id_de
+        self.canal = canal
+        self.tamanho_pagina = tamanho_pagina
+        self.max_paginas = max(2, max_paginas)
+        self.ordenar_por = ordenar_por
+        self.decrescente = decrescente
+        self.ao_falhar = ao_falhar
+        self.margem = margem
+        self.tags_de = tags_de
+        self.ao_inserir = ao_inserir
+        self.executor = obter_executor()
+
+        self._paginas: deque[list[str]] = deque()  # iids de cada página materializada, em ordem
+        self._registros: dict[str, Any] = {}       # iid -> registro das páginas materializadas
+        self._ha_anteriores = False
+        self._ha_posteriores = False
+        self._buscando = False
+
+        self._rolagem = str(tree.cget("yscrollcommand") or "")
+        tree.configure(yscrollcommand=self._ao_rolar)
+
+        self._ordenacao = dict(ordenacao or {})
+        self._titulos = {}
+        for coluna in self._ordenacao:
+            self._titulos[coluna] = tree.heading(coluna, "text")
+            tree.heading(coluna, command=lambda c=coluna: self.ordenar(c))
+        self._atualizar_cabecalhos()
+
+    # ------------------------------------------------------------------ API
+    def recarregar(self) -> None:
+        """Descarta a janela atual e busca a primeira página (com a ordenação vigente)."""
+        self._buscando = True
+        self._agendar(None, None, self._preencher_inicio)
+
+    def limpar(self) -> None:
+        self.executor.cancelar(self.canal)
+        self._buscando = False
+        self._esvaziar()
+
+    def ordenar(self, coluna: str) -> None:
+        campo = self._ordenacao[coluna]
+        if campo == self.ordenar_por:
+            self.decrescente = not self.decrescente
+        else:
+            self.ordenar_por, self.decrescente = campo, False
+        self._atualizar_cabecalhos()
+        self.recarregar()
+
+    def registro(self, iid: str) -> Optional[Any]:
+        """Registro de uma linha materializada (None se a página já foi descartada)."""
+        return self._registros.get(iid)
+
+    # ----------------------------------------------------------- internos
+    def _agendar(self, apos, antes, ao_concluir: Callable[[list], None]) -> None:
+        ordenar_por, decrescente, limite = self.ordenar_por, self.decrescente, self.tamanho_pagina
+
+        def falhar(erro: Exception) -> None:
+            self._buscando = False
+            if self.ao_falhar:
+                self.ao_falhar(erro)
+
+        self.executor.agendar(
+            self.tree, self.canal,
+            lambda: self.carregar_pagina(ordenar_por, decrescente, apos, antes, limite),
+            ao_concluir, falhar, ocupado=indicador_ocupado(self.tree)
+        )
+
+    def _atualizar_cabecalhos(self) -> None:
+        for coluna, campo in self._ordenacao.items():
+            seta = ""
+            if campo == self.ordenar_por:
+                seta = " ▼" if self.decrescente else " ▲"
+            self.tree.heading(coluna, text=self._titulos[coluna] + seta)
+
+    def _esvaziar(self) -> None:
+        self.tree.delete(*self.tree.get_children())
+        self._paginas.clear()
+        self._registros.clear()
+        self._ha_anteriores = self._ha_posteriores = False
+
+    def _inserir(self, registros: list, indice) -> list[str]:
+        iids = []
+        for registro in registros:
+            iid = str(self.id_de(registro))
+            if iid in self._registros:
+                # registro já visível (dados alterados entre duas páginas)
+                continue
+            self.tree.insert("", indice if indice == tk.END else indice + len(iids), iid=iid,
+                             values=self.formatar(registro),
+                             tags=self.tags_de(registro) if self.tags_de else ())
+            self._registros[iid] = registro
+            iids.append(iid)
+        if self.ao_inserir and iids:
+            self.ao_inserir(iids)
+        return iids
+
+    def _descartar(self, pagina: list[str]) -> None:
+        vivos = [iid for iid in pagina if self.tree.exists(iid)]
+        if vivos:
+            self.tree.delete(*vivos)
+        for iid in pagina:
+            self._registros.pop(iid, None)
+
+    def _linha_do_topo(self) -> Optional[str]:
+        filhos = self.tree.get_children()
+        if not filhos:
+            return None
+        return filhos[min(len(filhos) - 1, int(float(self.tree.yview()[0]) * len(filhos)))]
+
+    def _manter_topo(self, topo: Optional[str]) -> None:
+        # o Treeview rola por linhas: volta a mostrar a mesma linha no topo após inserir/descartar
+        if topo is None or not self.tree.exists(topo):
+            return
+        self.tree.yview_moveto(self.tree.index(topo) / max(1, len(self.tree.get_children())))
+
+    def _preencher_inicio(self, registros: list) -> None:
+        self._buscando = False
+        self._esvaziar()
+        self._paginas.append(self._inserir(registros, tk.END))
+        self._ha_posteriores = len(registros) >= self.tamanho_pagina
+        self.tree.yview_moveto(0)
+
+    def _anexar(self, registros: list) -> None:
+        self._buscando = False
+        self._ha_posteriores = len(registros) >= self.tamanho_pagina
+        if not registros:
+            return
+        topo = self._linha_do_topo()
+        self._paginas.append(self._inserir(registros, tk.END))
+        if len(self._paginas) > self.max_paginas:
+            self._descartar(self._paginas.popleft())
+            self._ha_anteriores = True
+        self._manter_topo(topo)
+
+    def _prefixar(self, registros: list) -> None:
+        self._buscando = False
+        self._ha_anteriores = len(registros) >= self.tamanho_pagina
+        if not registros:
+            return
+        topo = self._linha_do_topo()
+        self._paginas.appendleft(self._inserir(registros, 0))
+        if len(self._paginas) > self.max_paginas:
+            self._descartar(self._paginas.pop())
+            self._ha_posteriores = True
+        self._manter_topo(topo)
+
+    def _extremo(self, primeiro: bool) -> Optional[Any]:
+        paginas = self._paginas if primeiro else reversed(self._paginas)
+        for pagina in paginas:
+            if pagina:
+                return self.id_de(self._registros[pagina[0] if primeiro else pagina[-1]])
+        return None
+
+    def _ao_rolar(self, inicio, fim) -> None:
+        if self._rolagem:
+            self.tree.tk.call(*self.tree.tk.splitlist(self._rolagem), inicio, fim)
+        if self._buscando:
+            return
+        if float(fim) >= 1.0 - self.margem and self._ha_posteriores:
+            ref = self._extremo(primeiro=False)
+            if ref is not None:
+                self._buscando = True
+                self._agendar(ref, None, self._anexar)
+        elif float(inicio) <= self.margem and self._ha_anteriores:
+            ref = self._extremo(primeiro=True)
+            if ref is not None:
+                self._buscando = True
+                self._agendar(None, ref, self._prefixar)
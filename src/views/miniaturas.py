@@ -0,0 +1,174 @@
+"""
+Serviço de miniaturas das imagens de obras.
+As prévias (150x100 e 800x600) são geradas uma única vez em threads de trabalho e
+guardadas em um cache LRU em disco, limitado em bytes e indexado pelo hash da imagem.
+A tela recebe bytes PNG prontos para virar PhotoImage, via `after()` no loop do Tk.
+"""
+import io
+import os
+import hashlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+from PIL import Image
+
+from src.database.manager import DB_FILE_PADRAO
+
+TAMANHO_PREVIA = (150, 100)
+TAMANHO_VISUALIZACAO = (800, 600)
+
+DIR_CACHE_PADRAO = os.path.join(os.path.dirname(DB_FILE_PADRAO), "miniaturas")
+LIMITE_CACHE_PADRAO = 64 * 1024 * 1024  # bytes
+
+
+class CacheMiniaturas:
+    """Cache LRU em disco: arquivos `<hash[:2]>/<hash>_<L>x<A>.png`, despejando os menos usados."""
+
+    def __init__(self, diretorio: str = DIR_CACHE_PADRAO, limite_bytes: int = LIMITE_CACHE_PADRAO):
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        self._lock = threading.Lock()
+        self._uso: Optional[dict[str, tuple[float, int]]] = None  # caminho -> (último uso, tamanho)
+        self._total = 0
+
+    def _caminho(self, chave: str, tamanho: tuple[int, int]) -> str:
+        return os.path.join(self.diretorio, chave[:2], f"{chave}_{tamanho[0]}x{tamanho[1]}.png")
+
+    def _indexar(self) -> None:
+        # varre o diretório uma vez; depois o índice é mantido em memória
+        self._uso, self._total = {}, 0
+        if not os.path.isdir(self.diretorio):
+            return
+        for raiz, _, arquivos in os.walk(self.diretorio):
+            for nome in arquivos:
+                caminho = os.path.join(raiz, nome)
+                try:
+                    st = os.stat(caminho)
+                except OSError:
+                    continue
+                self._uso[caminho] = (st.st_mtime, st.st_size)
+                self._total += st.st_size
+
+    def ler(self, chave: str, tamanho: tuple[int, int]) -> Optional[bytes]:
+        caminho = self._caminho(chave, tamanho)
+        with self._lock:
+            if self._uso is None:
+                self._indexar()
+            if caminho not in self._uso:
+                return None
+            try:
+                with open(caminho, "rb") as arq:
+                    dados = arq.read()
+                os.utime(caminho)
+            except OSError:
+                self._total -= self._uso.pop(caminho)[1]
+                return None
+            self._uso[caminho] = (os.stat(caminho).st_mtime, len(dados))
+            return dados
+
+    def gravar(self, chave: str, tamanho: tuple[int, int], dados: bytes) -> None:
+        caminho = self._caminho(chave, tamanho)
+        with self._lock:
+            if self._uso is None:
+                self._indexar()
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = caminho + ".tmp"
+            with open(temporario, "wb") as arq:
+                arq.write(dados)
+            os.replace(temporario, caminho)
+            anterior = self._uso.pop(caminho, None)
+            if anterior:
+                self._total -= anterior[1]
+            self._uso[caminho] = (os.stat(caminho).st_mtime, len(dados))
+            self._total += len(dados)
+            self._despejar()
+
+    def _despejar(self) -> None:
+        if self._total <= self.limite_bytes:
+            return
+        for caminho, (_, tamanho) in sorted(self._uso.items(), key=lambda item: item[1][0]):
+            if self._total <= self.limite_bytes:
+                break
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+            del self._uso[caminho]
+            self._total -= tamanho
+
+
+def gerar_miniatura(dados: bytes, tamanho: tuple[int, int]) -> bytes:
+    """Reduz a imagem para caber em `tamanho` e devolve PNG."""
+    with Image.open(io.BytesIO(dados)) as imagem:
+        # JPEG: decodifica já em escala reduzida (scans grandes não são abertos em resolução total)
+        imagem.draft("RGB", (tamanho[0] * 2, tamanho[1] * 2))
+        imagem.thumbnail(tamanho, Image.Resampling.LANCZOS)
+        if imagem.mode not in ("RGB", "RGBA"):
+            imagem = imagem.convert("RGBA")
+        saida = io.BytesIO()
+        imagem.save(saida, format="PNG")
+    return saida.getvalue()
+
+
+class ServicoMiniaturas:
+    """Gera miniaturas em segundo plano; resultados entregues ao Tk com `after()`."""
+
+    def __init__(self, cache: Optional[CacheMiniaturas] = None, max_threads: int = 2):
+        self.cache = cache or CacheMiniaturas()
+        self._executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="miniaturas")
+
+    def _produzir(self, chave: Optional[str], tamanho: tuple[int, int], ler_bytes: Callable[[], Optional[bytes]]) -> Optional[bytes]:
+        if chave:
+            pronta = self.cache.ler(chave, tamanho)
+            if pronta is not None:
+                return pronta
+        dados = ler_bytes()
+        if not dados:
+            return None
+        chave = chave or hashlib.sha256(dados).hexdigest()
+        pronta = self.cache.ler(chave, tamanho)
+        if pronta is None:
+            pronta = gerar_miniatura(dados, tamanho)
+            self.cache.gravar(chave, tamanho, pronta)
+        return pronta
+
+    def solicitar(self, chave: Optional[str], tamanho: tuple[int, int], ler_bytes: Callable[[], Optional[bytes]]) -> Future:
+        """
+        Agenda a miniatura de `tamanho`. `chave` é o hash da imagem (None quando ainda não se
+        conhece: é calculado a partir dos bytes); `ler_bytes` só é chamado se não houver cache.
+        """
+        return self._executor.submit(self._produzir, chave, tamanho, ler_bytes)
+
+    def entregar(self, widget, futuro: Future, ao_concluir: Callable[[Optional[bytes]], None],
+                 ao_falhar: Optional[Callable[[Exception], None]] = None, intervalo_ms: int = 30) -> None:
+        """Acompanha `futuro` pelo loop do Tk e chama `ao_concluir(png)` na thread da interface."""
+        def verificar():
+            if not futuro.done():
+                widget.after(intervalo_ms, verificar)
+                return
+            if futuro.cancelled():
+                return
+            erro = futuro.exception()
+            if erro is not None:
+                if ao_falhar:
+                    ao_falhar(erro)
+                return
+            ao_concluir(futuro.result())
+
+        widget.after(intervalo_ms, verificar)
+
+    def encerrar(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_servico: Optional[ServicoMiniaturas] = None
+_servico_lock = threading.Lock()
+
+
+def obter_servico_miniaturas() -> ServicoMiniaturas:
+    """Instância compartilhada do serviço (cache e threads únicos por processo)."""
+    global _servico
+    with _servico_lock:
+        if _servico is None:
+            _servico = ServicoMiniaturas()
+        return _servico
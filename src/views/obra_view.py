@@ -1,8 +1,12 @@
+import os
+import io
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import date
 from PIL import Image, ImageTk
 from src.controllers.obra_controller import ObraController
+from src.views.miniaturas import obter_servico_miniaturas, TAMANHO_PREVIA, TAMANHO_VISUALIZACAO
+from src.views.lista_virtual import ListaVirtual
 from src.models.obra_model import StatusObra
 
 class ObraView:
@@ -14,6 +18,8 @@ class ObraView:
         self.root.geometry("800x600")
         self.root.minsize(800, 600)
         self.imagem_path = None
+        self.miniaturas = obter_servico_miniaturas()
+        self._futuro_previa = None
         self.artistas_selecionados = []
         self.criar_interface()
         
@@ -186,6 +192,14 @@ class ObraView:
         listagem_frame.grid_rowconfigure(0, weight=1)
         listagem_frame.grid_columnconfigure(0, weight=1)
         self.tree.bind("<Double-1>", self.editar_obra)
+        # só a janela visível de páginas fica na árvore; ordenação pelos cabeçalhos feita no banco
+        self.lista_obras = ListaVirtual(
+            self.tree, self._pagina_obras, self._linha_obra, lambda obra: obra.id_obra, (self, "obras"),
+            ordenacao={"ID": "id_obra", "Título": "titulo", "Tipo": "tipo", "Ano": "ano", "Técnica": "tecnica",
+                       "Dimensões": "dimensoes", "Localização": "localizacao", "Preço": "preco"},
+            ordenar_por="id_obra",
+            ao_falhar=lambda e: messagebox.showerror("Erro", f"Erro ao carregar obras: {str(e)}")
+        )
         self.carregar_obras()
 
 
@@ -234,17 +248,61 @@ class ObraView:
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao selecionar imagem: {str(e)}")
 
-    def carregar_preview_imagem(self, caminho_imagem):
-        try:
-            imagem = Image.open(caminho_imagem)
-            imagem.thumbnail((150, 100), Image.Resampling.LANCZOS)
-            self.imagem_tk = ImageTk.PhotoImage(imagem)
+    def _fonte_imagem(self):
+        """
+        (hash, leitor de bytes) da imagem atual: arquivo recém-selecionado ou obra em edição.
+        Os bytes só são lidos na thread de miniaturas, e apenas se a prévia não estiver em cache.
+        """
+        if not self.imagem_path:
+            return None
+        caminho = str(self.imagem_path)
+        if os.path.isfile(caminho):
+            def ler_arquivo():
+                with open(caminho, "rb") as arq:
+                    return arq.read()
+            return None, ler_arquivo
+        obra = getattr(self, "obra_em_edicao", None)
+        if obra is not None and obra.imagem == self.imagem_path:
+            id_obra = obra.id_obra
+            return obra.imagem, lambda: self.controller.carregar_imagem(id_obra)
+        return None
+
+    def _nome_imagem(self):
+        if self.imagem_path and os.path.isfile(str(self.imagem_path)):
+            return str(self.imagem_path).split("/")[-1]
+        return "imagem da obra"
+
+    def _solicitar_miniatura(self, tamanho, ao_concluir, ao_falhar):
+        fonte = self._fonte_imagem()
+        if fonte is None:
+            self.root.after_idle(ao_concluir, None)
+            return None
+        chave, ler_bytes = fonte
+        futuro = self.miniaturas.solicitar(chave, tamanho, ler_bytes)
+        self.miniaturas.entregar(self.root, futuro, ao_concluir, ao_falhar)
+        return futuro
+
+    def carregar_preview_imagem(self):
+        if self._futuro_previa is not None:
+            self._futuro_previa.cancel()
+        self.imagem_label.config(image="", text="Carregando...")
+
+        def mostrar(png):
+            # ignora respostas de uma prévia já substituída ou de uma tela já fechada
+            if futuro is not self._futuro_previa or not self.imagem_label.winfo_exists():
+                return
+            if png is None:
+                self.imagem_label.config(image="", text="Imagem indisponível")
+                return
+            self.imagem_tk = ImageTk.PhotoImage(Image.open(io.BytesIO(png)))
             self.imagem_label.config(image=self.imagem_tk, text="")
-            nome_arquivo = caminho_imagem.split("/")[-1]
-            self.criar_tooltip(self.imagem_label, f"Arquivo: {nome_arquivo}")
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao carregar preview da imagem: {str(e)}")
-            self.imagem_label.config(image="", text="Erro ao carregar")
+            self.criar_tooltip(self.imagem_label, f"Arquivo: {self._nome_imagem()}")
+
+        def falhar(e):
+            if futuro is self._futuro_previa and self.imagem_label.winfo_exists():
+                self.imagem_label.config(image="", text="Erro ao carregar")
+
+        futuro = self._futuro_previa = self._solicitar_miniatura(TAMANHO_PREVIA, mostrar, falhar)
 
     def visualizar_imagem(self):
         if not self.imagem_path:
@@ -255,27 +313,42 @@ class ObraView:
             janela_imagem.title("Visualizar Imagem")
             janela_imagem.geometry("600x500")
             janela_imagem.resizable(True, True)
+            info_frame = ttk.Frame(janela_imagem)
+            info_frame.pack(side="bottom", fill="x", padx=10, pady=5)
+            ttk.Label(info_frame, text=f"Arquivo: {self._nome_imagem()}").pack(side="left")
+            tamanho_label = ttk.Label(info_frame, text="Carregando...")
+            tamanho_label.pack(side="right")
             canvas = tk.Canvas(janela_imagem)
             scrollbar_v = ttk.Scrollbar(janela_imagem, orient="vertical", command=canvas.yview)
             scrollbar_h = ttk.Scrollbar(janela_imagem, orient="horizontal", command=canvas.xview)
             canvas.configure(yscrollcommand=scrollbar_v.set, xscrollcommand=scrollbar_h.set)
-            imagem_original = Image.open(self.imagem_path)
-            if imagem_original.width > 800 or imagem_original.height > 600:
-                imagem_original.thumbnail((800, 600), Image.Resampling.LANCZOS)
-            imagem_tk_grande = ImageTk.PhotoImage(imagem_original)
-            canvas.create_image(0, 0, anchor="nw", image=imagem_tk_grande)
-            canvas.configure(scrollregion=canvas.bbox("all"))
-            canvas.pack(side="left", fill="both", expand=True)
             scrollbar_v.pack(side="right", fill="y")
             scrollbar_h.pack(side="bottom", fill="x")
-            janela_imagem.imagem_tk_grande = imagem_tk_grande
-            info_frame = ttk.Frame(janela_imagem)
-            info_frame.pack(side="bottom", fill="x", padx=10, pady=5)
-            nome_arquivo = self.imagem_path.split("/")[-1]
-            ttk.Label(info_frame, text=f"Arquivo: {nome_arquivo}").pack(side="left")
-            ttk.Label(info_frame, text=f"Tamanho: {imagem_original.width}x{imagem_original.height}").pack(side="right")
+            canvas.pack(side="left", fill="both", expand=True)
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao visualizar imagem: {str(e)}")
+            return
+
+        def mostrar(png):
+            if not janela_imagem.winfo_exists():
+                return
+            if png is None:
+                janela_imagem.destroy()
+                messagebox.showwarning("Aviso", "Imagem indisponível")
+                return
+            imagem = Image.open(io.BytesIO(png))
+            imagem_tk_grande = ImageTk.PhotoImage(imagem)
+            canvas.create_image(0, 0, anchor="nw", image=imagem_tk_grande)
+            canvas.configure(scrollregion=canvas.bbox("all"))
+            janela_imagem.imagem_tk_grande = imagem_tk_grande
+            tamanho_label.config(text=f"Tamanho: {imagem.width}x{imagem.height}")
+
+        def falhar(e):
+            if janela_imagem.winfo_exists():
+                janela_imagem.destroy()
+            messagebox.showerror("Erro", f"Erro ao visualizar imagem: {str(e)}")
+
+        self._solicitar_miniatura(TAMANHO_VISUALIZACAO, mostrar, falhar)
 
     def remover_imagem(self):
         if self.imagem_path:
@@ -283,6 +356,7 @@ class ObraView:
             if resposta:
                 self.imagem_path = None
                 self.imagem_tk = None
+                self._futuro_previa = None
                 self.imagem_label.config(image="", text="Nenhuma imagem")
 
     def criar_tooltip(self, widget, texto):
@@ -373,6 +447,7 @@ class ObraView:
 
         self.imagem_path = None
         self.imagem_tk = None
+        self._futuro_previa = None
         self.imagem_label.config(image="", text="Nenhuma imagem")
 
         self.atualizar_data()
@@ -427,26 +502,25 @@ class ObraView:
             messagebox.showerror("Erro", f"Erro ao remover: {str(e)}")
 
     def carregar_obras(self):
-        try:
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-
-            obras = self.controller.listar_obras()
-            for obra in obras:
-                artistas_text = obra.artistas_str
-                self.tree.insert("", tk.END, values=(
-                     obra.id_obra,
-                     obra.titulo,
-                     artistas_text,
-                     obra.tipo,
-                     obra.ano,
-                     obra.tecnica,
-                     obra.dimensoes,
-                     obra.localizacao,
-                     f"R$ {obra.preco:.2f}".replace(".", ",")
-                 ))
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao carregar obras: {str(e)}")
+        # consulta em segundo plano; a árvore recebe a primeira página quando o resultado chega
+        self.lista_obras.recarregar()
+
+    def _pagina_obras(self, ordenar_por, decrescente, apos, antes, limite):
+        return self.controller.buscar_obras({}, limite=limite, ordenar_por=ordenar_por,
+                                            decrescente=decrescente, apos=apos, antes=antes)
+
+    def _linha_obra(self, obra):
+        return (
+            obra.id_obra,
+            obra.titulo,
+            obra.artistas_str,
+            obra.tipo,
+            obra.ano,
+            obra.tecnica,
+            obra.dimensoes,
+            obra.localizacao,
+            f"R$ {obra.preco:.2f}".replace(".", ",")
+        )
 
     def editar_obra(self, event):
         try:
@@ -459,8 +533,8 @@ class ObraView:
             if obra.status.value == "Vendida" or obra.status == StatusObra.VENDIDA:
                 messagebox.showwarning("Aviso", "Obras vendidas não podem ser editadas")
                 return
-            self.preencher_formulario_edicao(obra)
             self.obra_em_edicao = obra
+            self.preencher_formulario_edicao(obra)
             self.botao_salvar.config(text="Atualizar")
         except IndexError:
             pass
@@ -522,17 +596,10 @@ class ObraView:
             self.artistas_selecionados = []
             self.label_artistas_selecionados.config(text="Nenhum artista selecionado", foreground="gray")
 
-        # Carrega imagem se houver
+        # Carrega imagem se houver (obra.imagem traz só a referência; os bytes vêm do repositório)
         if obra.imagem:
             self.imagem_path = obra.imagem
-            if isinstance(obra.imagem, str) and obra.imagem.endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp')):
-                try:
-                    self.carregar_preview_imagem(obra.imagem)
-                except:
-                    nome_arquivo = obra.imagem.split("/")[-1]
-                    self.imagem_label.config(text=nome_arquivo[:15] + "..." if len(nome_arquivo) > 15 else nome_arquivo)
-            else:
-                self.imagem_label.config(text="Imagem carregada")
+            self.carregar_preview_imagem()
 
     # ---------------------- SELEÇÃO DE ARTISTAS ---------------------- #
     def abrir_selecionar_artistas(self):
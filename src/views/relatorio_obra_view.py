@@ -8,12 +8,19 @@ from typing import List
 
 from src.controllers.relatorio_obra_controller import RelatorioController
 from src.models.obra_model import StatusObra
+from src.views.tarefas import obter_executor
+from src.views.lista_virtual import ListaVirtual
+
 class RelatorioObrasView(tk.Frame):
+    # rótulo no combobox -> agrupamento aceito por receita_agrupada
+    AGRUPAMENTOS_RECEITA = {"Tipo": "tipo", "Mês": "mes", "Cliente": "cliente", "Artista": "artista", "Obra": "obra"}
+
     def __init__(self, parent, manager=None):
         super().__init__(parent)
         self.parent = parent
         self.manager = manager
         self.controller = RelatorioController()
+        self.executor = obter_executor()
         
         parent.title("Relatório de Obras")
         self.pack(fill=tk.BOTH, expand=True)
@@ -66,7 +73,10 @@ class RelatorioObrasView(tk.Frame):
         self.transacoes_tree = ttk.Treeview(transacoes_frame, columns=("tipo", "cliente", "valor"), show="headings", height=5)
         for col, txt, w in (("tipo","tipo",100), ("cliente","cliente",200), ("valor","valor",100)):
             self.transacoes_tree.heading(col, text=txt); self.transacoes_tree.column(col, width=w)
-        self.transacoes_tree.pack(fill=tk.BOTH, expand=True)
+        self.transacoes_tree.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
+        transacoes_scroll = ttk.Scrollbar(transacoes_frame, orient=tk.VERTICAL, command=self.transacoes_tree.yview)
+        self.transacoes_tree.configure(yscrollcommand=transacoes_scroll.set)
+        transacoes_scroll.pack(side=tk.RIGHT, fill=tk.Y)
 
         # home button
         frame_home = tk.Frame(filtros_frame, bg="#f0f0f0"); frame_home.place(relx=1, rely=0, x=15, y=-35, anchor="ne")
@@ -80,6 +90,37 @@ class RelatorioObrasView(tk.Frame):
         ttk.Button(btns, text="Gerar", command=self.gerar_relatorio).pack(side=tk.RIGHT, padx=6)
         ttk.Button(btns, text="Limpar", command=self.limpar_filtros).pack(side=tk.RIGHT)
 
+        # Resumo de receita (somas agrupadas no banco)
+        receita_frame = ttk.LabelFrame(main, text="Resumo de Receita", padding=6)
+        receita_frame.pack(fill=tk.X, padx=5, pady=5)
+        receita_filtros = ttk.Frame(receita_frame)
+        receita_filtros.pack(fill=tk.X, pady=(0, 4))
+        ttk.Label(receita_filtros, text="De (DD/MM/AAAA):").pack(side=tk.LEFT, padx=4)
+        self.receita_de_entry = ttk.Entry(receita_filtros, width=12); self.receita_de_entry.pack(side=tk.LEFT, padx=4)
+        ttk.Label(receita_filtros, text="Até:").pack(side=tk.LEFT, padx=4)
+        self.receita_ate_entry = ttk.Entry(receita_filtros, width=12); self.receita_ate_entry.pack(side=tk.LEFT, padx=4)
+        ttk.Label(receita_filtros, text="Tipo:").pack(side=tk.LEFT, padx=4)
+        self.receita_tipo_combo = ttk.Combobox(receita_filtros, values=["(todos)"] + self.controller.get_tipos_transacao(),
+                                               width=14, state="readonly")
+        self.receita_tipo_combo.set("(todos)"); self.receita_tipo_combo.pack(side=tk.LEFT, padx=4)
+        ttk.Label(receita_filtros, text="Agrupar por:").pack(side=tk.LEFT, padx=4)
+        self.receita_agrupar_combo = ttk.Combobox(receita_filtros, values=list(self.AGRUPAMENTOS_RECEITA),
+                                                  width=10, state="readonly")
+        self.receita_agrupar_combo.set("Tipo"); self.receita_agrupar_combo.pack(side=tk.LEFT, padx=4)
+        ttk.Button(receita_filtros, text="Calcular", command=self.atualizar_resumo_receita).pack(side=tk.LEFT, padx=6)
+        self.receita_total_label = ttk.Label(receita_filtros, text="")
+        self.receita_total_label.pack(side=tk.RIGHT, padx=4)
+        self.receita_nota_label = ttk.Label(receita_frame, text="", foreground="#666666")
+        self.receita_nota_label.pack(fill=tk.X, padx=4, pady=(0, 4))
+
+        self.receita_tree = ttk.Treeview(receita_frame, columns=("grupo", "total", "qtd"), show="headings", height=5)
+        for col, txt, w in (("grupo", "Tipo", 250), ("total", "Receita", 120), ("qtd", "Transações", 90)):
+            self.receita_tree.heading(col, text=txt); self.receita_tree.column(col, width=w)
+        self.receita_tree.pack(fill=tk.X, expand=True, side=tk.LEFT)
+        receita_scroll = ttk.Scrollbar(receita_frame, orient=tk.VERTICAL, command=self.receita_tree.yview)
+        self.receita_tree.configure(yscrollcommand=receita_scroll.set)
+        receita_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+
         # Resultados
         results_frame = ttk.LabelFrame(main, text="Listagem de Obras", padding=6)
         results_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -98,9 +139,25 @@ class RelatorioObrasView(tk.Frame):
         for c in cols[:-1]:
             self.results_tree.column(c, stretch=True, width=120)
         self.results_tree.column("id", stretch=False, width=50)
+
+        self._filtros = {}
+        self.lista_resultados = ListaVirtual(
+            self.results_tree, self._pagina_relatorio, self._linha_relatorio, lambda o: o.id_obra, (self, "relatorio"),
+            ordenacao={"id": "id_obra", "titulo": "titulo", "tipo": "tipo", "ano": "ano", "tecnica": "tecnica",
+                       "status": "status", "localizacao": "localizacao", "valor": "preco"},
+            ordenar_por="id_obra",
+            ao_falhar=lambda e: messagebox.showerror("Erro", f"Falha ao gerar relatório: {e}")
+        )
+        # histórico de transações: só a janela visível fica na árvore, páginas buscadas ao rolar
+        self.lista_transacoes = ListaVirtual(
+            self.transacoes_tree, self._pagina_transacoes, self._linha_transacao, lambda t: t.id, (self, "transacoes"),
+            ordenar_por="id", decrescente=True,
+            ao_falhar=lambda e: messagebox.showerror("Erro", f"Erro ao carregar transações: {e}")
+        )
         
         self.carregar_artistas()
         self.carregar_transacoes()
+        self.atualizar_resumo_receita()
 
     def carregar_artistas(self):
         for i in self.artistas_tree.get_children():
@@ -111,10 +168,43 @@ class RelatorioObrasView(tk.Frame):
             self.artistas_tree.insert("", "end", values=(aid, nome))
 
     def carregar_transacoes(self):
-        for i in self.transacoes_tree.get_children(): self.transacoes_tree.delete(i)
-        for t in self.controller.listar_transacoes():
-            valor = getattr(t, "valor", 0.0)
-            self.transacoes_tree.insert("", tk.END, values=(getattr(t, "tipo", ""), getattr(t, "cliente", ""), f"R$ {valor:.2f}"))
+        self.lista_transacoes.recarregar()
+
+    def _pagina_transacoes(self, ordenar_por, decrescente, apos, antes, limite):
+        return self.controller.buscar_transacoes(limite=limite, ordenar_por=ordenar_por,
+                                                 decrescente=decrescente, apos=apos, antes=antes)
+
+    def _linha_transacao(self, t):
+        valor = getattr(t, "valor", 0.0) or 0.0
+        return (getattr(t, "tipo", ""), getattr(t, "cliente", ""), f"R$ {float(valor):.2f}")
+
+    def atualizar_resumo_receita(self):
+        rotulo_grupo = self.receita_agrupar_combo.get()
+        agrupar_por = self.AGRUPAMENTOS_RECEITA[rotulo_grupo]
+        de, ate = self.receita_de_entry.get(), self.receita_ate_entry.get()
+        tipo = self.receita_tipo_combo.get()
+        tipos = [] if tipo == "(todos)" else [tipo]
+
+        def exibir(linhas):
+            self.receita_tree.delete(*self.receita_tree.get_children())
+            self.receita_tree.heading("grupo", text=rotulo_grupo)
+            for rotulo, total, qtd in linhas:
+                if agrupar_por == "mes" and rotulo:
+                    rotulo = f"{rotulo[5:7]}/{rotulo[:4]}"
+                self.receita_tree.insert("", tk.END, values=(rotulo or "", f"R$ {float(total):.2f}".replace(".", ","), qtd))
+            soma = sum(total for _, total, _ in linhas)
+            self.receita_total_label.config(text=f"Total: R$ {soma:.2f}".replace(".", ","))
+            # a receita é rateada, mas a contagem repete a transação em cada obra/artista envolvido
+            self.receita_nota_label.config(text=(
+                f"Receita rateada entre as obras/artistas de cada transação; a coluna Transações conta uma "
+                f"transação com várias obras uma vez em cada {rotulo_grupo.lower()}."
+                if agrupar_por in ("obra", "artista") else ""))
+
+        self.executor.agendar(
+            self.receita_tree, (self, "receita"),
+            lambda: self.controller.receita_agrupada(agrupar_por, de, ate, tipos=tipos), exibir,
+            lambda e: messagebox.showerror("Erro", f"Falha ao calcular receita: {e}")
+        )
 
     def limpar_filtros(self):
         self.ano_entry.delete(0, "end")
@@ -129,8 +219,8 @@ class RelatorioObrasView(tk.Frame):
             self.artistas_tree.selection_remove(i)
         for i in self.transacoes_tree.selection():
             self.transacoes_tree.selection_remove(i)
-        for i in self.results_tree.get_children():
-            self.results_tree.delete(i)
+        self.executor.cancelar((self, "relatorio_total"))
+        self.lista_resultados.limpar()
 
     def voltar_inicio(self):
         try:
@@ -178,45 +268,52 @@ class RelatorioObrasView(tk.Frame):
             if sel_trans:
                 filtros["transacoes"] = sel_trans
 
-            obras = self.controller.buscar_obras_validado(filtros)
-            for i in self.results_tree.get_children():
-                self.results_tree.delete(i)
-
-            for obra in obras:
-                artistas_text = getattr(obra, "artistas_str", None)
-                if artistas_text is None or artistas_text == "":
-                    a = getattr(obra, "artista", "")
-                    if isinstance(a, (list, tuple)):
-                        artistas_text = ", ".join(str(x) for x in a if x)
-                    else:
-                        artistas_text = str(a) if a else ""
-                status_txt = getattr(obra.status, "value", "") if obra.status is not None else ""
-                trans_txt = getattr(obra, "transacao", "") if hasattr(obra, "transacao") else ""
-                valor = getattr(obra, "preco", 0.0) or 0.0
-
-                self.results_tree.insert("", "end", values=(
-                    obra.id_obra,
-                    obra.titulo or "",
-                    artistas_text,
-                    obra.tipo or "",
-                    getattr(obra, "ano", ""),
-                    obra.tecnica or "",
-                    status_txt,
-                    trans_txt,
-                    obra.localizacao or "",
-                    f"R$ {float(valor):.2f}".replace(".", ",")
-                ))
-            
-            # ✅ ADICIONA mensagem com total de obras encontradas
-            total = len(obras)
-            if total == 0:
-                messagebox.showinfo("Relatório", "Nenhuma obra encontrada com os filtros aplicados.")
-            else:
-                messagebox.showinfo("Relatório", f"Relatório gerado com sucesso!\n{total} obra(s) encontrada(s).")
-                
+            # filtros validados aqui; a listagem busca as páginas (e o total) em segundo plano
+            self._filtros = self.controller.validar_filtros(filtros)
+            self.lista_resultados.recarregar()
+            filtros_total = self._filtros
+            self.executor.agendar(
+                self.results_tree, (self, "relatorio_total"), lambda: self.controller.contar_obras(filtros_total),
+                self._exibir_total, lambda e: messagebox.showerror("Erro", f"Falha ao gerar relatório: {e}")
+            )
         except Exception as e:
             messagebox.showerror("Erro", f"Falha ao gerar relatório: {e}")
 
+    def _pagina_relatorio(self, ordenar_por, decrescente, apos, antes, limite):
+        return self.controller.buscar_obras(self._filtros, limite=limite, ordenar_por=ordenar_por,
+                                            decrescente=decrescente, apos=apos, antes=antes)
+
+    def _linha_relatorio(self, obra):
+        artistas_text = getattr(obra, "artistas_str", None)
+        if artistas_text is None or artistas_text == "":
+            a = getattr(obra, "artista", "")
+            if isinstance(a, (list, tuple)):
+                artistas_text = ", ".join(str(x) for x in a if x)
+            else:
+                artistas_text = str(a) if a else ""
+        status_txt = getattr(obra.status, "value", "") if obra.status is not None else ""
+        trans_txt = getattr(obra, "transacao", "") if hasattr(obra, "transacao") else ""
+        valor = getattr(obra, "preco", 0.0) or 0.0
+        return (
+            obra.id_obra,
+            obra.titulo or "",
+            artistas_text,
+            obra.tipo or "",
+            getattr(obra, "ano", ""),
+            obra.tecnica or "",
+            status_txt,
+            trans_txt,
+            obra.localizacao or "",
+            f"R$ {float(valor):.2f}".replace(".", ",")
+        )
+
+    def _exibir_total(self, total):
+        # ✅ ADICIONA mensagem com total de obras encontradas
+        if total == 0:
+            messagebox.showinfo("Relatório", "Nenhuma obra encontrada com os filtros aplicados.")
+        else:
+            messagebox.showinfo("Relatório", f"Relatório gerado com sucesso!\n{total} obra(s) encontrada(s).")
+
 # execução independente para teste
 if __name__ == "__main__":
     root = tk.Tk(); root.withdraw()
@@ -0,0 +1,97 @@
+"""
+Desenho em modo retido sobre um tk.Canvas.
+Em vez de apagar tudo e recriar a cada quadro, a tela descreve o quadro inteiro
+(retângulos e textos por camada) e o renderizador reaproveita os itens do quadro anterior:
+só envia ao Tk `coords`/`itemconfigure` do que mudou, cria itens apenas quando o quadro
+precisa de mais do que já existe e esconde os que sobraram.
+"""
+from typing import Sequence
+
+
+class _PoolItens:
+    """Itens de um tipo ("rectangle"/"text") em uma camada, na ordem em que foram pedidos no quadro."""
+
+    def __init__(self, canvas, tipo: str, tag: str):
+        self.canvas = canvas
+        self.tipo = tipo
+        self.tag = tag
+        self.itens: list[int] = []
+        self._estado: dict[int, tuple[tuple, dict]] = {}  # item -> (coords, opções) enviados ao Tk
+        self._padroes: dict[str, object] = {}  # opção -> valor padrão do Tk para este tipo de item
+        self.usados = 0
+
+    def item(self, coords: tuple, opcoes: dict) -> tuple[int, bool]:
+        """Próximo item do quadro com `coords`/`opcoes`; retorna (id, criado agora)."""
+        if self.usados < len(self.itens):
+            item = self.itens[self.usados]
+            self.usados += 1
+            coords_ant, opcoes_ant = self._estado[item]
+            if coords != coords_ant:
+                self.canvas.coords(item, *coords)
+            mudou = {k: v for k, v in opcoes.items() if opcoes_ant.get(k) != v}
+            # opções do uso anterior que o quadro não pediu voltam ao padrão (ex.: `anchor` de outro texto)
+            for k in opcoes_ant.keys() - opcoes.keys() - {"state"}:
+                mudou[k] = self._padrao(item, k)
+            if opcoes_ant.get("state") == "hidden":
+                mudou["state"] = "normal"
+            if mudou:
+                self.canvas.itemconfigure(item, **mudou)
+            self._estado[item] = (coords, dict(opcoes))
+            return item, False
+
+        criar = self.canvas.create_rectangle if self.tipo == "rectangle" else self.canvas.create_text
+        item = criar(*coords, tags=(self.tag,), **opcoes)
+        self.itens.append(item)
+        self._estado[item] = (coords, dict(opcoes))
+        self.usados += 1
+        return item, True
+
+    def _padrao(self, item: int, opcao: str):
+        if opcao not in self._padroes:
+            # itemconfigure(item, opcao) -> (nome, nome no banco, classe, padrão, atual)
+            self._padroes[opcao] = self.canvas.itemconfigure(item, opcao)[3]
+        return self._padroes[opcao]
+
+    def esconder_sobras(self) -> None:
+        for item in self.itens[self.usados:]:
+            coords, opcoes = self._estado[item]
+            if opcoes.get("state") != "hidden":
+                self.canvas.itemconfigure(item, state="hidden")
+                self._estado[item] = (coords, {**opcoes, "state": "hidden"})
+
+
+class RenderizadorCanvas:
+    def __init__(self, canvas, camadas: Sequence[str]):
+        """`camadas` em ordem de empilhamento (a primeira fica por baixo); textos ficam acima dos retângulos da camada."""
+        self.canvas = canvas
+        self.camadas = list(camadas)
+        self._pools: dict[tuple[str, str], _PoolItens] = {}
+        for camada in self.camadas:
+            for tipo in ("rectangle", "text"):
+                self._pools[(camada, tipo)] = _PoolItens(canvas, tipo, f"{camada}_{tipo}")
+        self._criou = False
+
+    def iniciar(self) -> None:
+        """Começa um quadro: os pedidos seguintes reaproveitam os itens na mesma ordem."""
+        for pool in self._pools.values():
+            pool.usados = 0
+        self._criou = False
+
+    def retangulo(self, camada: str, x1, y1, x2, y2, **opcoes) -> int:
+        item, criado = self._pools[(camada, "rectangle")].item((x1, y1, x2, y2), opcoes)
+        self._criou |= criado
+        return item
+
+    def texto(self, camada: str, x, y, **opcoes) -> int:
+        item, criado = self._pools[(camada, "text")].item((x, y), opcoes)
+        self._criou |= criado
+        return item
+
+    def finalizar(self) -> None:
+        """Esconde os itens não usados no quadro e, se algum item foi criado, refaz o empilhamento."""
+        for pool in self._pools.values():
+            pool.esconder_sobras()
+        if self._criou:
+            for camada in self.camadas:
+                self.canvas.tag_raise(f"{camada}_rectangle")
+                self.canvas.tag_raise(f"{camada}_text")
@@ -0,0 +1,138 @@
+"""
+Executor de tarefas de banco de dados fora da thread do Tk.
+As telas agendam consultas em um canal (ex.: "obras"); o resultado volta por uma fila
+consumida com `after()` no loop principal. Uma nova tarefa no mesmo canal cancela a
+anterior, cujo resultado é descartado, e o indicador de ocupado acompanha o canal.
+"""
+import queue
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+
+
+class Tarefa:
+    def __init__(self, canal: Hashable, widget, ao_concluir: Callable[[Any], None],
+                 ao_falhar: Optional[Callable[[Exception], None]], ocupado: Optional[Callable[[bool], None]]):
+        self.canal = canal
+        self.widget = widget
+        self.ao_concluir = ao_concluir
+        self.ao_falhar = ao_falhar
+        self.ocupado = ocupado
+        self.cancelada = False
+        self._futuro = None
+
+    def cancelar(self) -> None:
+        self.cancelada = True
+        if self._futuro is not None:
+            self._futuro.cancel()
+
+
+class ExecutorTarefas:
+    def __init__(self, max_threads: int = 2, intervalo_ms: int = 40):
+        self._executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="tarefas-db")
+        self._resultados: "queue.Queue[tuple[Tarefa, bool, Any]]" = queue.Queue()
+        self._ativas: dict[Hashable, Tarefa] = {}  # canal -> tarefa mais recente (só na thread do Tk)
+        self._intervalo_ms = intervalo_ms
+        self._raiz = None
+        self._verificando = False
+
+    def agendar(self, widget, canal: Hashable, funcao: Callable[[], Any], ao_concluir: Callable[[Any], None],
+                ao_falhar: Optional[Callable[[Exception], None]] = None,
+                ocupado: Optional[Callable[[bool], None]] = None) -> Tarefa:
+        """
+        Executa `funcao()` em segundo plano e chama `ao_concluir(resultado)` (ou `ao_falhar(erro)`)
+        na thread do Tk. Deve ser chamado da thread do Tk.
+        """
+        anterior = self._ativas.get(canal)
+        if anterior is not None:
+            anterior.cancelar()
+        tarefa = Tarefa(canal, widget, ao_concluir, ao_falhar, ocupado)
+        self._ativas[canal] = tarefa
+        if ocupado and anterior is None:
+            ocupado(True)
+        tarefa._futuro = self._executor.submit(self._executar, tarefa, funcao)
+        self._iniciar_verificacao(widget)
+        return tarefa
+
+    def cancelar(self, canal: Hashable) -> None:
+        tarefa = self._ativas.pop(canal, None)
+        if tarefa is not None:
+            tarefa.cancelar()
+            if tarefa.ocupado:
+                tarefa.ocupado(False)
+
+    def _executar(self, tarefa: Tarefa, funcao: Callable[[], Any]) -> None:
+        if tarefa.cancelada:
+            return
+        try:
+            self._resultados.put((tarefa, True, funcao()))
+        except Exception as e:
+            self._resultados.put((tarefa, False, e))
+
+    def _iniciar_verificacao(self, widget) -> None:
+        self._raiz = widget.nametowidget(".")
+        if not self._verificando:
+            self._verificando = True
+            self._raiz.after(self._intervalo_ms, self._verificar)
+
+    def _verificar(self) -> None:
+        while True:
+            try:
+                tarefa, ok, valor = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            self._despachar(tarefa, ok, valor)
+        if not self._ativas:
+            self._verificando = False
+            return
+        try:
+            self._raiz.after(self._intervalo_ms, self._verificar)
+        except tk.TclError:
+            # aplicação encerrada
+            self._verificando = False
+            self._ativas.clear()
+
+    def _despachar(self, tarefa: Tarefa, ok: bool, valor: Any) -> None:
+        if tarefa.cancelada or self._ativas.get(tarefa.canal) is not tarefa:
+            return
+        del self._ativas[tarefa.canal]
+        try:
+            if not tarefa.widget.winfo_exists():
+                return
+            if tarefa.ocupado:
+                tarefa.ocupado(False)
+            if ok:
+                tarefa.ao_concluir(valor)
+            elif tarefa.ao_falhar:
+                tarefa.ao_falhar(valor)
+        except tk.TclError:
+            pass
+
+    def encerrar(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def indicador_ocupado(widget, rotulo=None, texto: str = "Carregando...") -> Callable[[bool], None]:
+    """Indicador padrão: cursor de espera na janela e, se informado, um texto no rótulo."""
+    def alternar(ativo: bool) -> None:
+        try:
+            widget.winfo_toplevel().configure(cursor="watch" if ativo else "")
+            if rotulo is not None:
+                rotulo.config(text=texto if ativo else "")
+        except tk.TclError:
+            pass
+    return alternar
+
+
+_executor: Optional[ExecutorTarefas] = None
+_executor_lock = threading.Lock()
+
+
+def obter_executor() -> ExecutorTarefas:
+    """Executor compartilhado por todas as telas do processo."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ExecutorTarefas()
+        return _executor
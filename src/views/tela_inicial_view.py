@@ -6,6 +6,7 @@ from src.views.transacao_view import TransacaoView
 from src.views.cronograma_view import CronogramaView
 from src.views.exposicao_view import ExposicaoView
 from src.views.relatorio_obra_view import RelatorioObrasView
+from src.views.tarefas import obter_executor
 
 
 class TelaInicial:
@@ -40,6 +41,16 @@ class TelaInicial:
         top_frame.pack(fill="x", padx=20, pady=(0,10))
         top_frame.columnconfigure(0, weight=1)
 
+        # Contadores (lidos das tabelas de resumo mantidas pelo banco)
+        frame_contadores = ttk.Frame(top_frame)
+        frame_contadores.grid(row=0, column=0, sticky="w")
+        self.lbl_obras_disponiveis = ttk.Label(frame_contadores, text="Obras disponíveis: -", font=("Segoe UI", 10))
+        self.lbl_obras_disponiveis.pack(side="left", padx=(0, 20))
+        self.lbl_vendas_mes = ttk.Label(frame_contadores, text="Vendas do mês: -", font=("Segoe UI", 10))
+        self.lbl_vendas_mes.pack(side="left", padx=(0, 20))
+        self.lbl_exposicoes_em_curso = ttk.Label(frame_contadores, text="Exposições em curso: -", font=("Segoe UI", 10))
+        self.lbl_exposicoes_em_curso.pack(side="left")
+
         # Notificações
         self.btn_notificacoes = tk.Button(
             top_frame, text="🔔", font=("Segoe UI Emoji", 16), bd=0, bg=bg,
@@ -96,6 +107,28 @@ class TelaInicial:
             lbl_icon.bind("<Button-1>", lambda e, cmd=comando: cmd())
             lbl_text.bind("<Button-1>", lambda e, cmd=comando: cmd())
 
+        self.atualizar_contadores()
+        # voltar à janela (depois de outra aplicação ou de um dia parado) relê os contadores
+        self.root.bind("<FocusIn>", self._ao_receber_foco)
+
+    def _ao_receber_foco(self, event):
+        if event.widget is self.root and self.lbl_obras_disponiveis.winfo_exists():
+            self.atualizar_contadores()
+
+    def atualizar_contadores(self):
+        def exibir(resumo):
+            self.lbl_obras_disponiveis.config(text=f"Obras disponíveis: {resumo['obras_disponiveis']}")
+            total = f"R$ {resumo['vendas_mes_total']:.2f}".replace(".", ",")
+            self.lbl_vendas_mes.config(text=f"Vendas do mês: {resumo['vendas_mes_qtd']} ({total})")
+            self.lbl_exposicoes_em_curso.config(text=f"Exposições em curso: {resumo['exposicoes_em_curso']}")
+
+        def carregar():
+            # "em curso" depende da data: a virada do dia é reconciliada aqui, fora da thread do Tk
+            self.manager.reconciliar_status_do_dia()
+            return self.manager.resumo_painel()
+
+        obter_executor().agendar(self.lbl_obras_disponiveis, (self, "contadores"), carregar, exibir)
+
     # -------------------- Métodos para abrir views --------------------
     def _open_view(self, view_class):
         for widget in self.root.winfo_children():
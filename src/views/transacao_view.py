@@ -13,6 +13,8 @@ except ImportError:
     from tkcalendar import DateEntry
 
 from src.controllers.transacao_controller import TransacaoController
+from src.views.tarefas import obter_executor
+from src.views.lista_virtual import ListaVirtual
 
 
 class TransacaoView:
@@ -23,9 +25,10 @@ class TransacaoView:
         for w in self.root.winfo_children():
             w.destroy()
 
-        # controller segue padrão (controller instancia seu DatabaseManager)
+        # controller usa o DatabaseManager compartilhado do processo
         self.controller = controller or TransacaoController()
         self.manager = manager  # mantido para compatibilidade, mas não usado diretamente
+        self.executor = obter_executor()
 
         self.root.title("Sistema de Gestão de Galeria de Arte")
         self.root.geometry("800x600")
@@ -37,11 +40,6 @@ class TransacaoView:
         # armazenamos sempre ids (strings) das obras selecionadas
         self.obras_selecionadas = []
 
-        # mapeamento id->titulo para exibição (reconstruído quando necessário)
-        self._id_to_titulo = {}
-        # mapeia item_id (tree) -> lista bruta de obras (ids ou títulos) para edição / devolução
-        self._item_to_obras = {}
-
         # tenta pt_BR
         try:
             locale.setlocale(locale.LC_ALL, "pt_BR.UTF-8")
@@ -174,6 +172,15 @@ class TransacaoView:
         # bind duplo clique
         self.tree.bind("<Double-1>", self.carregar_transacao_selecionada)
 
+        # listagem paginada por chave: só a janela visível fica na árvore, ordenação no banco
+        self.lista_transacoes = ListaVirtual(
+            self.tree, self._pagina_transacoes, self._linha_transacao, lambda t: t.id, (self, "transacoes"),
+            ordenacao={"ID": "id", "Cliente": "cliente", "Valor": "valor", "Tipo": "tipo",
+                       "Data Transação": "data_transacao", "Data Cadastro": "data_cadastro"},
+            ordenar_por="id", decrescente=True,
+            ao_falhar=lambda e: messagebox.showerror("Erro", f"Erro ao carregar transações: {str(e)}")
+        )
+
     # ---------------- MÉTODOS ----------------
     def formatar_valor(self, event=None):
         texto = self.entry_valor.get()
@@ -278,51 +285,47 @@ class TransacaoView:
         self.transacao_selecionada = None
         self.obras_selecionadas = []
         self.label_obras_selecionadas.config(text="Nenhuma obra selecionada")
-        self._item_to_obras.clear()
 
     # ---------- Carregar ----------
     def carregar_transacoes(self):
-        # limpa árvore
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        self._item_to_obras.clear()
-
-        # reconstrói map id->titulo para exibição
-        self._rebuild_obra_cache()
-
-        # preenche tree de transações
-        for transacao in self.controller.listar_transacoes():
-            obras_raw = transacao.obras or []
-            display_titles = []
-            parsed = []
-            for o in obras_raw:
-                s = str(o).strip()
-                # se for id numérico, mapeia para título; caso contrário, assume título
-                if s.isdigit():
-                    parsed.append(s)
-                    display_titles.append(self._id_to_titulo.get(s, s))
-                else:
-                    # se for título, tenta encontrar id correspondente; senão usa o texto
-                    found = next((k for k, v in self._id_to_titulo.items() if v == s), None)
-                    parsed.append(found or s)
-                    display_titles.append(self._id_to_titulo.get(found, s) if found else s)
-            obras_txt = ", ".join(display_titles)
-            try:
-                valor_fmt = locale.currency(float(transacao.valor), grouping=True)
-            except Exception:
-                valor_fmt = f"{float(transacao.valor):,.2f}".replace(".", "X").replace(",", ".").replace("X", ",")
-            iid = self.tree.insert("", tk.END, values=(
-                transacao.id,
-                transacao.cliente,
-                valor_fmt,
-                transacao.tipo,
-                transacao.data_transacao,
-                transacao.data_cadastro,
-                transacao.observacoes,
-                obras_txt
-            ))
-            # armazena parsed list (ids ou titles) para uso posterior (edição/devolução)
-            self._item_to_obras[iid] = parsed
+        self.lista_transacoes.recarregar()
+
+    def _pagina_transacoes(self, ordenar_por, decrescente, apos, antes, limite):
+        # cada transação já vem com os títulos das suas obras (join no banco)
+        return self.controller.buscar_transacoes(limite=limite, ordenar_por=ordenar_por,
+                                                 decrescente=decrescente, apos=apos, antes=antes)
+
+    def _obras_transacao(self, transacao):
+        """(lista bruta de obras — ids ou títulos —, títulos para exibição) de uma transação"""
+        parsed, display_titles = [], []
+        for o in transacao.obras or []:
+            s = str(o).strip()
+            parsed.append(s)
+            # ids vinculados mostram o título lido com a transação; referências legadas aparecem como estão
+            display_titles.append(transacao.titulos_obras.get(s, s))
+        return parsed, display_titles
+
+    def _obras_do_item(self, iid):
+        """(lista bruta de obras, títulos) do item da árvore, para edição / devolução"""
+        transacao = self.lista_transacoes.registro(iid)
+        return self._obras_transacao(transacao) if transacao else ([], [])
+
+    def _linha_transacao(self, transacao):
+        obras_txt = ", ".join(self._obras_transacao(transacao)[1])
+        try:
+            valor_fmt = locale.currency(float(transacao.valor), grouping=True)
+        except Exception:
+            valor_fmt = f"{float(transacao.valor):,.2f}".replace(".", "X").replace(",", ".").replace("X", ",")
+        return (
+            transacao.id,
+            transacao.cliente,
+            valor_fmt,
+            transacao.tipo,
+            transacao.data_transacao,
+            transacao.data_cadastro,
+            transacao.observacoes,
+            obras_txt
+        )
 
     def carregar_transacao_selecionada(self, event):
         itens = self.tree.selection()
@@ -348,10 +351,9 @@ class TransacaoView:
         self.entry_data_cadastro.insert(0, valores[5] or "")
         self.entry_data_cadastro.config(state="readonly")
 
-        raw = self._item_to_obras.get(iid, [])
+        raw, titles = self._obras_do_item(iid)
         # armazena ids (strings) quando possível; títulos ficam como fallback
         self.obras_selecionadas = [str(x) for x in raw]
-        titles = [self._id_to_titulo.get(str(x), str(x)) for x in self.obras_selecionadas]
         self.label_obras_selecionadas.config(
             text="Obras Selecionadas: " + ", ".join(titles) if titles else "Nenhuma obra selecionada"
         )
@@ -373,6 +375,9 @@ class TransacaoView:
         for c, w in [("ID", 60), ("Título", 460), ("Artista", 220), ("Status", 140)]:
             tree_obras.heading(c, text=c)
             tree_obras.column(c, width=w, anchor="w")
+        yscroll = ttk.Scrollbar(frame, orient="vertical", command=tree_obras.yview)
+        tree_obras.configure(yscrollcommand=yscroll.set)
+        yscroll.pack(side="right", fill="y", pady=(6, 4))
         tree_obras.pack(fill="both", expand=True, padx=6, pady=(6, 4))
 
         # tags visuais — cores alinhadas ao exposicao_view
@@ -383,59 +388,70 @@ class TransacaoView:
         tree_obras.tag_configure("to_add", background="#D6F5D6")
         tree_obras.tag_configure("to_remove", background="#F5D6D6")
 
-        # busca obras via controller.db_manager (uso direto do manager do controller, como exposicao_view)
-        try:
-            obras = self.controller.db_manager.listar_todas_obras() or []
-        except Exception:
-            obras = []
+        # obras escolhidas: id -> (título, tag); None enquanto a linha não passou pela árvore.
+        # Guardado à parte porque a lista virtual descarta páginas (e a seleção delas) ao rolar.
+        escolhidas = {str(x): None for x in self.obras_selecionadas if str(x).isdigit()}
 
-        # reconstrói map id->titulo (para a label de seleção)
-        self._rebuild_obra_cache()
+        def linha(obra):
+            status = obra.status.value if hasattr(obra.status, "value") else str(obra.status or "")
+            return (str(obra.id_obra), obra.titulo or "", obra.artistas_str, status)
 
-        for o in obras:
-            try:
-                oid = getattr(o, "id_obra", getattr(o, "id", ""))
-                titulo = getattr(o, "titulo", "") or ""
-                artista_raw = getattr(o, "artista", "")
-                artista = ", ".join(artista_raw) if isinstance(artista_raw, (list, tuple)) else str(artista_raw)
-                status_raw = getattr(o, "status", None)
-                status = status_raw.value if hasattr(status_raw, "value") else str(status_raw or "")
-            except Exception:
-                oid = ""
-                titulo = str(o)
-                artista = ""
-                status = ""
-
-            s_norm = (status or "").strip().lower()
+        def tags(obra):
+            s_norm = linha(obra)[3].strip().lower()
             # ajuste: disponível => green; em exposição (ocupada) => in_exposicao (gray); outros (vendida, alugada, etc) => busy (rose)
             if "dispon" in s_norm:
-                tag = "available"
-            elif "em" in s_norm and ("expos" in s_norm or "exposição" in s_norm or "em_expos" in s_norm):
-                tag = "in_exposicao"
-            else:
-                tag = "busy"
-
-            # inserir SÓ o título (sem símbolos), tags controlam cor
-            iid = tree_obras.insert("", tk.END, values=(str(oid), titulo, artista, status), tags=(tag,))
-
-            # pre-seleciona se já estiver nas obras_selecionadas (ids)
-            if any(str(oid) == str(x) for x in self.obras_selecionadas):
-                tree_obras.selection_add(iid)
+                return ("available",)
+            if "em" in s_norm and ("expos" in s_norm or "exposição" in s_norm or "em_expos" in s_norm):
+                return ("in_exposicao",)
+            return ("busy",)
+
+        def ao_inserir(iids):
+            # pre-seleciona as linhas que já estão entre as escolhidas (ids)
+            marcar = [iid for iid in iids if iid in escolhidas]
+            if marcar:
+                tree_obras.selection_add(marcar)
+
+        def ao_selecionar(_event=None):
+            visiveis = set(tree_obras.get_children())
+            for iid in visiveis:
+                if iid in escolhidas and not tree_obras.selection_includes(iid):
+                    del escolhidas[iid]
+            for iid in tree_obras.selection():
+                obra = lista_obras.registro(iid)
+                if obra is not None:
+                    escolhidas[iid] = (obra.titulo or "", tags(obra)[0])
+
+        tree_obras.bind("<<TreeviewSelect>>", ao_selecionar)
+
+        # páginas de obras buscadas sob demanda (ordenação pelos cabeçalhos feita no banco)
+        lista_obras = ListaVirtual(
+            tree_obras,
+            lambda ordenar_por, decrescente, apos, antes, limite: self.controller.db_manager.buscar_obras(
+                {}, limite=limite, ordenar_por=ordenar_por, decrescente=decrescente, apos=apos, antes=antes),
+            linha, lambda obra: obra.id_obra, (win, "obras"),
+            ordenacao={"ID": "id_obra", "Título": "titulo", "Status": "status"},
+            ordenar_por="id_obra", tags_de=tags, ao_inserir=ao_inserir,
+            ao_falhar=lambda e: messagebox.showerror("Erro", f"Erro ao carregar obras: {e}", parent=win)
+        )
+        lista_obras.recarregar()
 
         # botões confirmar / cancelar
         frame_botoes = ttk.Frame(frame)
         frame_botoes.pack(pady=10)
 
         def confirmar_selecao():
-            itens = tree_obras.selection()
+            ao_selecionar()
             selecionadas_ids = []
             titulos_para_label = []
             ignoradas = []
-            for it in itens:
-                vals = tree_obras.item(it, "values")
-                id_obra = str(vals[0])
-                titulo = str(vals[1])  # já sem símbolos
-                tag = tree_obras.item(it, "tags")[0] if tree_obras.item(it, "tags") else ""
+            for id_obra, dados in escolhidas.items():
+                if dados is None:
+                    # escolhida antes e nunca exibida nesta janela: lê só essa obra
+                    obra = self.controller.db_manager.buscar_obra_por_id(int(id_obra))
+                    if obra is None:
+                        continue
+                    dados = (obra.titulo or "", tags(obra)[0])
+                titulo, tag = dados
                 # valida disponibilidade no momento da seleção: só aceitar tag "available"
                 if tag == "available":
                     selecionadas_ids.append(id_obra)
@@ -473,6 +489,7 @@ class TransacaoView:
         iid = sel[0]
         vals = self.tree.item(iid, "values")
         id_transacao, cliente, valor, tipo, data_transacao, _, observacoes_orig, obras_display = vals
+        _, titulos_obras = self._obras_do_item(iid)
 
         if tipo not in ("Aluguel", "Empréstimo"):
             messagebox.showerror("Erro", "Só é possível registrar devolução de transações de Aluguel ou Empréstimo.")
@@ -508,16 +525,8 @@ class TransacaoView:
                 return
 
             data_dev_str = data_dev.strftime("%d/%m/%Y")
-            # obtém lista bruta de obras do item (ids ou titles)
-            raw_obras = self._item_to_obras.get(iid, [])
-            # converte ids -> títulos quando possível (controller aceita ambos)
-            titulos_para_devolucao = []
-            for o in raw_obras:
-                s = str(o).strip()
-                if s.isdigit():
-                    titulos_para_devolucao.append(self._id_to_titulo.get(s, s))
-                else:
-                    titulos_para_devolucao.append(s)
+            # títulos das obras da transação original (controller aceita ids ou títulos)
+            titulos_para_devolucao = list(titulos_obras)
 
             # registra devolução via controller (controller atualiza status das obras)
             success, msg = self.controller.registrar_devolucao(
@@ -537,16 +546,3 @@ class TransacaoView:
 
         ttk.Button(frame_btn, text="Cancelar", command=win_dev.destroy).pack(side="left", padx=10, expand=True, fill="x")
         ttk.Button(frame_btn, text="Confirmar", command=confirmar).pack(side="left", padx=10, expand=True, fill="x")
-
-    # ---------------- helpers ----------------
-    def _rebuild_obra_cache(self):
-        """Reconstrói cache id -> título usando controller.db_manager"""
-        self._id_to_titulo.clear()
-        try:
-            for o in self.controller.db_manager.listar_todas_obras() or []:
-                oid = getattr(o, "id_obra", getattr(o, "id", None))
-                titulo = getattr(o, "titulo", "") or ""
-                if oid is not None:
-                    self._id_to_titulo[str(oid)] = titulo
-        except Exception:
-            pass